@@ -86,6 +86,7 @@ class FrequencySweepMagPhase(MultiParameter):
             Tuple[ParamRawDataType, ...]: magnitude, phase
         """
         assert isinstance(self.instrument, M5180)
+        self.instrument.invalidate_trace_config()
         self.instrument.write('CALC1:PAR:COUN 1') # 1 trace
         self.instrument.write('CALC1:PAR1:DEF {}'.format(self.name))
         self.instrument.trigger_source('bus') # set the trigger to bus
@@ -94,11 +95,12 @@ class FrequencySweepMagPhase(MultiParameter):
 
         # get data from instrument
         self.instrument.write('CALC1:TRAC1:FORM SMITH')  # ensure correct format
+        self.instrument.ensure_transfer_format('ascii')
         sxx_raw = self.instrument.ask("CALC1:TRAC1:DATA:FDAT?")
         self.instrument.write('CALC1:TRAC1:FORM MLOG')
 
         # Get data as numpy array
-        sxx = np.fromstring(sxx_raw, dtype=float, sep=',')
+        sxx = self.instrument._parse_ascii(sxx_raw)
         sxx = sxx[0::2] + 1j*sxx[1::2]
 
         return self.instrument._db(sxx), np.unwrap(np.angle(sxx))
@@ -156,6 +158,7 @@ class PointMagPhase(MultiParameter):
                 raise ValueError('Stop-start is not 1 Hz but {} Hz. Please adjust'
                                 'start or stop.'.format(self.instrument.stop()-self.instrument.start()))
 
+        self.instrument.invalidate_trace_config()
         self.instrument.write('CALC1:PAR:COUN 1') # 1 trace
         self.instrument.write('CALC1:PAR1:DEF {}'.format(self.name[-3:]))
         self.instrument.trigger_source('bus') # set the trigger to bus
@@ -164,10 +167,11 @@ class PointMagPhase(MultiParameter):
 
         # get data from instrument
         self.instrument.write('CALC1:TRAC1:FORM SMITH')  # ensure correct format
+        self.instrument.ensure_transfer_format('ascii')
         sxx_raw = self.instrument.ask("CALC1:TRAC1:DATA:FDAT?")
 
         # Get data as numpy array
-        sxx = np.fromstring(sxx_raw, dtype=float, sep=',')
+        sxx = self.instrument._parse_ascii(sxx_raw)
         sxx = sxx[0::2] + 1j*sxx[1::2]
 
         # Return the average of the trace, which will have "start" as
@@ -229,6 +233,7 @@ class PointIQ(MultiParameter):
                 raise ValueError('Stop-start is not 1 Hz but {} Hz. Please adjust'
                                 'start or stop.'.format(self.instrument.stop()-self.instrument.start()))
 
+        self.instrument.invalidate_trace_config()
         self.instrument.write('CALC1:PAR:COUN 1') # 1 trace
         self.instrument.write('CALC1:PAR1:DEF {}'.format(self.name[-3:]))
         self.instrument.trigger_source('bus') # set the trigger to bus
@@ -237,10 +242,11 @@ class PointIQ(MultiParameter):
 
         # get data from instrument
         self.instrument.write('CALC1:TRAC1:FORM SMITH')  # ensure correct format
+        self.instrument.ensure_transfer_format('ascii')
         sxx_raw = self.instrument.ask("CALC1:TRAC1:DATA:FDAT?")
 
         # Get data as numpy array
-        sxx = np.fromstring(sxx_raw, dtype=float, sep=',')
+        sxx = self.instrument._parse_ascii(sxx_raw)
 
         # Return the average of the trace, which will have "start" as
         # its setpoint
@@ -278,7 +284,9 @@ class M5180(VisaInstrument):
                          timeout    = timeout,
                          **kwargs)
 
-        self.add_function('reset', call_cmd='*RST')
+        # True once the four S-parameter traces are defined on the VNA
+        self._s_traces_configured = False
+        self._byte_order_configured = False
 
         # set the unit of the electrical distance to meter
         self.write('CALC1:CORR:EDEL:DIST:UNIT MET')
@@ -414,7 +422,7 @@ class M5180(VisaInstrument):
                            get_parser=int,
                            set_parser=int,
                            get_cmd='CALC1:PAR:COUN?',
-                           set_cmd='CALC1:PAR:COUN {}',
+                           set_cmd=self._set_nb_traces,
                            unit='',
                            vals=Ints(min_value=1,
                                      max_value=16))
@@ -568,6 +576,15 @@ class M5180(VisaInstrument):
         self.write("SENS1:SWE:POIN {}".format(val))
         self.update_lin_traces()
 
+    def _set_nb_traces(self, val: int) -> None:
+        """Sets the number of traces, which changes the trace configuration.
+
+        Args:
+            val (int): number of traces
+        """
+        self.invalidate_trace_config()
+        self.write("CALC1:PAR:COUN {}".format(val))
+
     def _get_trigger(self) -> str:
         """Gets trigger source.
 
@@ -593,12 +610,109 @@ class M5180(VisaInstrument):
         """
         self.write('TRIG:SOUR '+trigger.upper())
 
-    def get_s(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray,
+    def reset(self) -> None:
+        """Resets the instrument to its default state."""
+        self.write('*RST')
+        self.invalidate_trace_config()
+        self.data_transfer_format.cache.invalidate()
+        # *RST restores the normal (big endian) byte order
+        self._byte_order_configured = False
+
+    def invalidate_trace_config(self) -> None:
+        """
+        Marks the S-parameter trace configuration as unknown, so that the
+        next ``get_s_matrix`` or ``get_s`` call configures the traces again.
+        Has to be called if the traces are changed outside of this driver.
+        """
+        self._s_traces_configured = False
+
+    def ensure_transfer_format(self, fmt: str) -> None:
+        """Sets the data transfer format, unless it is already cached.
+
+        Args:
+            fmt (str): 'ascii', 'real' or 'real32'
+        """
+        cached = self.data_transfer_format.cache.get(get_if_invalid=False)
+        if cached is None or str(cached).lower() != fmt:
+            self.data_transfer_format(fmt)
+
+    def _configure_s_traces(self) -> None:
+        """Defines S11, S12, S21 and S22 on traces 1 to 4 in Smith format,
+        unless this was done before.
+        """
+        if self._s_traces_configured:
+            return
+        self.write('CALC1:PAR:COUN 4;'
+                   ':CALC1:PAR1:DEF S11;:CALC1:PAR2:DEF S12;'
+                   ':CALC1:PAR3:DEF S21;:CALC1:PAR4:DEF S22;'
+                   ':CALC1:TRAC1:FORM SMITH;:CALC1:TRAC2:FORM SMITH;'
+                   ':CALC1:TRAC3:FORM SMITH;:CALC1:TRAC4:FORM SMITH')
+        self._s_traces_configured = True
+
+    def _single_sweep(self) -> None:
+        self.write('TRIG:SEQ:SING') # Trigger a single sweep
+        self.ask('*OPC?') # Wait for measurement to complete
+
+    @staticmethod
+    def _parse_ascii(data: str) -> np.ndarray:
+        """Parses a comma separated list of floats."""
+        return np.array(data.split(','), dtype=float)
+
+    def _query_real64(self, cmd: str) -> np.ndarray:
+        """Queries a REAL64 binary block and returns it as array."""
+        if not self._byte_order_configured:
+            # little endian, i.e. native byte order of the host
+            self.write('FORM:BORD SWAP')
+            self._byte_order_configured = True
+        return self.visa_handle.query_binary_values(cmd,
+                                                    datatype='d',
+                                                    is_big_endian=False,
+                                                    container=np.ndarray)
+
+    def get_s_matrix(self, binary: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Measures a single sweep and returns all S parameters as complex
+        numbers.
+
+        The trace configuration is only sent on the first call (or after
+        ``invalidate_trace_config``). With ``binary=True`` the data are
+        transferred as REAL64 binary blocks, otherwise as ASCII.
+
+        Args:
+            binary (bool): Use binary REAL64 transfer. Optional, default True
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: frequency [Hz] of shape (N,),
+            S parameters of shape (4, N) in the order S11, S12, S21, S22.
+        """
+        self._configure_s_traces()
+        self.ensure_transfer_format('real' if binary else 'ascii')
+        self._single_sweep()
+
+        if binary:
+            freq = self._query_real64('SENS1:FREQ:DATA?')
+            data = [self._query_real64(f'CALC1:TRAC{n}:DATA:FDAT?')
+                    for n in range(1, 5)]
+        else:
+            freq = self._parse_ascii(self.ask('SENS1:FREQ:DATA?'))
+            data = [self._parse_ascii(self.ask(f'CALC1:TRAC{n}:DATA:FDAT?'))
+                    for n in range(1, 5)]
+
+        # Smith format: pairs of real and imaginary part per point
+        s = np.ascontiguousarray(np.vstack(data)).view(np.complex128)
+
+        return freq, s
+
+    def get_s(self, binary: bool = False) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray,
                              np.ndarray, np.ndarray, np.ndarray, np.ndarray,
                              np.ndarray]:
         """
         Return all S parameters as magnitude in dB and phase in rad.
 
+        Args:
+            binary (bool): Use binary REAL64 transfer, see ``get_s_matrix``.
+                Optional, default False
+
         Returns:
             Tuple[np.ndarray]: frequency [GHz],
             s11 magnitude [dB], s11 phase [rad],
@@ -606,41 +720,13 @@ class M5180(VisaInstrument):
             s21 magnitude [dB], s21 phase [rad],
             s22 magnitude [dB], s22 phase [rad]
         """
+        freq, s = self.get_s_matrix(binary=binary)
+        s11, s12, s21, s22 = s
 
-        self.write('CALC1:PAR:COUN 4') # 4 trace
-        self.write('CALC1:PAR1:DEF S11') # Choose S11 for trace 1
-        self.write('CALC1:PAR2:DEF S12') # Choose S12 for trace 2
-        self.write('CALC1:PAR3:DEF S21') # Choose S21 for trace 3
-        self.write('CALC1:PAR4:DEF S22') # Choose S22 for trace 4
-        self.write('CALC1:TRAC1:FORM SMITH')  # Trace format
-        self.write('CALC1:TRAC2:FORM SMITH')  # Trace format
-        self.write('CALC1:TRAC3:FORM SMITH')  # Trace format
-        self.write('CALC1:TRAC4:FORM SMITH')  # Trace format
-        self.write('TRIG:SEQ:SING') # Trigger a single sweep
-        self.ask('*OPC?') # Wait for measurement to complete
-
-        # Get data as string
-        freq_raw = self.ask("SENS1:FREQ:DATA?")
-        s11_raw = self.ask("CALC1:TRAC1:DATA:FDAT?")
-        s12_raw = self.ask("CALC1:TRAC2:DATA:FDAT?")
-        s21_raw = self.ask("CALC1:TRAC3:DATA:FDAT?")
-        s22_raw = self.ask("CALC1:TRAC4:DATA:FDAT?")
-
-        # Get data as numpy array
-        freq = np.fromstring(freq_raw, dtype=float, sep=',')
-        s11 = np.fromstring(s11_raw, dtype=float, sep=',')
-        s11 = s11[0::2] + 1j*s11[1::2]
-        s12 = np.fromstring(s12_raw, dtype=float, sep=',')
-        s12 = s12[0::2] + 1j*s12[1::2]
-        s21 = np.fromstring(s21_raw, dtype=float, sep=',')
-        s21 = s21[0::2] + 1j*s21[1::2]
-        s22 = np.fromstring(s22_raw, dtype=float, sep=',')
-        s22 = s22[0::2] + 1j*s22[1::2]
-
-        return (np.array(freq), self._db(s11), np.array(np.angle(s11)),
-                                self._db(s12), np.array(np.angle(s12)),
-                                self._db(s21), np.array(np.angle(s21)),
-                                self._db(s22), np.array(np.angle(s22)))
+        return (freq, self._db(s11), np.angle(s11),
+                      self._db(s12), np.angle(s12),
+                      self._db(s21), np.angle(s21),
+                      self._db(s22), np.angle(s22))
 
     def update_lin_traces(self) -> None:
         """
@@ -1,22 +1,59 @@
+import threading
+from functools import partial
+
 from qcodes import VisaInstrument
 from qcodes.utils.validators import Numbers, Enum, Ints
 
+from qcodes_contrib_drivers.drivers.private.ring_buffer_logger import \
+    RingBufferLogger
+
+
+def _parse_input(reading):
+    """
+    Parse an input reading, which is a row of dots if there is no reading
+    and a row of dashes or pluses if it is out of range.
+
+    Returns:
+        (temperature, status), the temperature is NaN unless status is 'ok'
+    """
+    reading = reading.strip()
+    if reading.startswith('.'):
+        return float('nan'), 'no reading'
+    if reading.startswith('---') or reading.startswith('+++'):
+        return float('nan'), 'out of range'
+    return float(reading), 'ok'
+
 
 class Cryocon_26(VisaInstrument):
     """
     Driver for the Cryo-con Model 26 temperature controller.
+
+    ``read_inputs`` reads several inputs with a single query, and
+    ``Cryocon26Logger`` records them periodically.
     """
+
+    input_channels = ('A', 'B', 'C', 'D')
+
     def __init__(self, name, address, terminator='\n', **kwargs):
+        # serializes the I/O of the logger thread and the caller
+        self._io_lock = threading.RLock()
         super().__init__(name, address, terminator=terminator, **kwargs)
 
         on_off_map = {True: 'ON', False: 'OFF'}
 
-        for channel in ['A', 'B', 'C', 'D']:
+        for channel in self.input_channels:
             c = 'ch{}_'.format(channel)
 
             self.add_parameter(c + 'temperature',
                                get_cmd='input? {}'.format(channel),
-                               get_parser=float)
+                               get_parser=lambda r: _parse_input(r)[0],
+                               docstring='NaN if there is no valid reading, '
+                                         'see the status.')
+
+            self.add_parameter(c + 'status',
+                               get_cmd=partial(self._get_status, channel),
+                               docstring="'ok', 'no reading' or "
+                                         "'out of range'.")
 
             self.add_parameter(c + 'units',
                                get_cmd='input {}:units?'.format(channel),
@@ -151,3 +188,70 @@ class Cryocon_26(VisaInstrument):
                                set_cmd='loop {}:maxp {{}}'.format(loop),
                                vals=Numbers(0, 100),
                                unit='%')
+
+    def write_raw(self, cmd):
+        with self._io_lock:
+            super().write_raw(cmd)
+
+    def ask_raw(self, cmd):
+        with self._io_lock:
+            return super().ask_raw(cmd)
+
+    def read_inputs(self, channels=None):
+        """
+        Read several inputs with a single ``input?`` query and update the
+        cached temperature and status of each of them.
+
+        Args:
+            channels: iterable of input names, all inputs by default
+
+        Returns:
+            dict mapping the input names to their temperature, NaN for
+            inputs without a valid reading
+        """
+        channels = list(self.input_channels if channels is None
+                        else channels)
+        replies = self.ask('input? {}'.format(':'.join(channels))).split(';')
+        if len(replies) != len(channels):
+            raise ValueError('Expected {} readings, got {!r}'.format(
+                len(channels), ';'.join(replies)))
+        temperatures = {}
+        for channel, reply in zip(channels, replies):
+            temperature, status = _parse_input(reply)
+            c = 'ch{}_'.format(channel)
+            self.parameters[c + 'temperature'].cache.set(temperature)
+            self.parameters[c + 'status'].cache.set(status)
+            temperatures[channel] = temperature
+        return temperatures
+
+    def _get_status(self, channel):
+        self.read_inputs([channel])
+        return self.parameters['ch{}_status'.format(channel)].cache.get()
+
+
+class Cryocon26Logger(RingBufferLogger):
+    """
+    Records the inputs of a Cryo-con 26 in a background thread.
+
+    Every ``interval`` seconds all inputs are read with ``read_inputs`` and
+    stored in ring buffers holding the last ``length`` readings. ``data``
+    returns the temperature of every recorded input under its name.
+
+    Args:
+        cryocon: Instrument to record
+        interval: Time between readings in seconds
+        length: Number of readings kept
+        channels: Inputs to record, all inputs by default
+    """
+
+    def __init__(self, cryocon, interval=1.0, length=3600, channels=None):
+        self.cryocon = cryocon
+        self.channels = list(cryocon.input_channels if channels is None
+                             else channels)
+        super().__init__(self.channels, interval, length,
+                         '{}_logger'.format(cryocon.name))
+
+    def record(self):
+        """Read all inputs once and store them in the ring buffers"""
+        readings = self.cryocon.read_inputs(self.channels)
+        self._store([readings[c] for c in self.channels])
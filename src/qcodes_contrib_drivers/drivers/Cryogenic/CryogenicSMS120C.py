@@ -13,16 +13,24 @@ This magnet PS driver has been tested with FTDI chip drivers (USB to serial),
     accompanying the magnet. The SMS60C current_rating should be slightly below
     60, as indicated by its name. Examples of values for a 2T magnet using
     SMS60C are: coil_constant=0.0380136, current_rating=52.61
+
+For sweeps, ``start_telemetry`` samples output and ramp status in a
+background thread. Parameter gets are then served from the latest sample,
+and ``wait_for_field`` follows the samples without additional queries.
 """
 
 import re
 import logging
+import threading
 import time
 
 from qcodes.utils.validators import Numbers
 from qcodes import VisaInstrument
 import pyvisa.constants as vi_const
 
+from qcodes_contrib_drivers.drivers.private.ring_buffer_logger import \
+    RingBufferLogger
+
 
 log = logging.getLogger(__name__)
 
@@ -51,12 +59,20 @@ class CryogenicSMS120C(VisaInstrument):
             for 50mK operation 0.0506A/s (5.737E-3 T/s, 0.34422T/min) - usually used
             for 4K operation 0.12A/s (0.013605 T/s, 0.8163 T/min) - not recommended
 
-    Note about timing : SMS120C needs a minimum of 200ms delay between commands being sent
+    Note about timing : SMS120C needs a minimum of 200ms delay between commands being sent,
+    write_raw and ask_raw wait for it after the previous command
     """
 
+    # minimum time between the end of a command and the next one, in seconds
+    _command_gap = 0.2
+
     # Reg. exp. to match a float or exponent in a string
     _re_float_exp = r'[-+]?(\d+(\.\d*)?|\.\d+)([eE][-+]?\d+)?'
 
+    _re_output = re.compile(
+        r'(?P<value>{0}) (?P<unit>TESLA|AMPS) AT (?P<volts>{0}) VOLTS'.format(
+            _re_float_exp))
+
     def __init__(self, name, address, coil_constant=0.113375, current_rating=105.84,
                  current_ramp_limit=0.0506, reset=False, timeout=5, **kwargs):
 
@@ -66,6 +82,10 @@ class CryogenicSMS120C(VisaInstrument):
             kwargs.pop('terminator')
             log.warning('Passing terminator to CryogenicSMS is no longer supported and has no effect')
 
+        self._io_lock = threading.RLock()
+        self._last_command = -float('inf')
+        self.telemetry = None
+
         super().__init__(name, address, terminator='\r\n', **kwargs)
 
         self.visa_handle.baud_rate = 9600
@@ -143,6 +163,37 @@ class CryogenicSMS120C(VisaInstrument):
                            get_cmd=self._get_pauseRamp,
                            val_mapping={False: 0, True: 1})
 
+        self.add_parameter(name='current',
+                           unit='A',
+                           get_cmd=self._get_current,
+                           docstring='Output current of the supply')
+
+        self.add_parameter(name='voltage',
+                           unit='V',
+                           get_cmd=self._get_voltage,
+                           docstring='Output voltage of the supply')
+
+    def write_raw(self, cmd):
+        with self._io_lock:
+            self._wait_command_gap()
+            try:
+                super().write_raw(cmd)
+            finally:
+                self._last_command = time.monotonic()
+
+    def ask_raw(self, cmd):
+        with self._io_lock:
+            self._wait_command_gap()
+            try:
+                return super().ask_raw(cmd)
+            finally:
+                self._last_command = time.monotonic()
+
+    def _wait_command_gap(self):
+        delay = self._last_command + self._command_gap - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
 
     def get_idn(self):
         """
@@ -268,6 +319,11 @@ class CryogenicSMS120C(VisaInstrument):
 
     # Get current magnetic field, returns a float (if unit is Tesla, otherwise raises an exception)
     def _get_field(self):
+        sample = self._fresh_sample()
+        if sample is not None:
+            if sample['unit'] != 1:
+                raise Exception('Controller is not in TESLA mode, switch to TESLA to get the field')
+            return sample['field']
         if self._get_unit() != 1:
             raise Exception('Controller is not in TESLA mode, switch to TESLA to get the field')
 
@@ -277,7 +333,16 @@ class CryogenicSMS120C(VisaInstrument):
         return field
 
     def _get_rampStatus(self):  # get current magnet status, returns an integer
+        sample = self._fresh_sample()
+        if sample is not None and sample['ramp_status'] is not None:
+            return sample['ramp_status']
         _, value = self.query('RAMP STATUS')
+        return self._parse_rampStatus(value)
+
+    @staticmethod
+    def _parse_rampStatus(value):  # returns an integer, None if unknown
+        if value is None:
+            return None
         if 'HOLDING' in value:  # holding on
             rampStatus = 0
         elif 'RAMPING' in value:  # magnet ramping
@@ -288,6 +353,8 @@ class CryogenicSMS120C(VisaInstrument):
             rampStatus = 3
         elif 'FAULT' in value:  # detect either controller or power fault
             rampStatus = 4
+        else:
+            rampStatus = None
         return rampStatus
 
     # checks if controller is paused (1) or active (0), returns a boolean
@@ -503,5 +570,185 @@ class CryogenicSMS120C(VisaInstrument):
 
     def _wait_for_field_zero(self, field_threshold=0.003, refresh_time=0.1):
         """Waits for the field to be within a certain threshold"""
+        if self.telemetry is not None and self.telemetry.running:
+            self.wait_for_field(0, field_threshold)
+            return
         while abs(self.field()) > field_threshold:
             time.sleep(refresh_time)
+
+    # Output in the present unit and output voltage, returns the field in
+    # Tesla, the current in Amps, the voltage in Volts and the unit of the
+    # output, Tesla (1) or Amps (0)
+    def _get_output(self):
+        _, value = self.query('GET OUTPUT')
+        m = self._re_output.match(value)
+        if m is None:
+            raise ValueError('Unexpected output reading "%s"' % value)
+        if m['unit'] == 'TESLA':
+            field = float(m['value'])
+            current = field / self._coil_constant
+        else:
+            current = float(m['value'])
+            field = current * self._coil_constant
+        return field, current, float(m['volts']), int(m['unit'] == 'TESLA')
+
+    def _get_current(self):
+        sample = self._fresh_sample()
+        if sample is not None:
+            return sample['current']
+        return self._get_output()[1]
+
+    def _get_voltage(self):
+        sample = self._fresh_sample()
+        if sample is not None:
+            return sample['voltage']
+        return self._get_output()[2]
+
+    def _fresh_sample(self):
+        if self.telemetry is None or not self.telemetry.running:
+            return None
+        return self.telemetry.latest(self.telemetry.max_age)
+
+    def start_telemetry(self, rate=1.0, length=3600, max_age=None):
+        """
+        Start sampling output and ramp status in a background thread.
+
+        While it runs, gets of field, current, voltage and rampStatus
+        return the latest sample if it is at most max_age old. Every sample
+        takes two commands, so with the 200ms gap enforced between commands
+        the sampling rate is limited to about 2 per second.
+
+        Args:
+            rate (float): samples per second
+            length (int): number of samples kept in the ring buffer
+            max_age (float): freshness tolerance of a sample in seconds,
+                two sample periods by default
+
+        Returns:
+            The running SMS120CTelemetry
+        """
+        self.stop_telemetry()
+        self.telemetry = SMS120CTelemetry(self, rate, length, max_age)
+        self.telemetry.start()
+        return self.telemetry
+
+    def stop_telemetry(self):
+        """Stop the telemetry, the recorded samples stay available"""
+        if self.telemetry is not None:
+            self.telemetry.stop()
+
+    def wait_for_field(self, target, tolerance=0.003, timeout=None):
+        """
+        Block until the sampled field is within tolerance of the target,
+        following the telemetry stream instead of querying the supply.
+
+        Args:
+            target (float): field in Tesla
+            tolerance (float): accepted deviation in Tesla
+            timeout (float): maximum time to wait in seconds, no limit if None
+
+        Returns:
+            The sampled field
+        """
+        if self.telemetry is None or not self.telemetry.running:
+            raise RuntimeError('wait_for_field needs a running telemetry, '
+                               'call start_telemetry first.')
+        return self.telemetry.wait_for(
+            lambda sample: abs(sample['field'] - target) <= tolerance,
+            timeout)['field']
+
+    def close(self):
+        self.stop_telemetry()
+        super().close()
+
+
+class SMS120CTelemetry(RingBufferLogger):
+    """
+    Samples the output and ramp status of a CryogenicSMS120C in a background
+    thread into a timestamped ring buffer holding the last ``length`` samples.
+    ``data`` returns "field" in Tesla, "current" in Amps, "voltage" in Volts
+    and the "ramp_status" code of the rampStatus parameter.
+
+    Args:
+        magnet (CryogenicSMS120C): supply to sample
+        rate (float): samples per second
+        length (int): number of samples kept
+        max_age (float): freshness tolerance of a sample in seconds,
+            two sample periods by default
+    """
+
+    fields = ('field', 'current', 'voltage', 'ramp_status')
+
+    def __init__(self, magnet, rate=1.0, length=3600, max_age=None):
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        super().__init__(self.fields, 1 / rate, length,
+                         '{}_telemetry'.format(magnet.name))
+        self.magnet = magnet
+        self.max_age = 2 * self.period if max_age is None else max_age
+        self._latest = None
+
+    @property
+    def period(self):
+        """Time between samples in seconds"""
+        return self.interval
+
+    def start(self):
+        """Start sampling into an empty buffer"""
+        self._latest = None
+        super().start()
+
+    def sample(self):
+        """Take one sample and store it in the ring buffer"""
+        field, current, voltage, unit = self.magnet._get_output()
+        _, value = self.magnet.query('RAMP STATUS')
+        ramp_status = self.magnet._parse_rampStatus(value)
+        sample = {'timestamp': time.time(),
+                  'monotonic': time.monotonic(),
+                  'field': field, 'current': current, 'voltage': voltage,
+                  'ramp_status': ramp_status, 'unit': unit}
+        with self._condition:
+            self._latest = sample
+            self._store([sample[name] for name in self.fields],
+                        sample['timestamp'])
+        return sample
+
+    def record(self):
+        self.sample()
+
+    def latest(self, max_age=None):
+        """
+        The latest sample as a dict, None if there is none or it is older
+        than max_age seconds.
+        """
+        sample = self._latest
+        if sample is None:
+            return None
+        if max_age is not None and time.monotonic() - sample['monotonic'] > max_age:
+            return None
+        return sample
+
+    def wait_for(self, condition, timeout=None):
+        """
+        Block until a new sample satisfies condition(sample).
+
+        Returns:
+            The sample satisfying the condition
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            # the latest sample is checked first
+            seen = self._count - 1
+            while True:
+                if self._count > seen and self._latest is not None:
+                    seen = self._count
+                    if condition(self._latest):
+                        return self._latest
+                if self.error is not None:
+                    raise self.error
+                if self._stop.is_set() or not self.running:
+                    raise RuntimeError('Telemetry stopped')
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError('Condition not met within %s s' % timeout)
+                self._condition.wait(remaining)
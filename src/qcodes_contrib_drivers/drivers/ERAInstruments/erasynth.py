@@ -15,7 +15,8 @@ This module provides the following drivers:
 """
 from __future__ import annotations
 
-from typing import Dict, List, Union, Tuple, Optional
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Union, Tuple, Optional
 import time
 import json
 import logging
@@ -126,7 +127,7 @@ class ERASynthBase(VisaInstrument):
         self.debug_messages_en(False)  # Print less messages to improve communication
         self.wifi_off()  # print less messages to improve communication
 
-    def __init__(self, name: str, address: str, **kwargs):
+    def __init__(self, name: str, address: str, json_cache_validity: float = 1.0, **kwargs):
         """
         Create an instance of the instrument.
 
@@ -134,7 +135,16 @@ class ERASynthBase(VisaInstrument):
             name: Instrument name.
             address: Used to connect to the instrument.
                 Run :meth:`.ERASynthBase.print_pyvisa_resources` to list available list.
-        """
+            json_cache_validity: Time in seconds during which the configuration
+                and diagnostic JSON documents are reused for ``RA:*``/``RD:*``
+                gets, e.g. for all parameters of one snapshot. Any command
+                sent to the instrument invalidates them. Set to 0 to always
+                query the instrument.
+        """
+        self.json_cache_validity = json_cache_validity
+        # command ("RA"/"RD") -> (time of the query, parsed JSON)
+        self._json_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._drain_read_buffer = True
         super().__init__(name=name, address=address, terminator="\r\n", **kwargs)
 
         # ##############################################################################
@@ -526,17 +536,51 @@ class ERASynthBase(VisaInstrument):
         while bytes_in_buffer():
             self.visa_handle.read_bytes(bytes_in_buffer())
 
+    def _maybe_clear_read_buffer(self) -> None:
+        if self._drain_read_buffer:
+            self.clear_read_buffer()
+
+    @contextmanager
+    def skip_read_buffer_drains(self) -> Iterator[None]:
+        """
+        Context manager in which :meth:`ask` and :meth:`write` do not discard the
+        read buffer before and after each command. The buffer is discarded once
+        when entering and once when leaving the context.
+
+        Intended for fast sequences of set commands, e.g. frequency sweeps. The
+        setters confirm the values by reading until the expected reply, so they
+        do not rely on an empty read buffer.
+
+        Example:
+
+        .. code-block::
+
+            with lo.skip_read_buffer_drains():
+                for freq in frequencies:
+                    lo.frequency(freq)
+                    ...
+        """
+        previous = self._drain_read_buffer
+        self.clear_read_buffer()
+        self._drain_read_buffer = False
+        try:
+            yield
+        finally:
+            self._drain_read_buffer = previous
+            self.clear_read_buffer()
+
     def ask(self, cmd: str) -> str:
         """Writes a command to the communication channel of the instrument and return
         the response.
 
         Commands are prefixed with `">"` as required by the ERASynth.
 
-        NB the read buffer is discarded before and after reading one line.
+        NB the read buffer is discarded before and after reading one line, unless
+        inside :meth:`skip_read_buffer_drains`.
         """
-        self.clear_read_buffer()
+        self._maybe_clear_read_buffer()
         response = super().ask(f">{cmd}")
-        self.clear_read_buffer()
+        self._maybe_clear_read_buffer()
 
         return response
 
@@ -551,6 +595,8 @@ class ERASynthBase(VisaInstrument):
         elif cmd[1:].startswith("RD:"):
             response = self.get_diagnostic_status(cmd[1 + len("RD:") :])
         else:
+            if cmd[1:] not in ("RA", "RD"):
+                self.invalidate_json_cache()
             response = super().ask_raw(cmd)
         assert isinstance(response, str)
         return response
@@ -560,11 +606,12 @@ class ERASynthBase(VisaInstrument):
 
         Commands are prefixed with `">"` as required by the ERASynth.
 
-        NB the read buffer is discarded before and after reading one line.
+        NB the read buffer is discarded before and after reading one line, unless
+        inside :meth:`skip_read_buffer_drains`.
         """
-        self.clear_read_buffer()
+        self._maybe_clear_read_buffer()
         super().write(f">{cmd}")
-        self.clear_read_buffer()
+        self._maybe_clear_read_buffer()
 
     def write_raw(self, cmd: str) -> None:
         """
@@ -573,6 +620,7 @@ class ERASynthBase(VisaInstrument):
         This is only possible for configurations that can be retrieved from the
         instrument.
         """
+        self.invalidate_json_cache()
         is_readable_cmd = False
         for command in _CMD_TO_JSON_MAPPING:
             if cmd[1:].startswith(command):
@@ -585,7 +633,7 @@ class ERASynthBase(VisaInstrument):
             while True:
                 super().write_raw(cmd)
                 self.clear_read_buffer()
-                if self.get_configuration(json_key) == cmd_arg:
+                if self.get_configuration(json_key, use_cache=False) == cmd_arg:
                     break
         else:
             super().write_raw(cmd)
@@ -610,22 +658,59 @@ class ERASynthBase(VisaInstrument):
 
         return "".join(["{", *read_line.split("{")[1:]])
 
+    def _get_cached_json(self, cmd: str, first_key: str, use_cache: bool) -> Dict[str, Any]:
+        """
+        Returns the parsed JSON of the `cmd` query, reusing the previous one if it
+        is younger than `json_cache_validity`.
+        """
+        cached = self._json_cache.get(cmd)
+        if (
+            use_cache
+            and cached is not None
+            and time.monotonic() - cached[0] < self.json_cache_validity
+        ):
+            return cached[1]
+        t_query = time.monotonic()
+        parsed = json.loads(self._get_json(cmd, first_key))
+        self._json_cache[cmd] = (t_query, parsed)
+        return parsed
+
+    def invalidate_json_cache(self) -> None:
+        """
+        Discards the cached configuration and diagnostic JSON documents.
+        """
+        self._json_cache.clear()
+
     # ERASynth specific methods
 
-    def get_configuration(self, par_name: Optional[str] = None) -> Union[Dict[str, str], str]:
+    def get_configuration(
+        self, par_name: Optional[str] = None, use_cache: bool = True
+    ) -> Union[Dict[str, str], str]:
         """
         Returns the configuration JSON that contains all parameters.
+
+        Args:
+            par_name: If given, only the value of this key is returned.
+            use_cache: Reuse a configuration read less than `json_cache_validity`
+                seconds ago.
         """
-        config_json = json.loads(self._get_json("RA", "rfoutput"))
+        config_json = self._get_cached_json("RA", "rfoutput", use_cache)
 
-        return config_json if par_name is None else config_json[par_name]
+        return dict(config_json) if par_name is None else config_json[par_name]
 
-    def get_diagnostic_status(self, par_name: Optional[str] = None) -> Union[Dict[str, str], str]:
+    def get_diagnostic_status(
+        self, par_name: Optional[str] = None, use_cache: bool = True
+    ) -> Union[Dict[str, str], str]:
         """
         Returns the diagnostic JSON.
+
+        Args:
+            par_name: If given, only the value of this key is returned.
+            use_cache: Reuse a diagnostic status read less than
+                `json_cache_validity` seconds ago.
         """
-        config_json = json.loads(self._get_json("RD", "temperature"))
-        return config_json if par_name is None else config_json[par_name]
+        config_json = self._get_cached_json("RD", "temperature", use_cache)
+        return dict(config_json) if par_name is None else config_json[par_name]
 
     def preset(self) -> None:
         """
@@ -1,6 +1,6 @@
 import logging
-from typing import Any, Dict
-import struct
+from functools import partial
+from typing import Any, Dict, Optional, Sequence
 import numpy as np
 import datetime
 import qcodes.validators as vals
@@ -18,14 +18,19 @@ class HP8594E(VisaInstrument):
     This is the QCoDeS driver for the Hewlett Packard HP8594E Network Analyzer
     """
 
+    TRACE_POINTS = 401
+
     def __init__(self, name: str, address: str, **kwargs: Any) -> None:
         super().__init__(name, address, terminator="\n", **kwargs)
 
+        # trace data format (TDF) and measurement data size (MDS) last sent
+        self._trace_format: Optional[str] = None
+
         self.add_parameter(
             "start_freq",
             label="Sweep start frequency",
             unit="Hz",
-            set_cmd="FA {} Hz",
+            set_cmd=partial(self._set_and_invalidate, "FA {} Hz", ("center_freq", "span")),
             get_cmd="FA?",
             get_parser=float,
             vals=vals.Numbers(0, 2900000000.0),
@@ -35,7 +40,7 @@ class HP8594E(VisaInstrument):
             "stop_freq",
             label="Sweep stop frequency",
             unit="Hz",
-            set_cmd="FB {} Hz",
+            set_cmd=partial(self._set_and_invalidate, "FB {} Hz", ("center_freq", "span")),
             get_cmd="FB?",
             get_parser=float,
             vals=vals.Numbers(0, 2900000000.0),
@@ -45,7 +50,7 @@ class HP8594E(VisaInstrument):
             "center_freq",
             label="center frequency",
             unit="Hz",
-            set_cmd="CF {} Hz",
+            set_cmd=partial(self._set_and_invalidate, "CF {} Hz", ("start_freq", "stop_freq")),
             get_cmd="CF?",
             get_parser=float,
             vals=vals.Numbers(9000, 1800000000),
@@ -55,7 +60,7 @@ class HP8594E(VisaInstrument):
             "span",
             label="span",
             unit="Hz",
-            set_cmd="SP {} Hz",
+            set_cmd=partial(self._set_and_invalidate, "SP {} Hz", ("start_freq", "stop_freq")),
             get_cmd="SP?",
             get_parser=float,
             vals=vals.Numbers(9000, 1800000000),
@@ -140,9 +145,86 @@ class HP8594E(VisaInstrument):
 
         return info
 
+    def _set_and_invalidate(
+        self, cmd: str, dependents: Sequence[str], value: float
+    ) -> None:
+        """
+        Send a setting and invalidate the cached values of the parameters
+        it changes implicitly, e.g. the span changes start and stop.
+        """
+        self.write(cmd.format(value))
+        for name in dependents:
+            self.parameters[name].cache.invalidate()
+
+    def invalidate_cache(self) -> None:
+        """
+        Forget all cached settings, e.g. after the front panel was used.
+        """
+        for param in self.parameters.values():
+            param.cache.invalidate()
+        self._trace_format = None
+
+    def _set_trace_format(self, trace_format: str) -> None:
+        if self._trace_format != trace_format:
+            if trace_format == "B":
+                self.write("TDF B;MDS B")
+            else:
+                self.write(f"TDF {trace_format}")
+            self._trace_format = trace_format
+
+    @classmethod
+    def decode_trace_bytes(
+        cls, data: bytes, ref_level: float
+    ) -> npt.NDArray[np.float64]:
+        """
+        Convert a trace in measurement units (TDF B, MDS B) to dBm.
+        """
+        raw = np.frombuffer(data, dtype=np.uint8, count=cls.TRACE_POINTS)
+        return (raw * 32.0 - 8000) * 0.01 + ref_level
+
+    @staticmethod
+    def decode_trace_ascii(data: str) -> npt.NDArray[np.float64]:
+        return np.array(data.strip().rstrip(";").split(","), dtype=np.float64)
+
+    def _read_trace_bytes(self) -> bytes:
+        return self.visa_handle.read_bytes(
+            self.TRACE_POINTS, break_on_termchar=False
+        )
+
+    def acquire_sweeps(
+        self, n_sweeps: int, transfer_type: str = "bytes"
+    ) -> npt.NDArray[np.float64]:
+        """
+        Take `n_sweeps` single sweeps and return the traces as an array of
+        shape (n_sweeps, 401) in dBm.
+
+        The sweep mode, transfer format and reference level are set up
+        once, each sweep then only costs one "TS;TRA?" round trip.
+        """
+        self.write("SNGLS")
+        traces = np.empty((n_sweeps, self.TRACE_POINTS))
+        if transfer_type == "bytes":
+            self._set_trace_format("B")
+            ref_level = self.reference_level.cache.get()
+            for i in range(n_sweeps):
+                self.write("TS;TRA?")
+                traces[i] = self.decode_trace_bytes(
+                    self._read_trace_bytes(), ref_level
+                )
+        elif transfer_type == "ASCII":
+            self._set_trace_format("P")
+            for i in range(n_sweeps):
+                traces[i] = self.decode_trace_ascii(self.ask("TS;TRA?"))
+        else:
+            raise ValueError(
+                f"transfer_type must be bytes or ASCII you have used {transfer_type} "
+            )
+        return traces
+
     def reset(self):
         # preset state
         self.write("IP")
+        self.invalidate_cache()
 
         # single sweep mode
         self.write("SNGLS")
@@ -161,9 +243,10 @@ class FreqAxis(Parameter):
 
     def get_raw(self) -> ParamRawDataType:
         assert isinstance(self.root_instrument, HP8594E)
-        start = self.root_instrument.start_freq()
-        stop = self.root_instrument.stop_freq()
-        return np.linspace(start, stop, 401)
+        # start and stop are only queried again after a setting changed them
+        start = self.root_instrument.start_freq.cache.get()
+        stop = self.root_instrument.stop_freq.cache.get()
+        return np.linspace(start, stop, HP8594E.TRACE_POINTS)
 
 
 class Trace(ParameterWithSetpoints):
@@ -190,15 +273,12 @@ class Trace(ParameterWithSetpoints):
             )
 
     def transfer_ascii(self) -> npt.NDArray[np.float64]:
-        data = self.hp8594e.ask("TS;TDF P;TRA?;")
-        return np.array([float(x) for x in data.split(",")])
+        self.hp8594e._set_trace_format("P")
+        return self.hp8594e.decode_trace_ascii(self.hp8594e.ask("TS;TRA?"))
 
     def transfer_bytes(self) -> npt.NDArray[np.float64]:
-        self.hp8594e.write("TDF B")
-        self.hp8594e.write("MDS B")
+        self.hp8594e._set_trace_format("B")
         self.hp8594e.write("TS;TRA?")
-        data_bytes = self.hp8594e.visa_handle.read_raw()
-        data_int = struct.unpack(">401B", data_bytes)
-        ref_level = self.hp8594e.reference_level()
-        data_float = [(x * 32 - 8000) * 0.01 + ref_level for x in data_int]
-        return np.array(data_float)
+        data_bytes = self.hp8594e._read_trace_bytes()
+        ref_level = self.hp8594e.reference_level.cache.get()
+        return self.hp8594e.decode_trace_bytes(data_bytes, ref_level)
@@ -1,6 +1,12 @@
+import threading
+from typing import Dict, Optional, Sequence, Tuple
+
 from qcodes import VisaInstrument, InstrumentChannel, ChannelList
 from qcodes.utils.validators import Enum
 
+from qcodes_contrib_drivers.drivers.private.ring_buffer_logger import \
+    RingBufferLogger
+
 
 class SensorChannel(InstrumentChannel):
     """
@@ -58,16 +64,22 @@ class Model_331(VisaInstrument):
     Args:
         name: The channel name.
         address: The GPIB address.
+
+    ``read_channels`` reads all sensor channels with a single query, and
+    ``Model331Logger`` records them periodically.
     """
 
     _loop = 1
+    _channel_ids = ('A', 'B')
 
     def __init__(self, name: str, address: str, **kwargs):
+        # serializes the I/O of the logger thread and the caller
+        self._io_lock = threading.RLock()
         super().__init__(name, address, terminator="\r\n", **kwargs)
 
         # add channels
         channels = ChannelList(self, "TempSensors", SensorChannel, snapshotable=False)
-        for channel_id in ('A', 'B'):
+        for channel_id in self._channel_ids:
             channel = SensorChannel(self, 'Chan{}'.format(channel_id), channel_id)
             channels.append(channel)
             self.add_submodule(channel_id, channel)
@@ -107,3 +119,84 @@ class Model_331(VisaInstrument):
 
         # print connect message
         self.connect_message()
+
+    def write_raw(self, cmd: str) -> None:
+        with self._io_lock:
+            super().write_raw(cmd)
+
+    def ask_raw(self, cmd: str) -> str:
+        with self._io_lock:
+            return super().ask_raw(cmd)
+
+    def read_channels(self, channels: Optional[Sequence[str]] = None
+                      ) -> Dict[str, Tuple[float, float, int]]:
+        """
+        Read temperature, sensor raw value and reading status of several
+        channels with one chained query and update the cached values of
+        the channel parameters.
+
+        Args:
+            channels: channel IDs, all channels by default
+
+        Returns:
+            dict mapping the channel IDs to (temperature, sensor raw value,
+            reading status code)
+        """
+        channels = list(self._channel_ids if channels is None else channels)
+        query = ';'.join('KRDG? {0};SRDG? {0};RDGST? {0}'.format(c)
+                         for c in channels)
+        replies = self.ask(query).split(';')
+        if len(replies) != 3 * len(channels):
+            raise ValueError('Expected {} values, got {!r}'.format(
+                3 * len(channels), ';'.join(replies)))
+        readings = {}
+        for i, channel_id in enumerate(channels):
+            temperature = float(replies[3 * i])
+            sensor_raw = float(replies[3 * i + 1])
+            status = int(replies[3 * i + 2])
+            channel = self.submodules[channel_id]
+            channel.temperature.cache.set(temperature)
+            channel.sensor_raw.cache.set(sensor_raw)
+            try:
+                channel.sensor_status.cache._set_from_raw_value(status)
+            except KeyError:
+                # a combination of status bits without a name
+                channel.sensor_status.cache.invalidate()
+            readings[channel_id] = (temperature, sensor_raw, status)
+        return readings
+
+
+class Model331Logger(RingBufferLogger):
+    """
+    Records the sensor channels of a Lakeshore 331 in a background thread.
+
+    Every ``interval`` seconds all channels are read with ``read_channels``
+    and stored in ring buffers holding the last ``length`` readings.
+    ``data`` returns "<id>_temperature", "<id>_sensor_raw" and
+    "<id>_sensor_status" for every recorded channel.
+
+    Args:
+        lakeshore: Instrument to record
+        interval: Time between readings in seconds
+        length: Number of readings kept
+        channels: Channel IDs to record, all channels by default
+    """
+
+    _quantities = ('temperature', 'sensor_raw', 'sensor_status')
+
+    def __init__(self, lakeshore: Model_331, interval: float = 1.0,
+                 length: int = 3600,
+                 channels: Optional[Sequence[str]] = None):
+        self.lakeshore = lakeshore
+        self.channels = list(lakeshore._channel_ids if channels is None
+                             else channels)
+        columns = ['{}_{}'.format(channel, quantity)
+                   for channel in self.channels
+                   for quantity in self._quantities]
+        super().__init__(columns, interval, length,
+                         '{}_logger'.format(lakeshore.name))
+
+    def record(self) -> None:
+        """Read all channels once and store them in the ring buffers"""
+        readings = self.lakeshore.read_channels(self.channels)
+        self._store([value for c in self.channels for value in readings[c]])
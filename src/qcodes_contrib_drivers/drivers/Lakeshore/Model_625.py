@@ -1,6 +1,8 @@
+from concurrent.futures import Future
 import logging
+import threading
 import time
-from typing import Union, Tuple, Optional
+from typing import Dict, Union, Tuple, Optional
 
 
 from qcodes import VisaInstrument
@@ -24,11 +26,30 @@ class Lakeshore625(VisaInstrument):
         - enable or disable support for the persistent switch heater. If set to `None`, nothing is changed
         ramp_segments_enabled (bool | None) = False:
         - enable or disable ramp segments. If set to `None`, nothing is changed.
+        register_max_age (float) = 1.0:
+        - time in seconds for which a reply to LIMIT?, PSHS?, QNCH? or FLDS? is reused
     """
 
+    # registers read as a whole, and the parameters filled from their fields
+    _REGISTER_PARAMETERS = {
+        'LIMIT?': ('current_limit', 'voltage_limit', 'current_rate_limit'),
+        'PSHS?': ('persistent_switch_heater', None, None),
+        'QNCH?': ('quench_detection', 'quench_current_step_limit'),
+        'FLDS?': ('coil_constant_unit', 'coil_constant'),
+    }
+
+    _RAMP_START_DELAY = 0.5     # time for the power supply to fall into the ramping state
+    _RAMP_POLL_MIN = 0.1
+    _RAMP_POLL_MAX = 5.0
+
     def __init__(self, name: str, coil_constant: Optional[float],  field_ramp_rate: Optional[float], address: str,
                  reset: bool=False, terminator:str='', *, persistent_switch_heater_enabled: Optional[bool] = False,
-                 ramp_segments_enabled: Optional[bool] = False, **kwargs) -> None:
+                 ramp_segments_enabled: Optional[bool] = False, register_max_age: float = 1.0, **kwargs) -> None:
+
+        self._io_lock = threading.RLock()
+        self._register_max_age = register_max_age
+        self._registers: Dict[str, Tuple[float, str]] = {}
+        self._ramp: Optional[_FieldRamp] = None
 
         super().__init__(name, address, terminator=terminator, **kwargs)
     
@@ -252,6 +273,37 @@ class Lakeshore625(VisaInstrument):
             time.sleep(t)
 
 
+    def write_raw(self, cmd: str) -> None:
+        with self._io_lock:
+            super().write_raw(cmd)
+
+    def ask_raw(self, cmd: str) -> str:
+        with self._io_lock:
+            return super().ask_raw(cmd)
+
+    def _ask_register(self, cmd: str) -> str:
+        """
+        Query a register holding several settings. A reply younger than
+        register_max_age is reused, and each new reply updates the cache of
+        all parameters stored in the register.
+        """
+        entry = self._registers.get(cmd)
+        if entry is not None and time.monotonic() - entry[0] < self._register_max_age:
+            return entry[1]
+        raw_string = self.ask(cmd)
+        self._registers[cmd] = (time.monotonic(), raw_string)
+        for name, field in zip(self._REGISTER_PARAMETERS[cmd], raw_string.split(',')):
+            if name is not None and name in self.parameters:
+                self.parameters[name].cache._set_from_raw_value(field.strip())
+        return raw_string
+
+    def _write_register(self, cmd: str) -> None:
+        """
+        Write a register holding several settings and discard its stored reply.
+        """
+        self._registers.pop(cmd.split()[0] + '?', None)
+        self.write_raw(cmd)
+
     # get functions returning several values
     def _get_limit(self) -> Tuple[float, float, float]:
         """
@@ -261,7 +313,7 @@ class Lakeshore625(VisaInstrument):
         -------
             <current>, <voltage>, <rate>
         """
-        raw_string = self.ask('LIMIT?')
+        raw_string = self._ask_register('LIMIT?')
         current_limit, voltage_limit, current_rate_limit = raw_string.split(',')
         return float(current_limit), float(voltage_limit), float(current_rate_limit)
 
@@ -274,7 +326,7 @@ class Lakeshore625(VisaInstrument):
         -------
             <enable>, <current>, <delay>
         """
-        raw_string = self.ask('PSHS?')
+        raw_string = self._ask_register('PSHS?')
         status, psh_current, psh_delay = raw_string.split(',')
         return int(status), float(psh_current), float(psh_delay)
 
@@ -287,7 +339,7 @@ class Lakeshore625(VisaInstrument):
         -------
             <enable>, <rate>
         """
-        raw_string = self.ask('QNCH?')
+        raw_string = self._ask_register('QNCH?')
         status, current_step_limit = raw_string.split(',')
         return int(status), float(current_step_limit)
 
@@ -300,7 +352,7 @@ class Lakeshore625(VisaInstrument):
         -------
             <units>, <constant>
         """
-        raw_string = self.ask('FLDS?')
+        raw_string = self._ask_register('FLDS?')
         unit, coil_constant = raw_string.split(',')
         return str(unit), float(coil_constant)    
 
@@ -490,7 +542,7 @@ class Lakeshore625(VisaInstrument):
         Sets maximum allowed output current
         """
         current_limit, voltage_limit, current_rate_limit = self._get_limit()
-        self.write_raw('LIMIT {}, {}, {}'.format(current_limit_setpoint, voltage_limit, current_rate_limit))
+        self._write_register('LIMIT {}, {}, {}'.format(current_limit_setpoint, voltage_limit, current_rate_limit))
 
 
     def _set_voltage_limit(self, voltage_limit_setpoint: float) -> None:
@@ -498,7 +550,7 @@ class Lakeshore625(VisaInstrument):
         Sets maximum allowed compliance voltage
         """
         current_limit, voltage_limit, current_rate_limit = self._get_limit()
-        self.write_raw('LIMIT {}, {}, {}'.format(current_limit, voltage_limit_setpoint, current_rate_limit))
+        self._write_register('LIMIT {}, {}, {}'.format(current_limit, voltage_limit_setpoint, current_rate_limit))
 
 
     def _set_current_rate_limit(self, current_rate_limit_setpoint: float) -> None:
@@ -506,7 +558,7 @@ class Lakeshore625(VisaInstrument):
         Sets maximum allowed output current ramp rate
         """
         current_limit, voltage_limit, current_rate_limit = self._get_limit()
-        self.write_raw('LIMIT {}, {}, {}'.format(current_limit, voltage_limit, current_rate_limit_setpoint))
+        self._write_register('LIMIT {}, {}, {}'.format(current_limit, voltage_limit, current_rate_limit_setpoint))
 
 
     def _set_persistent_switch_heater_status(self, status_setpoint: int) -> None:
@@ -514,7 +566,7 @@ class Lakeshore625(VisaInstrument):
         Specifies if there is a persistent switch: 0 = Disabled (no PSH), 1 = Enabled
         """
         status, psh_current, psh_delay = self._get_persistent_switch_heater_setup()
-        self.write_raw('PSHS {}, {}, {}'.format(status_setpoint, psh_current, psh_delay))
+        self._write_register('PSHS {}, {}, {}'.format(status_setpoint, psh_current, psh_delay))
 
 
     def _set_quench_detection_status(self, status_setpoint: int) -> None:
@@ -522,7 +574,7 @@ class Lakeshore625(VisaInstrument):
         Specifies if quench detection is to be used: 0 = Disabled, 1 = Enabled
         """
         status, current_step_limit = self._get_quench_detection_setup()
-        self.write_raw('QNCH {}, {}'.format(status_setpoint, current_step_limit))
+        self._write_register('QNCH {}, {}'.format(status_setpoint, current_step_limit))
 
 
     def _set_quench_current_step_limit(self, current_step_limit_setpoint: float) -> None:
@@ -530,7 +582,7 @@ class Lakeshore625(VisaInstrument):
         Specifies the current step limit for quench detection
         """
         status, current_step_limit = self._get_quench_detection_setup()
-        self.write_raw('QNCH {}, {}'.format(status, current_step_limit_setpoint))
+        self._write_register('QNCH {}, {}'.format(status, current_step_limit_setpoint))
 
 
     def _set_coil_constant(self, coil_constant_setpoint: float) -> None:
@@ -538,7 +590,7 @@ class Lakeshore625(VisaInstrument):
         Specifies the magnetic field constant in either T/A or kG/A depending on units
         """
         coil_constant_unit, coil_constant = self._get_field_setup()
-        self.write_raw('FLDS {}, {}'.format(coil_constant_unit, coil_constant_setpoint))
+        self._write_register('FLDS {}, {}'.format(coil_constant_unit, coil_constant_setpoint))
 
 
     def _set_coil_constant_unit(self, coil_constant_unit_setpoint: str) -> None:
@@ -559,7 +611,7 @@ class Lakeshore625(VisaInstrument):
             (int(coil_constant_unit), int(coil_constant_unit_setpoint))
         ] (coil_constant)
 
-        self.write_raw('FLDS {}, {}'.format(coil_constant_unit_setpoint, coil_constant_setpoint))
+        self._write_register('FLDS {}, {}'.format(coil_constant_unit_setpoint, coil_constant_setpoint))
 
 
     def _update_coil_constant(self, coil_constant_setpoint: float) -> None:
@@ -592,17 +644,92 @@ class Lakeshore625(VisaInstrument):
             value: field setpoint
             block: Whether to wait until the field has finished setting
         """
-
-        self.write('SETF {}'.format(value))
+        ramp = self.ramp_field(value)
         # Check if we want to block
         if not block:
             return
 
-        # Otherwise, wait until no longer ramping
         self.log.debug(f'Starting blocking ramp of {self.name} to {value}')
-        self._sleep(0.5)    # wait for a short time for the power supply to fall into the ramping state
-        while self.ramping_state() == 'ramping':
-            self._sleep(0.3)
-        self._sleep(2.0)
+        ramp.result()
         self.log.debug(f'Finished blocking ramp')
-        return
+
+    def ramp_field(self, value: float, settle_time: float = 2.0) -> 'Future[float]':
+        """
+        Start a ramp to a certain field without blocking.
+
+        The ramping state is monitored on a background thread. The poll interval
+        follows the remaining ramp time predicted from the present field and the
+        field ramp rate. A ramp still in progress is superseded, and its future
+        cancelled.
+
+        Args:
+            value: field setpoint (T)
+            settle_time: wait after the ramp has finished (s)
+
+        Returns
+        -------
+            future resolving to the field (T) once the ramp has finished
+        """
+        start_field = self.field()
+        rate = abs(self.field_ramp_rate.get_latest()) / 60    # T/s
+        duration = abs(value - start_field) / rate if rate else 0.0
+
+        future: 'Future[float]' = Future()
+        ramp = _FieldRamp(future, value, duration + settle_time)
+        with self._io_lock:
+            if self._ramp is not None:
+                self._ramp.future.cancel()
+            self._ramp = ramp
+            self.write('SETF {}'.format(value))
+        thread = threading.Thread(target=self._monitor_ramp, args=(ramp, settle_time),
+                                  name=f'{self.name}_ramp', daemon=True)
+        thread.start()
+        return future
+
+    def ramp_time_remaining(self) -> float:
+        """
+        Predicted time until the present ramp has finished, in seconds,
+        0 if no ramp is in progress.
+        """
+        ramp = self._ramp
+        if ramp is None or ramp.future.done():
+            return 0.0
+        return max(ramp.expected_end - time.monotonic(), 0.0)
+
+    def _monitor_ramp(self, ramp: '_FieldRamp', settle_time: float) -> None:
+        """
+        Poll OPST? until the ramp has finished, then resolve its future.
+        """
+        try:
+            self._sleep(self._RAMP_START_DELAY)
+            overdue_interval = self._RAMP_POLL_MIN
+            while not ramp.future.cancelled():
+                if self.ramping_state() == 'not ramping':
+                    break
+                remaining = ramp.expected_end - settle_time - time.monotonic()
+                if remaining > 0:
+                    interval = remaining / 2
+                else:
+                    # slower than predicted, back off
+                    interval = overdue_interval
+                    overdue_interval *= 1.5
+                self._sleep(min(max(interval, self._RAMP_POLL_MIN), self._RAMP_POLL_MAX))
+            if ramp.future.cancelled():
+                return
+            self._sleep(settle_time)
+            field = self.field()
+        except Exception as e:
+            if not ramp.future.cancelled():
+                ramp.future.set_exception(e)
+            return
+        if ramp.future.set_running_or_notify_cancel():
+            ramp.future.set_result(field)
+
+
+class _FieldRamp:
+    """Bookkeeping of a field ramp in progress"""
+
+    def __init__(self, future: Future, target: float, expected_duration: float):
+        self.future = future
+        self.target = target
+        self.expected_end = time.monotonic() + expected_duration
@@ -11,11 +11,15 @@ acquiring data on multiple analog inputs, see
 https://scanning-squid.readthedocs.io/en/latest/_modules/microscope/susceptometer.html#SusceptometerMicroscope.scan_surface
 """
 
-from typing import Dict, Optional, Sequence, Any, Union
+from collections import deque
+from threading import Lock
+from typing import Callable, Deque, Dict, Mapping, Optional, Sequence, Any, Union
 import numpy as np
 
 import nidaqmx
-from nidaqmx.constants import AcquisitionType, TaskMode
+from nidaqmx.constants import AcquisitionType, Edge, RegenerationMode, TaskMode
+from nidaqmx.stream_readers import AnalogMultiChannelReader
+from nidaqmx.stream_writers import AnalogMultiChannelWriter
 from qcodes.instrument.base import Instrument
 from qcodes.instrument.parameter import Parameter, ArrayParameter, ParameterWithSetpoints
 from qcodes.utils.helpers import create_on_off_val_mapping
@@ -24,6 +28,9 @@ from nidaqmx.constants import LineGrouping
 class DAQAnalogInputVoltages(ArrayParameter):
     """Acquires data from one or several DAQ analog inputs.
 
+    Samples are read with an ``AnalogMultiChannelReader`` straight into a
+    preallocated float64 buffer of shape (nchannels, samples_to_read).
+
     Args:
         name: Name of parameter (usually 'voltage').
         task: nidaqmx.Task with appropriate analog inputs channels.
@@ -39,14 +46,24 @@ class DAQAnalogInputVoltages(ArrayParameter):
         self.nchannels, self.target_points = shape
         self.samples_to_read = samples_to_read
         self.timeout = timeout
-        
+        self._reader = AnalogMultiChannelReader(task.in_stream)
+        self._buffer = np.empty((self.nchannels, samples_to_read), dtype=np.float64)
+
     def get_raw(self):
         """Averages data to get `self.target_points` points per channel.
         If `self.target_points` == `self.samples_to_read`, no averaging is done.
         """
-        data_raw = np.array(self.task.read(number_of_samples_per_channel=self.samples_to_read, timeout=self.timeout))
-        return np.mean(np.reshape(data_raw, (self.nchannels, self.target_points, -1)), 2)
-    
+        if getattr(self.instrument, 'continuous', False):
+            raise RuntimeError('Cannot read single points while a continuous '
+                               'acquisition is running, use read_continuous.')
+        self._reader.read_many_sample(
+            self._buffer,
+            number_of_samples_per_channel=self.samples_to_read,
+            timeout=self.timeout)
+        if self.target_points == self.samples_to_read:
+            return self._buffer.copy()
+        return np.mean(np.reshape(self._buffer, (self.nchannels, self.target_points, -1)), 2)
+
 class DAQAnalogInputs(Instrument):
     """Instrument to acquire DAQ analog input data in a qcodes Loop or measurement.
 
@@ -66,6 +83,11 @@ class DAQAnalogInputs(Instrument):
             samples_to_read will be averaged down to target_points.
         timeout: Acquisition timeout in seconds. Default: 60.
         kwargs: Keyword arguments to be passed to Instrument constructor.
+
+    Besides the default finite acquisition, where the task is armed for every
+    point, the inputs can be run in a continuous, buffered mode with
+    ``start_continuous``. Blocks of samples are then read from the
+    running task in an every-N-samples callback and reduced on the fly.
     """
     def __init__(self, name: str, dev_name: str, rate: Union[int, float], channels: Dict[str, int],
                  task: Any, min_val: Optional[float]=-5, max_val: Optional[float]=5,
@@ -79,8 +101,18 @@ class DAQAnalogInputs(Instrument):
                 target_points = samples_to_read
         self.rate = rate
         nchannels = len(channels)
+        self.nchannels = nchannels
         self.samples_to_read = samples_to_read
+        self.clock_src = clock_src
         self.task = task
+        self._continuous = False
+        self._reader = AnalogMultiChannelReader(self.task.in_stream)
+        self._block: Optional[np.ndarray] = None
+        self._blocks: Deque[np.ndarray] = deque()
+        self._blocks_lock = Lock()
+        self._downsample = 1
+        self._reduction = 'mean'
+        self._block_callback: Optional[Callable[[np.ndarray], Any]] = None
         self.metadata.update({
             'dev_name': dev_name,
             'rate': f'{rate} Hz',
@@ -88,20 +120,7 @@ class DAQAnalogInputs(Instrument):
         for ch, idx in channels.items():
             channel = f'{dev_name}/ai{idx}'
             self.task.ai_channels.add_ai_voltage_chan(channel, ch, min_val=min_val, max_val=max_val)
-        if clock_src is None:
-            # Use default sample clock timing: ai/SampleClockTimebase
-            self.task.timing.cfg_samp_clk_timing(
-                rate,
-                sample_mode=AcquisitionType.FINITE,
-                samps_per_chan=samples_to_read)
-        else:
-            # Clock the inputs on some other clock signal, e.g. ao/SampleClock for synchronous acquisition
-            self.task.timing.cfg_samp_clk_timing(
-                    rate,
-                    source=clock_src,
-                    sample_mode=AcquisitionType.FINITE,
-                    samps_per_chan=samples_to_read
-            )
+        self._configure_timing(AcquisitionType.FINITE, samples_to_read)
         # We need a parameter in order to acquire voltage in a qcodes Loop or Measurement
         self.add_parameter(
             name='voltage',
@@ -112,7 +131,181 @@ class DAQAnalogInputs(Instrument):
             timeout=timeout,
             label='Voltage',
             unit='V'
-        ) 
+        )
+
+    def _configure_timing(self, sample_mode: AcquisitionType, samps_per_chan: int) -> None:
+        if self.clock_src is None:
+            # Use default sample clock timing: ai/SampleClockTimebase
+            self.task.timing.cfg_samp_clk_timing(
+                self.rate,
+                sample_mode=sample_mode,
+                samps_per_chan=samps_per_chan)
+        else:
+            # Clock the inputs on some other clock signal, e.g. ao/SampleClock for synchronous acquisition
+            self.task.timing.cfg_samp_clk_timing(
+                    self.rate,
+                    source=self.clock_src,
+                    sample_mode=sample_mode,
+                    samps_per_chan=samps_per_chan
+            )
+
+    @property
+    def continuous(self) -> bool:
+        """True while a continuous acquisition is running."""
+        return self._continuous
+
+    def start_continuous(self, samples_per_callback: int, downsample: int = 1,
+                         reduction: str = 'mean', buffer_size: Optional[int] = None,
+                         callback: Optional[Callable[[np.ndarray], Any]] = None,
+                         clock_src: Optional[str] = None) -> None:
+        """Start a continuous, buffered acquisition.
+
+        Every `samples_per_callback` samples per channel, the new samples are
+        read into a preallocated float64 buffer and reduced by `downsample`.
+        The reduced block of shape (nchannels, samples_per_callback // downsample)
+        is either passed to `callback` or queued for ``read_continuous``.
+
+        Args:
+            samples_per_callback: Number of samples per channel per callback.
+            downsample: Reduction factor, must divide `samples_per_callback`.
+            reduction: 'mean' to average `downsample` consecutive samples,
+                'decimate' to keep every `downsample`-th sample.
+            buffer_size: Size of the DAQ buffer in samples per channel.
+                Default: 10 * samples_per_callback.
+            callback: Optional function called with every reduced block
+                (from the nidaqmx callback thread).
+            clock_src: Sample clock source, e.g. '/Dev1/ao/SampleClock' to
+                share the sample clock of a hardware-timed AO task.
+                Default: the clock_src given at construction.
+        """
+        if self._continuous:
+            raise RuntimeError('Continuous acquisition is already running.')
+        if downsample < 1 or samples_per_callback % downsample:
+            raise ValueError('downsample must be a positive divisor of samples_per_callback.')
+        if reduction not in ('mean', 'decimate'):
+            raise ValueError(f"Unknown reduction '{reduction}', expected 'mean' or 'decimate'.")
+        if buffer_size is None:
+            buffer_size = 10 * samples_per_callback
+
+        self.task.stop()
+        self._downsample = downsample
+        self._reduction = reduction
+        self._block_callback = callback
+        self._block = np.empty((self.nchannels, samples_per_callback), dtype=np.float64)
+        with self._blocks_lock:
+            self._blocks.clear()
+        saved_clock_src = self.clock_src
+        if clock_src is not None:
+            self.clock_src = clock_src
+        try:
+            self._configure_timing(AcquisitionType.CONTINUOUS, buffer_size)
+        finally:
+            self.clock_src = saved_clock_src
+        self.task.register_every_n_samples_acquired_into_buffer_event(
+            samples_per_callback, self._every_n_samples)
+        self._continuous = True
+        self.task.start()
+
+    def _every_n_samples(self, task_handle: Any, event_type: Any,
+                         number_of_samples: int, callback_data: Any) -> int:
+        """nidaqmx every-N-samples callback. Must return 0."""
+        block = self._block
+        if block is None:
+            return 0
+        self._reader.read_many_sample(
+            block, number_of_samples_per_channel=block.shape[1], timeout=0)
+        n = self._downsample
+        if n == 1:
+            reduced = block.copy()
+        elif self._reduction == 'mean':
+            reduced = block.reshape(self.nchannels, -1, n).mean(axis=2)
+        else:
+            reduced = block[:, ::n].copy()
+        if self._block_callback is not None:
+            self._block_callback(reduced)
+        else:
+            with self._blocks_lock:
+                self._blocks.append(reduced)
+        return 0
+
+    def read_continuous(self) -> np.ndarray:
+        """Return all reduced blocks acquired since the last call,
+        concatenated to an array of shape (nchannels, npoints).
+        """
+        with self._blocks_lock:
+            blocks = list(self._blocks)
+            self._blocks.clear()
+        if not blocks:
+            return np.empty((self.nchannels, 0), dtype=np.float64)
+        return np.concatenate(blocks, axis=1)
+
+    def stop_continuous(self) -> np.ndarray:
+        """Stop the continuous acquisition and restore finite timing.
+
+        Returns:
+            The reduced data not yet fetched with ``read_continuous``.
+        """
+        if not self._continuous:
+            return np.empty((self.nchannels, 0), dtype=np.float64)
+        self.task.stop()
+        self.task.register_every_n_samples_acquired_into_buffer_event(
+            self._block.shape[1] if self._block is not None else 0, None)
+        self._continuous = False
+        self._block = None
+        self._block_callback = None
+        self._configure_timing(AcquisitionType.FINITE, self.samples_to_read)
+        return self.read_continuous()
+
+    def arm(self, samples_per_chan: int, clock_src: Optional[str] = None,
+            rate: Optional[Union[int, float]] = None) -> None:
+        """Configure and start a finite acquisition of `samples_per_chan`
+        samples, e.g. clocked by the sample clock of a hardware-timed AO
+        waveform (see ``DAQAnalogOutputs.sweep``). Read the data with ``fetch``.
+
+        Args:
+            samples_per_chan: Number of samples per channel to acquire.
+            clock_src: Sample clock source for this acquisition. Default: the
+                clock_src given at construction.
+            rate: Sample rate for this acquisition. With an external clock
+                source this must be the rate of that clock. Default: the
+                rate given at construction.
+        """
+        if self._continuous:
+            raise RuntimeError('Continuous acquisition is running.')
+        self.task.stop()
+        saved_clock_src, saved_rate = self.clock_src, self.rate
+        if clock_src is not None:
+            self.clock_src = clock_src
+        if rate is not None:
+            self.rate = rate
+        try:
+            self._configure_timing(AcquisitionType.FINITE, samples_per_chan)
+        finally:
+            self.clock_src, self.rate = saved_clock_src, saved_rate
+        self.task.start()
+
+    def fetch(self, samples_per_chan: int, timeout: Optional[Union[float, int]] = None) -> np.ndarray:
+        """Read the samples of an acquisition started with ``arm`` and restore
+        the timing used by the `voltage` parameter.
+
+        Returns:
+            Array of shape (nchannels, samples_per_chan).
+        """
+        data = np.empty((self.nchannels, samples_per_chan), dtype=np.float64)
+        if timeout is None:
+            timeout = self.voltage.timeout
+        try:
+            self._reader.read_many_sample(
+                data, number_of_samples_per_channel=samples_per_chan, timeout=timeout)
+        finally:
+            self.task.stop()
+            self._configure_timing(AcquisitionType.FINITE, self.samples_to_read)
+        return data
+
+    def close(self) -> None:
+        if self._continuous:
+            self.stop_continuous()
+        super().close()
 
 class DAQAnalogOutputVoltage(Parameter):
     """Writes data to one or several DAQ analog outputs. This only writes one channel at a time,
@@ -145,6 +338,11 @@ class DAQAnalogOutputVoltage(Parameter):
 class DAQAnalogOutputs(Instrument):
     """Instrument to write DAQ analog output data in a qcodes Loop or measurement.
 
+    Besides the per-channel `voltage_*` parameters, which write one on-demand
+    value per set, whole waveforms can be written with sample clock timing
+    using ``write_waveform`` and, synchronized with ``DAQAnalogInputs``,
+    ``sweep``.
+
     Args:
         name: Name of instrument (usually 'daq_ao').
         dev_name: NI DAQ device name (e.g. 'Dev1').
@@ -153,6 +351,11 @@ class DAQAnalogOutputs(Instrument):
     """
     def __init__(self, name: str, dev_name: str, channels: Dict[str, int], **kwargs) -> None:
         super().__init__(name, **kwargs)
+        self.dev_name = dev_name
+        self.channels = channels
+        self.waveform_task: Optional[Any] = None
+        self._waveform_timeout: float = 10.0
+        self._waveform_end: Dict[str, float] = {}
         self.metadata.update({
             'dev_name': dev_name,
             'channels': channels})
@@ -166,7 +369,146 @@ class DAQAnalogOutputs(Instrument):
                 label='Voltage',
                 unit='V'
             )
-            
+
+    @property
+    def sample_clock(self) -> str:
+        """Terminal of the AO sample clock, to be used as `clock_src` of
+        ``DAQAnalogInputs`` for synchronous acquisition.
+        """
+        return f'/{self.dev_name}/ao/SampleClock'
+
+    def write_waveform(self, waveforms: Mapping[str, Sequence[float]], rate: Union[int, float],
+                       regenerate: bool = False, trigger_src: Optional[str] = None,
+                       trigger_edge: str = 'rising', clock_src: Optional[str] = None,
+                       auto_start: bool = True, timeout: Union[float, int] = 10) -> None:
+        """Write waveforms to one or several analog outputs with sample clock timing.
+
+        All waveforms are written with a single ``AnalogMultiChannelWriter``
+        call into the device buffer. A previously written waveform is stopped.
+
+        Args:
+            waveforms: Dict of channel name (as in `channels`) to 1D array of
+                voltages. All waveforms must have the same length.
+            rate: Sample rate per channel in Hz.
+            regenerate: If True, the waveform is output repeatedly until
+                ``stop_waveform`` is called. Otherwise it is output once.
+            trigger_src: Optional terminal of a digital start trigger,
+                e.g. '/Dev1/PFI0'.
+            trigger_edge: 'rising' or 'falling' edge of the start trigger.
+            clock_src: Optional external sample clock source.
+            auto_start: Start the output immediately (it will still wait for
+                the start trigger if one is given).
+            timeout: Write and wait timeout in seconds.
+        """
+        unknown = set(waveforms) - set(self.channels)
+        if unknown:
+            raise ValueError(f'Unknown channels {sorted(unknown)}, expected any of {list(self.channels)}.')
+        arrays = [np.asarray(wf, dtype=np.float64).ravel() for wf in waveforms.values()]
+        if len({len(wf) for wf in arrays}) != 1:
+            raise ValueError('All waveforms must have the same length.')
+        data = np.ascontiguousarray(np.vstack(arrays))
+        nsamples = data.shape[1]
+        if nsamples < 2:
+            raise ValueError('Waveforms must have at least two samples.')
+
+        self.stop_waveform()
+        task = nidaqmx.Task(f'{self.name}_waveform')
+        try:
+            for ch in waveforms:
+                task.ao_channels.add_ao_voltage_chan(f'{self.dev_name}/ao{self.channels[ch]}', ch)
+            sample_mode = AcquisitionType.CONTINUOUS if regenerate else AcquisitionType.FINITE
+            if clock_src is None:
+                task.timing.cfg_samp_clk_timing(rate, sample_mode=sample_mode,
+                                                samps_per_chan=nsamples)
+            else:
+                task.timing.cfg_samp_clk_timing(rate, source=clock_src, sample_mode=sample_mode,
+                                                samps_per_chan=nsamples)
+            if regenerate:
+                task.out_stream.regen_mode = RegenerationMode.ALLOW_REGENERATION
+            if trigger_src is not None:
+                edge = {'rising': Edge.RISING, 'falling': Edge.FALLING}[trigger_edge]
+                task.triggers.start_trigger.cfg_dig_edge_start_trig(trigger_src, trigger_edge=edge)
+            AnalogMultiChannelWriter(task.out_stream, auto_start=False).write_many_sample(
+                data, timeout=timeout)
+        except Exception:
+            task.close()
+            raise
+        self.waveform_task = task
+        self._waveform_timeout = timeout + nsamples / rate
+        # the final values are recorded once the output is done, see wait_waveform
+        self._waveform_end = {} if regenerate else {
+            ch: wf[-1] for ch, wf in zip(waveforms, data)}
+        if auto_start:
+            task.start()
+
+    def start_waveform(self) -> None:
+        """Start the output of a waveform written with `auto_start=False`."""
+        if self.waveform_task is None:
+            raise RuntimeError('No waveform has been written.')
+        self.waveform_task.start()
+
+    def wait_waveform(self, timeout: Optional[Union[float, int]] = None) -> None:
+        """Wait until a one-shot waveform has been output and record the
+        final values as the voltages of the outputs.
+        """
+        if self.waveform_task is not None:
+            self.waveform_task.wait_until_done(
+                timeout=self._waveform_timeout if timeout is None else timeout)
+            for ch, voltage in self._waveform_end.items():
+                getattr(self, f'voltage_{ch.lower()}')._voltage = voltage
+            self._waveform_end = {}
+
+    def stop_waveform(self) -> None:
+        """Stop the waveform output and release the task.
+
+        The voltage of outputs stopped before the end of a one-shot waveform
+        is unknown (NaN).
+        """
+        if self.waveform_task is not None:
+            try:
+                self.waveform_task.stop()
+            finally:
+                self.waveform_task.close()
+                self.waveform_task = None
+                for ch in self._waveform_end:
+                    getattr(self, f'voltage_{ch.lower()}')._voltage = np.nan
+                self._waveform_end = {}
+
+    def sweep(self, waveforms: Mapping[str, Sequence[float]], rate: Union[int, float],
+              daq_ai: DAQAnalogInputs, trigger_src: Optional[str] = None,
+              timeout: Optional[Union[float, int]] = None) -> np.ndarray:
+        """Output waveforms once and acquire the analog inputs on the AO sample clock,
+        i.e. one input sample per output point.
+
+        Args:
+            waveforms: Dict of channel name to 1D array of voltages, e.g. one
+                (flattened) line or frame of a raster scan.
+            rate: Point rate in Hz, used for both the outputs and the inputs.
+            daq_ai: Analog inputs to acquire, clocked by ``sample_clock``.
+            trigger_src: Optional start trigger of the output.
+            timeout: Acquisition timeout in seconds.
+
+        Returns:
+            Array of shape (daq_ai.nchannels, npoints).
+        """
+        self.write_waveform(waveforms, rate, trigger_src=trigger_src, auto_start=False)
+        npoints = len(next(iter(waveforms.values())))
+        if timeout is None:
+            timeout = self._waveform_timeout
+        try:
+            # the inputs wait for the first edge of the AO sample clock
+            daq_ai.arm(npoints, clock_src=self.sample_clock, rate=rate)
+            self.start_waveform()
+            data = daq_ai.fetch(npoints, timeout=timeout)
+            self.wait_waveform(timeout)
+        finally:
+            self.stop_waveform()
+        return data
+
+    def close(self) -> None:
+        self.stop_waveform()
+        super().close()
+
 class DAQDigitalOutputState(Parameter):
     """Writes data to one or several DAQ digital outputs.
 
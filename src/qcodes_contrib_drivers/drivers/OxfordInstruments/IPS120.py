@@ -12,7 +12,7 @@
 import logging
 from qcodes import VisaInstrument
 from qcodes import validators as vals
-from time import sleep
+from time import monotonic, sleep
 import pyvisa
 
 
@@ -94,6 +94,10 @@ class OxfordInstruments_IPS120(VisaInstrument):
             2: "To zero"}
 
     _WRITE_WAIT = 100e-3 # seconds
+    _STATUS_MAX_AGE = 100e-3 # seconds, reuse of a decoded status word
+    _POLL_INTERVAL_MIN = 100e-3 # seconds
+    _POLL_INTERVAL_MAX = 5 # seconds
+    _HEATER_TIMEOUT = 10 # seconds for the heater to report the new state
 
     def __init__(self, name, address, use_gpib=False, number=2, **kwargs):
         """Initializes the Oxford Instruments IPS 120 Magnet Power Supply.
@@ -110,6 +114,8 @@ class OxfordInstruments_IPS120(VisaInstrument):
         self._number = number
         self._values = {}
         self._use_gpib = use_gpib
+        self._status = None
+        self._status_time = 0.0
 
         # Add parameters
         self.add_parameter('mode',
@@ -208,6 +214,15 @@ class OxfordInstruments_IPS120(VisaInstrument):
         self.add_parameter('trip_current',
                            unit='A',
                            get_cmd=self._get_trip_current)
+        self.add_parameter('switch_heater_delay',
+                           unit='s',
+                           get_cmd=None,
+                           set_cmd=None,
+                           initial_value=40,
+                           vals=vals.Numbers(0, 600),
+                           docstring='Time for the switch to respond, '
+                                     'counted from the moment the device '
+                                     'reports the new switch heater state.')
 
         if not self._use_gpib:
             self.visa_handle.set_visa_attribute(
@@ -236,16 +251,19 @@ class OxfordInstruments_IPS120(VisaInstrument):
             message (str) : write command for the device
 
         Returns:
-            Response from the device as a string.
+            Response from the device as a string. The read returns as soon
+            as the terminated reply has arrived.
         """
         self.log.info('Send the following command to the device: %s' % message)
 
+        if message[0] not in 'RVX':
+            # any other command may change the status word
+            self._status = None
+
         if self._use_gpib:
             return self.ask(message)
 
-        self.visa_handle.write('@%s%s' % (self._number, message))
-        sleep(self._WRITE_WAIT)  # wait for the device to be able to respond
-        result = self._read()
+        result = self.ask('@%s%s' % (self._number, message))
         if result.find('?') >= 0:
             print("Error: Command %s not recognized" % message)
         else:
@@ -265,6 +283,55 @@ class OxfordInstruments_IPS120(VisaInstrument):
         mes = str(mes[0].decode())
         return mes
 
+    @classmethod
+    def decode_status(cls, result):
+        """
+        Decode the reply to the examine status command ``X``.
+
+        Args:
+            result (str) : status word of the form XmnAnCnHnMmnPmn
+
+        Returns:
+            dict mapping the status parameter names to their values.
+        """
+        return {
+            'system_status': cls._GET_SYSTEM_STATUS[int(result[1])],
+            'system_status2': cls._GET_SYSTEM_STATUS2[int(result[2])],
+            'activity': cls._SET_ACTIVITY[int(result[4])],
+            'remote_status': cls._GET_STATUS_REMOTE[int(result[6])],
+            'switch_heater': cls._GET_STATUS_SWITCH_HEATER[int(result[8])],
+            'mode': cls._GET_STATUS_MODE[int(result[10])],
+            'mode2': cls._GET_STATUS_MODE2[int(result[11])],
+            'polarity': cls._GET_POLARITY_STATUS1[int(result[13])] +
+                ", " + cls._GET_POLARITY_STATUS2[int(result[14])]}
+
+    def get_status(self):
+        """
+        Read the status word once and update the cache of all parameters
+        decoded from it.
+
+        Returns:
+            dict mapping the status parameter names to their values.
+        """
+        self.log.info('Get status')
+        status = self.decode_status(self._execute('X'))
+        self._status = status
+        self._status_time = monotonic()
+        for name, value in status.items():
+            self.parameters[name].cache._set_from_raw_value(value)
+        return status
+
+    def _get_status_field(self, name):
+        """
+        Return one field of the status word. A status word read less than
+        _STATUS_MAX_AGE ago is reused, so that reading several status
+        parameters costs a single query.
+        """
+        if (self._status is None or
+                monotonic() - self._status_time > self._STATUS_MAX_AGE):
+            self.get_status()
+        return self._status[name]
+
     def identify(self):
         """Identify the device"""
         self.log.info('Identify the device')
@@ -339,8 +406,7 @@ class OxfordInstruments_IPS120(VisaInstrument):
             "Auto-run-down"
         """
         self.log.info('Get remote control status')
-        result = self._execute('X')
-        return self._GET_STATUS_REMOTE[int(result[6])]
+        return self._get_status_field('remote_status')
 
     def _set_remote_status(self, mode):
         """
@@ -369,9 +435,8 @@ class OxfordInstruments_IPS120(VisaInstrument):
             "Warming Up",
             "Fault"
         """
-        result = self._execute('X')
         self.log.info('Getting system status')
-        return self._GET_SYSTEM_STATUS[int(result[1])]
+        return self._get_status_field('system_status')
 
     def _get_system_status2(self):
         """
@@ -385,9 +450,8 @@ class OxfordInstruments_IPS120(VisaInstrument):
             "Outside negative current limit",
             "Outside positive current limit"
         """
-        result = self._execute('X')
         self.log.info('Getting system status')
-        return self._GET_SYSTEM_STATUS2[int(result[2])]
+        return self._get_status_field('system_status2')
 
     def _get_current(self):
         """
@@ -649,8 +713,7 @@ class OxfordInstruments_IPS120(VisaInstrument):
             result(str) : "Hold", "Set point", "Zero" or "Clamp".
         """
         self.log.info('Get activity of the magnet.')
-        result = self._execute('X')
-        return self._SET_ACTIVITY[int(result[4])]
+        return self._get_status_field('activity')
 
     def _set_activity(self, mode):
         """
@@ -690,13 +753,13 @@ class OxfordInstruments_IPS120(VisaInstrument):
             result(str): See _GET_STATUS_SWITCH_HEATER.
         """
         self.log.info('Get switch heater status')
-        result = self._execute('X')
-        return self._GET_STATUS_SWITCH_HEATER[int(result[8])]
+        return self._get_status_field('switch_heater')
 
     def _set_switch_heater(self, mode):
         """
         Set the switch heater Off or On. Note: After issuing a command it is necessary to wait
-        several seconds for the switch to respond.
+        several seconds for the switch to respond. This waits until the
+        device reports the new heater state and then for switch_heater_delay.
         Args:
             mode (int) :
             0 : Off
@@ -706,13 +769,70 @@ class OxfordInstruments_IPS120(VisaInstrument):
             self.log.info('Setting switch heater to %d' % mode)
             self.remote()
             self._execute('H%s' % mode)
-            print("Setting switch heater... (wait 40s)")
             self.local()
-            sleep(40)
+            if self._wait_for_switch_heater(mode):
+                delay = self.switch_heater_delay()
+                print("Setting switch heater... (wait %gs)" % delay)
+                sleep(delay)
         else:
             print('Invalid mode inserted.')
-        sleep(0.1)
-        self.switch_heater()
+        self.get_status()
+
+    def _wait_for_switch_heater(self, mode):
+        """
+        Poll the status word until it reports the switch heater state set
+        by ``H{mode}``.
+
+        Returns:
+            True if the switch is changing state, False if no switch is
+            fitted or the heater reports a fault.
+        """
+        targets = [1] if mode else [0, 2]
+        states = [self._GET_STATUS_SWITCH_HEATER[t] for t in targets]
+        deadline = monotonic() + self._HEATER_TIMEOUT
+        while True:
+            state = self.get_status()['switch_heater']
+            if state in states:
+                return True
+            if state in (self._GET_STATUS_SWITCH_HEATER[5],
+                         self._GET_STATUS_SWITCH_HEATER[8]):
+                print('Switch heater: %s' % state)
+                return False
+            if monotonic() > deadline:
+                raise TimeoutError('Switch heater did not report the state '
+                                   '%s, but %s' % (states, state))
+            sleep(self._POLL_INTERVAL_MIN)
+
+    def wait_until_at_rest(self, timeout=None):
+        """
+        Wait until the magnet supply is at rest. The status is polled at an
+        interval following the remaining sweep time, estimated from the
+        measured output current, the target of the activity and the sweep
+        rate.
+
+        Args:
+            timeout (float) : maximum time to wait in seconds, no limit if
+                None.
+        """
+        deadline = None if timeout is None else monotonic() + timeout
+        rate = abs(self.sweeprate_current.get_latest()) / 60  # A/s
+        while True:
+            status = self.get_status()
+            if status['mode2'] == self._GET_STATUS_MODE2[0]:
+                return
+            if status['activity'] == self._SET_ACTIVITY[2]:
+                target = 0.0
+            else:
+                target = self.current_setpoint.get_latest()
+            remaining = abs(target - self.current()) / rate if rate else 0
+            interval = min(max(remaining / 2, self._POLL_INTERVAL_MIN),
+                           self._POLL_INTERVAL_MAX)
+            if deadline is not None:
+                if monotonic() >= deadline:
+                    raise TimeoutError('Magnet still sweeping after %s s'
+                                       % timeout)
+                interval = min(interval, max(deadline - monotonic(), 0))
+            sleep(interval)
 
     def heater_on(self):
         """Switch the heater on, with PSU = Magnet current check"""
@@ -730,18 +850,22 @@ class OxfordInstruments_IPS120(VisaInstrument):
                 print('Magnet supply not at rest, cannot switch on heater!')
         self.switch_heater()
 
-    def set_persistent(self):
+    def set_persistent(self, settle_time=20):
         """
         Puts magnet into persistent mode
 
-        Note: After turning of the switch heater we will wait for additional 20
-        seconds before we put the current to zero. This is done to make sure
-        that the switch heater is cold enough and becomes superconducting.
+        Note: After turning of the switch heater we will wait for additional
+        settle_time seconds before we put the current to zero. This is done
+        to make sure that the switch heater is cold enough and becomes
+        superconducting, which the device cannot report.
+
+        Args:
+            settle_time (float) : additional wait in seconds, defaults to 20.
         """
         if self.mode2() == self._GET_STATUS_MODE2[0]:
             self.heater_off()
             print('Waiting for the switch heater to become superconducting')
-            sleep(20)
+            sleep(settle_time)
             self.to_zero()
             self.get_all()
         else:
@@ -755,13 +879,11 @@ class OxfordInstruments_IPS120(VisaInstrument):
         """
         if self.switch_heater() == self._GET_STATUS_SWITCH_HEATER[2]:
             field_in_magnet = self.persistent_field()
-            field_in_leads = self.field()
             self.hold()
             self.field_setpoint(field_in_magnet)
             self.to_setpoint()
 
-            while field_in_leads != field_in_magnet:
-                field_in_leads = self.field()
+            self.wait_until_at_rest()
             self.heater_on()
             self.hold()
 
@@ -789,22 +911,21 @@ class OxfordInstruments_IPS120(VisaInstrument):
             print('Switch heater is off, cannot change the field.')
         self.get_all()
 
-    def run_to_field_wait(self, field_value):
+    def run_to_field_wait(self, field_value, timeout=None):
         """
         Go to field value and wait until it's done sweeping.
 
         Args:
             field_value (float): the magnetic field value to go to in Tesla
+            timeout (float): maximum time to wait in seconds, no limit if
+                None.
         """
         if self.switch_heater() == self._GET_STATUS_SWITCH_HEATER[1]:
             self.hold()
             self.field_setpoint(field_value)
             self.remote()
             self.to_setpoint()
-            magnet_mode = self.mode2()
-            while magnet_mode != self._GET_STATUS_MODE2[0]:
-                magnet_mode = self.mode2()
-                sleep(0.5)
+            self.wait_until_at_rest(timeout)
         else:
             print('Switch heater is off, cannot change the field.')
         self.get_all()
@@ -829,8 +950,7 @@ class OxfordInstruments_IPS120(VisaInstrument):
             mode(str): See _GET_STATUS_MODE.
         """
         self.log.info('Get device mode')
-        result = self._execute('X')
-        return self._GET_STATUS_MODE[int(result[10])]
+        return self._get_status_field('mode')
 
     def _get_mode2(self):
         """
@@ -840,8 +960,7 @@ class OxfordInstruments_IPS120(VisaInstrument):
             mode(str): See _GET_STATUS_MODE2.
         """
         self.log.info('Get device mode')
-        result = self._execute('X')
-        return self._GET_STATUS_MODE2[int(result[11])]
+        return self._get_status_field('mode2')
 
     def _set_mode(self, mode):
         """
@@ -865,6 +984,4 @@ class OxfordInstruments_IPS120(VisaInstrument):
             result (str): See _GET_POLARITY_STATUS1 and _GET_POLARITY_STATUS2.
         """
         self.log.info('Get device polarity')
-        result = self._execute('X')
-        return self._GET_POLARITY_STATUS1[int(result[13])] + \
-            ", " + self._GET_POLARITY_STATUS2[int(result[14])]
+        return self._get_status_field('polarity')
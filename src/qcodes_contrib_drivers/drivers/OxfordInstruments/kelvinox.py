@@ -8,8 +8,8 @@
 # Pieter de Groot <pieterdegroot@gmail.com>, 2009
 
 
-from time import sleep
-import pyvisa
+from time import monotonic
+import threading
 import pyvisa.constants
 import logging
 import numpy
@@ -32,8 +32,41 @@ class OxfordInstruments_Kelvinox_IGH(VisaInstrument):
 
     Note: Since the ISOBUS allows for several instruments to be managed in parallel, the command
     which is sent to the device starts with '@n', where n is the ISOBUS instrument number.
+
+    For monitoring, ``start_polling`` reads all temperatures, pressures and
+    the status in a background thread. Parameter reads are then served from
+    the polled replies without additional I/O.
     """
 
+    _STATUS_MAX_AGE = 100e-3  # seconds, reuse of the X status reply
+
+    _REMOTE_STATUS = {0: "Local and locked",
+                      1: "Remote and locked",
+                      2: "Local and unlocked",
+                      3: "Remote and unlocked",
+                      4: "Auto-run-down",
+                      5: "Auto-run-down",
+                      6: "Auto-run-down",
+                      7: "Auto-run-down"}
+
+    _MIX_CHAMBER_HEATER_STATUS = {0: 'off',
+                                  1: 'fixed heater power',
+                                  2: 'temperature control'}
+
+    _STILL_STATUS = {'O0': 'off', 'O1': 'on', 'O2': 'off',
+                     'O3': 'on', 'O4': 'off', 'O5': 'on'}
+
+    _SORB_STATUS = {'O0': 'off', 'O1': 'off',
+                    'O2': 'on T control', 'O3': 'on T control',
+                    'O4': 'on P control', 'O5': 'on P control'}
+
+    # read commands refreshed by the background poller
+    _POLL_COMMANDS = ('X', 'R1', 'R2', 'R3', 'R5', 'R7', 'R8',
+                      'R14', 'R15', 'R16', 'R20', 'R21')
+    _POLL_PARAMETERS = ('sorb_temp', 'one_K_pot_temp', 'mix_chamber_temp',
+                        'still_power', 'V6_valve', 'V12A_valve',
+                        'G1', 'G2', 'G3', 'P1', 'P2')
+
     def __init__(self, name, address, number=5, **kwargs):
         """
         Initializes the Oxford Instruments Kelvinox IGH Dilution Refrigerator.
@@ -44,11 +77,17 @@ class OxfordInstruments_Kelvinox_IGH(VisaInstrument):
             number (int)     : ISOBUS instrument number
         """
         log.debug('Initializing instrument')
+        kwargs.setdefault('terminator', '\r')
         super().__init__(name, address, **kwargs)
 
         self._address = address
         self._number = number
         self._values = {}
+        self._replies = {}
+        self._io_lock = threading.RLock()
+        self._poll_interval = None
+        self._poll_stop = threading.Event()
+        self._poller = None
         self.visa_handle.set_visa_attribute(pyvisa.constants.VI_ATTR_ASRL_STOP_BITS,
                                             pyvisa.constants.VI_ASRL_STOP_TWO)
         self._valve_map = {
@@ -120,6 +159,9 @@ class OxfordInstruments_Kelvinox_IGH(VisaInstrument):
                            get_cmd=self._get_remote_status,
                            set_cmd=self._set_remote_status,
                            vals=vals.Ints())
+        self.add_parameter('mix_chamber_heater_status',
+                           get_cmd=partial(self._get_status_field,
+                                           'mix_chamber_heater_status'))
 
         for valve in self._valve_map:
             self.add_parameter('V%s_valve' % self._valve_map[valve],
@@ -140,31 +182,142 @@ class OxfordInstruments_Kelvinox_IGH(VisaInstrument):
         """
         Write a command to the device
 
+        Read commands are answered from a recent reply if one is available,
+        see ``_cached_reply``. Any other command discards the stored replies.
+
         Args:
             message (str) : write command for the device
         """
         log.info('Send the following command to the device: %s' % message)
-        self.visa_handle.write('@%s%s' % (self._number, message))
-        sleep(70e-3)  # wait for the device to be able to respond
-        result = self._read()
+        result = None
+        if message[0] in 'RX':
+            result = self._cached_reply(message)
+        if result is None:
+            result = self._query(message)
         if result.find('?') >= 0:
             print("Error: Command %s not recognized" % message)
         else:
             return result
 
-    def _read(self):
+    def _query(self, message):
+        """
+        Send a command and return the reply as soon as its terminator has
+        been received. Replies to read commands are stored with their time,
+        any other command discards the stored replies. Both happen under
+        the I/O lock, so that a reply read before a command cannot be
+        stored after it.
+        """
+        with self._io_lock:
+            result = self.ask('@%s%s' % (self._number, message))
+            if message[0] not in 'RX':
+                self._replies.clear()
+            elif result.find('?') < 0:
+                self._replies[message] = (monotonic(), result)
+        return result
+
+    def _cached_reply(self, message):
+        """
+        Return the stored reply to a read command if it is recent enough:
+        within _STATUS_MAX_AGE for the status, and within two poll
+        intervals for all polled commands while the poller runs.
+        """
+        max_age = self._STATUS_MAX_AGE if message == 'X' else 0
+        if self._poll_interval is not None and message in self._POLL_COMMANDS:
+            max_age = max(max_age, 2 * self._poll_interval)
+        entry = self._replies.get(message)
+        if entry is not None and monotonic() - entry[0] < max_age:
+            return entry[1]
+        return None
+
+    def decode_status(self, result):
+        """
+        Decode the reply to the examine status command ``X``.
+
+        Args:
+            result (str) : status of the form XxAaCcPppppppppSsOoEe
+
+        Returns:
+            dict mapping the status parameter names to their values.
         """
-        Reads the total bytes in the buffer and outputs as a string.
+        still_sorb = result[17:19]
+        status = {
+            'mix_chamber_heater_status':
+                self._MIX_CHAMBER_HEATER_STATUS[int(result[3])],
+            'remote_status': self._REMOTE_STATUS[int(result[5])],
+            'still_status': self._STILL_STATUS[still_sorb],
+            'sorb_status': self._SORB_STATUS[still_sorb]}
+        # change the hexadecimal number to a 20 bit string, in reverse order
+        valves = numpy.binary_repr(int(result[7:15], 16), width=20)[::-1]
+        val_mapping = {0: 'off', 1: 'on'}
+        for valve, name in self._valve_map.items():
+            status['V%s_valve' % name] = val_mapping[int(valves[valve - 1])]
+        return status
+
+    def get_status(self):
+        """
+        Read the status once and update the cache of all valve, pump and
+        heater parameters decoded from it.
 
         Returns:
-            message (str)
+            dict mapping the status parameter names to their values.
+        """
+        status = self.decode_status(self._execute('X'))
+        for name, value in status.items():
+            self.parameters[name].cache._set_from_raw_value(value)
+        return status
+
+    def _get_status_field(self, name):
+        return self.decode_status(self._execute('X'))[name]
+
+    def start_polling(self, interval=5):
         """
-        bytes_in_buffer = self.visa_handle.bytes_in_buffer
-        with(self.visa_handle.ignore_warning(pyvisa.constants.VI_SUCCESS_MAX_CNT)):
-            mes = self.visa_handle.visalib.read(
-                self.visa_handle.session, bytes_in_buffer)
-        mes = str(mes[0].decode())
-        return mes
+        Start reading the temperatures, pressures and status in a
+        background thread every ``interval`` seconds. While polling, reads
+        of these parameters are served from the polled replies.
+
+        Args:
+            interval (float) : poll interval in seconds
+        """
+        self.stop_polling()
+        self._poll_interval = interval
+        self._poll_stop.clear()
+        self._poller = threading.Thread(target=self._poll_loop,
+                                        name='%s_poller' % self.short_name,
+                                        daemon=True)
+        self._poller.start()
+
+    def stop_polling(self):
+        """Stop the background poller, if running."""
+        if self._poller is not None:
+            self._poll_stop.set()
+            self._poller.join()
+            self._poller = None
+        self._poll_interval = None
+
+    @property
+    def polling(self):
+        """True while the background poller is running."""
+        return self._poller is not None
+
+    def poll(self):
+        """
+        Refresh all polled replies and the caches of the polled parameters.
+        """
+        for message in self._POLL_COMMANDS:
+            self._query(message)
+        self.get_status()
+        for name in self._POLL_PARAMETERS:
+            self.parameters[name].get()
+
+    def _poll_loop(self):
+        while not self._poll_stop.is_set():
+            start = monotonic()
+            try:
+                self.poll()
+            except Exception:
+                log.exception('Polling %s failed' % self.name)
+            self._poll_stop.wait(
+                max(self._poll_interval - (monotonic() - start), 0))
 
     def identify(self):
         """Identify the device
@@ -189,6 +342,7 @@ class OxfordInstruments_Kelvinox_IGH(VisaInstrument):
     def close(self):
         """Safely close connection"""
         log.info('Closing IPS120 connection')
+        self.stop_polling()
         self.local()
         super().close()
 
@@ -224,16 +378,7 @@ class OxfordInstruments_Kelvinox_IGH(VisaInstrument):
             "Auto-run-down"
         """
         log.info('Get remote control status')
-        result = self._execute('X')
-        val_mapping = {0: "Local and locked",
-                       1: "Remote and locked",
-                       2: "Local and unlocked",
-                       3: "Remote and unlocked",
-                       4: "Auto-run-down",
-                       5: "Auto-run-down",
-                       6: "Auto-run-down",
-                       7: "Auto-run-down"}
-        return val_mapping[int(result[5])]
+        return self._get_status_field('remote_status')
 
     def _set_remote_status(self, mode):
         """
@@ -372,14 +517,7 @@ class OxfordInstruments_Kelvinox_IGH(VisaInstrument):
 
         Output: 'On' or 'off'
         """
-        result = self._execute('X')[7:15]
-        # change the hexadecimal number to a 20 bit string
-        full_status = numpy.binary_repr(int(result, 16), width=20)
-        # reverse the order of the binary string
-        full_status = full_status[::-1]
-        status = full_status[valve - 1]
-        val_mapping = {0: 'off', 1: 'on'}
-        return val_mapping[int(status)]
+        return self._get_status_field('V%s_valve' % self._valve_map[valve])
 
     def _set_valve_status(self, status, valve):
         """
@@ -474,25 +612,11 @@ class OxfordInstruments_Kelvinox_IGH(VisaInstrument):
 
     def _get_still_status(self):
         """ get the status of the still (on/off)"""
-        status = self._get_still_sorb_status()
-        if (status == 'O0') | (status == 'O2') | (status == 'O4'):
-            still_status = 0
-        else:
-            still_status = 1
-        val_mapping = {0: 'off', 1: 'on'}
-        return val_mapping[int(still_status)]
+        return self._get_status_field('still_status')
 
     def _get_sorb_status(self):
-        """ get the status of the still (on/off)"""
-        status = self._get_still_sorb_status()
-        if (status == 'O0') | (status == 'O1'):
-            sorb_status = 0
-        elif (status == 'O2') | (status == 'O3'):
-            sorb_status = 1
-        elif (status == 'O4') | (status == 'O5'):
-            sorb_status = 2
-        val_mapping = {0: 'off', 1: 'on T control', 2: 'on P control'}
-        return val_mapping[sorb_status]
+        """ get the status of the sorb (off, on T control, on P control)"""
+        return self._get_status_field('sorb_status')
 
     def _get_still_power(self):
         """ get the power on the still"""
@@ -3,9 +3,11 @@ import logging
 import numpy as np
 import pyvisa  # used for the parity constant
 import pyvisa.constants
+import pyvisa.errors
 import traceback
 import threading
 import math
+from contextlib import contextmanager
 
 from qcodes import validators as vals
 from qcodes.validators import Bool, Numbers
@@ -37,7 +39,7 @@ class IVVI(VisaInstrument):
     def __init__(self, name, address, reset=False, numdacs=16, dac_step=10,
                  dac_delay=.1, safe_version=True,
                  polarity=['BIP', 'BIP', 'BIP', 'BIP'],
-                 use_locks=False, **kwargs):
+                 use_locks=False, lock_timeout=0.5, **kwargs):
         '''
         Initialzes the IVVI, and communicates with the wrapper
 
@@ -58,6 +60,8 @@ class IVVI(VisaInstrument):
                               thread safe, this locking mechanism makes it
                               thread safe at the cost of making the call to ask
                               blocking.
+            lock_timeout (float) : seconds to wait for the lock before
+                                   giving up
         '''
         t0 = time.time()
         super().__init__(name, address, **kwargs)
@@ -65,6 +69,7 @@ class IVVI(VisaInstrument):
             self.lock = threading.Lock()
         else:
             self.lock = None
+        self.lock_timeout = lock_timeout
 
         self.safe_version = safe_version
 
@@ -323,13 +328,11 @@ class IVVI(VisaInstrument):
         Converts a list of bytes to a list containing
         the corresponding mvoltages
         '''
-        values = list(range(self._numdacs))
-        for i in range(self._numdacs):
-            # takes two bytes, converts it to a 16 bit int and then divides by
-            # the range and adds the offset due to the polarity
-            values[i] = ((byte_mess[2 + 2 * i] * 256 + byte_mess[3 + 2 * i]) /
-                         65535.0 * self.full_range) + self.pol_num[i]
-        return values
+        # big endian 16 bit DAC values following the size and error bytes,
+        # divided by the range and shifted by the offset due to the polarity
+        raw = np.frombuffer(byte_mess, dtype='>u2', count=self._numdacs,
+                            offset=2)
+        return list(raw / 65535.0 * self.full_range + self.pol_num)
 
     # Communication with device
     def _get_dac(self, channel):
@@ -379,15 +382,72 @@ class IVVI(VisaInstrument):
         # only update the value if it is different from the previous one
         # this saves time in setting values, set cmd takes ~650ms
         if proceed:
-            polarity_corrected = mvoltage - self.pol_num[channel - 1]
-            byte_val = self._mvoltage_to_bytes(polarity_corrected)
-            message = bytes([2, 1, channel]) + byte_val
-
-            reply = self.ask(message)
+            reply = self.ask(self._set_dac_message(channel, mvoltage))
             self._time_last_update = 0  # ensures get command will update
 
             return reply
 
+    def _set_dac_message(self, channel, mvoltage):
+        '''
+        Returns the "set DAC value" message for one dac, without the
+        descriptor size and error bytes
+        '''
+        polarity_corrected = mvoltage - self.pol_num[channel - 1]
+        byte_val = self._mvoltage_to_bytes(polarity_corrected)
+        return bytes([2, 1, channel]) + byte_val
+
+    def set_dacs(self, mvoltages):
+        '''
+        Sets several dacs at once.
+
+        The protocol has one "set DAC value" action per dac, so the
+        descriptors of all dacs are sent in a single write and the replies
+        are read back in a single framed read, costing one round trip for
+        all dacs instead of one per dac.
+
+        The dacs are ramped together, respecting the step and inter_delay
+        of every dac parameter: each round trip moves every dac that has
+        not reached its target by at most its step, and consecutive round
+        trips are separated by the largest inter_delay of the ramping dacs.
+        check_setpoints is not applied.
+
+        Input:
+            mvoltages (dict) : maps the 1 based dac index or the parameter
+                               name ('dac3') to the output voltage in mV
+
+        Output:
+            replies (List[bytes]) : the last reply of every dac, in order
+        '''
+        ramps = []
+        for dac, mvoltage in mvoltages.items():
+            channel = int(dac[3:]) if isinstance(dac, str) else int(dac)
+            if not 1 <= channel <= self._numdacs:
+                raise ValueError('No dac {} on this IVVI'.format(dac))
+            param = self.parameters['dac{}'.format(channel)]
+            param.validate(mvoltage)
+            ramps.append((channel, param,
+                          param.get_ramp_values(mvoltage, step=param.step)))
+
+        replies = {}
+        nsteps = max((len(values) for _, _, values in ramps), default=0)
+        for i in range(nsteps):
+            moving = [(channel, param, values[i])
+                      for channel, param, values in ramps if i < len(values)]
+            if i > 0:
+                time.sleep(max(param.inter_delay for _, param, _ in moving))
+            descriptors = [self._frame(self._set_dac_message(ch, mv))
+                           for ch, _, mv in moving]
+            reply_len = descriptors[0][2]
+            with self._locked():
+                self.visa_handle.write_raw(b''.join(descriptors))
+                reply = self.read(message_len=reply_len * len(descriptors))
+            self._time_last_update = 0  # ensures get command will update
+
+            for n, (channel, param, mv) in enumerate(moving):
+                param.cache.set(mv)
+                replies[channel] = reply[n * reply_len:(n + 1) * reply_len]
+        return [replies[channel] for channel, _, _ in ramps]
+
     def _get_dacs(self):
         '''
         Reads from device and returns all dacvoltages in a list
@@ -397,8 +457,6 @@ class IVVI(VisaInstrument):
 
         Output:
             voltages (float[]) : list containing all dacvoltages (in mV)
-
-        get dacs command takes ~450ms according to ipython timeit
         '''
         if (time.time() - self._time_last_update) > self._update_time:
             message = bytes([self._numdacs * 2 + 2, 2])
@@ -428,34 +486,38 @@ class IVVI(VisaInstrument):
 
         if not raw:
             expected_answer_length = message[0]
-            message_len = len(message) + 2
-
-            error_code = bytes([0])
-            message = bytes([message_len]) + error_code + message
+            message = self._frame(message)
         self.visa_handle.write_raw(message)
 
         return expected_answer_length
 
+    @staticmethod
+    def _frame(message):
+        ''' Prepends the descriptor size and (empty) error code '''
+        return bytes([len(message) + 2, 0]) + message
+
+    @contextmanager
+    def _locked(self):
+        if self.lock is None:
+            yield
+            return
+        if not self.lock.acquire(timeout=self.lock_timeout):
+            raise Exception('IVVI: lock is stuck')
+        try:
+            yield
+        finally:
+            self.lock.release()
+
     def ask(self, message, raw=False):
         '''
         Send <message> to the device and read answer.
         Raises an error if one occurred
         Returns a list of bytes
         '''
-        if self.lock:
-            max_tries = 10
-            for i in range(max_tries):
-                if self.lock.acquire(timeout=.05):
-                    break
-                else:
-                    logging.warning('IVVI: cannot acquire the lock')
-            if i + 1 == max_tries:
-                raise Exception('IVVI: lock is stuck')
         # Protocol knows about the expected length of the answer
-        message_len = self.write(message, raw=raw)
-        reply = self.read(message_len=message_len)
-        if self.lock:
-            self.lock.release()
+        with self._locked():
+            message_len = self.write(message, raw=raw)
+            reply = self.read(message_len=message_len)
 
         return reply
 
@@ -474,7 +536,8 @@ class IVVI(VisaInstrument):
             maxread (int) : maximum size of block to read
             verbose (int): verbosity level
         Returns:
-            ret (bytes): bytes read from the device
+            ret (bytes): bytes read from the device, fewer than size only if
+                the visa read timed out
         The pyvisa visalib.read does not always terminate at a newline, this
         is a workaround.
         Also see: https://github.com/qdev-dk/Qcodes/issues/276
@@ -489,7 +552,14 @@ class IVVI(VisaInstrument):
             nread = 0
             while nread < size:
                 nn = min(maxread, size - nread)
-                chunk, status = instr.visalib.read(instr.session, nn)
+                try:
+                    chunk, status = instr.visalib.read(instr.session, nn)
+                except pyvisa.errors.VisaIOError as ex:
+                    if ex.error_code != pyvisa.constants.VI_ERROR_TMO:
+                        raise
+                    break
+                if not chunk:
+                    break
                 ret += [chunk]
                 nread += len(chunk)
                 if verbose:
@@ -498,32 +568,37 @@ class IVVI(VisaInstrument):
         return ret
 
     def read(self, message_len=None):
+        '''
+        Reads a reply of the device.
+
+        The reply length is known from the protocol, so the read blocks
+        until exactly `message_len` bytes arrived or the visa timeout
+        expired. Without a length, whatever is in the buffer after at
+        least one byte arrived is read.
+        '''
+        if message_len is not None:
+            mes = self._read_raw_bytes_multiple(message_len)
+            if len(mes) < message_len:
+                raise TimeoutError('IVVI: expected {} bytes, got {}'.format(
+                    message_len, len(mes)))
+            # if mes[1] != 0:
+            # see protocol descriptor for error codes
+            #     raise Exception('IVVI rack exception "%s"' % mes[1])
+            return mes
+
         # because protocol has no termination chars the read reads the number
         # of bytes in the buffer
-        bytes_in_buffer = 0
         timeout = 1
         t0 = time.time()
-        t1 = t0
         bytes_in_buffer = 0
-        if message_len is None:
-            message_len = 1  # ensures at least 1 byte in buffer
-
-        while bytes_in_buffer < message_len:
-            t1 = time.time()
-
+        while bytes_in_buffer < 1:
             if self.dac_read_buffer_sleep() > 0.0:
                 time.sleep(self.dac_read_buffer_sleep())
 
             bytes_in_buffer = self.visa_handle.bytes_in_buffer
-            if t1 - t0 > timeout:
+            if time.time() - t0 > timeout:
                 raise TimeoutError()
-        # a workaround for a timeout error in the pyvsia read_raw() function
-        mes = self._read_raw_bytes_multiple(bytes_in_buffer)
-
-        # if mes[1] != 0:
-        # see protocol descriptor for error codes
-        #     raise Exception('IVVI rack exception "%s"' % mes[1])
-        return mes
+        return self._read_raw_bytes_multiple(bytes_in_buffer)
 
     def set_pol_dacrack(self, flag, channels, get_all=True):
         '''
@@ -591,8 +666,8 @@ class IVVI(VisaInstrument):
 
     def _send_trigger(self):
         msg = bytes([2, 6])
-        self.write(msg)
-        self.read()  # Flush the buffer, else the command will only work the first time.
+        # Read the reply, else the command will only work the first time.
+        self.ask(msg)
 
     def round_dac(self, value, dacname=None):
         """ Round a value to the interal precision of the instrument
@@ -158,11 +158,15 @@ class ZVL13(VisaInstrument):
                            set_cmd=self._set_mode,
                            get_parser=str)
 
+        # data format of trace transfers, see `transfer_format`
+        self._transfer_format = 'REAL,64'
+        self._transfer_format_sent: Optional[str] = None
+
         mode = self.mode.get()
-        if mode == 'SAN':
-            n = int(1)
+        n = int(1)
+        if mode == 'sa':
             self._tracename = 'Trc1'
-        if mode == 'NWA':
+        if mode == 'na':
             _, trace_name = self._get_trace_name()
             self._tracename = trace_name
 
@@ -305,6 +309,62 @@ class ZVL13(VisaInstrument):
 
     def reset(self):
         self.write("*RST")
+        self._transfer_format_sent = None
+
+    @property
+    def transfer_format(self) -> str:
+        """
+        Data format of trace transfers: 'ASC', 'REAL,32' or 'REAL,64'
+        (default). The binary formats are transferred as little-endian
+        definite-length blocks and decoded straight into numpy arrays.
+        'REAL,32' halves the transfer size at single precision.
+        """
+        return self._transfer_format
+
+    @transfer_format.setter
+    def transfer_format(self, fmt: str) -> None:
+        fmt = fmt.upper().replace(' ', '')
+        if fmt not in ('ASC', 'REAL,32', 'REAL,64'):
+            raise ValueError(f"Unknown transfer format {fmt}, use "
+                             "'ASC', 'REAL,32' or 'REAL,64'")
+        self._transfer_format = fmt
+
+    def _ensure_transfer_format(self) -> None:
+        if self._transfer_format_sent != self._transfer_format:
+            if self._transfer_format == 'ASC':
+                self.write('FORM ASC')
+            else:
+                self.write(f'FORM {self._transfer_format};FORM:BORD SWAP')
+            self._transfer_format_sent = self._transfer_format
+
+    def _fetch_trace(self, query: str) -> np.ndarray:
+        """
+        Query trace data in the current transfer format.
+        """
+        self._ensure_transfer_format()
+        if self._transfer_format == 'ASC':
+            data_str = self.ask(query)
+            return np.array(data_str.rstrip().split(',')).astype('float64')
+        datatype = 'f' if self._transfer_format == 'REAL,32' else 'd'
+        return self.visa_handle.query_binary_values(
+            query, datatype=datatype, is_big_endian=False,
+            container=np.array)
+
+    def acquisition(self, averages: Optional[int] = None,
+                    spectrum: Optional[bool] = None) -> "ZVL13Acquisition":
+        """
+        Session for fetching many traces in a row, see `ZVL13Acquisition`.
+
+        Args:
+            averages: Sweeps per trace, defaults to ``avg()``.
+            spectrum: Fetch spectrum analyzer traces, defaults to whether
+                the instrument is in spectrum analyzer mode.
+        """
+        if averages is None:
+            averages = self.avg()
+        if spectrum is None:
+            spectrum = self.mode() == 'sa'
+        return ZVL13Acquisition(self, averages, spectrum)
 
     def calibration(self):
         """
@@ -482,47 +542,15 @@ class ZVL13(VisaInstrument):
             self.write('SOUR:POW ' + str(int(val)))
 
     def _get_sweep_data(self, force_polar: bool = False):
-        if force_polar:
-            data_format_command = 'SDAT'
-        else:
-            data_format_command = 'FDAT'
-
-        self.write('SENS:AVER:STAT ON')
-        self.write('SENS:AVER:CLE')
-
         # preserve original state of the znb
         with self.status.set_to(1):
-            self.root_instrument.cont_meas_off()
-            try:
-                with self.root_instrument.timeout.set_to(self.timeout_sweep):
-                    self.write('SENS:SWEEP:COUNT '+ str(self.avg()))
-                    self.write('INIT:IMMEDIATE:SCOPE:SINGLE')                        
-                    self.write('INIT:CONT OFF')
-                    self.write('INIT:IMM; *WAI')
-                    self.write("CALC:PAR:SEL '{self._tracename}'")
-                    data_str = self.ask(f'CALC:DATA? {data_format_command}')
-
-                data = np.array(data_str.rstrip().split(',')).astype('float64')
-            finally:
-                self.root_instrument.cont_meas_on()
+            with self.acquisition(spectrum=False) as acq:
+                data = acq.fetch(force_polar=force_polar)
         return data
 
     def _get_sweep_data_SA(self):
-        self.write('SENS:AVER:STAT ON')
-        self.write('SENS:AVER:CLE')
-
-        self.root_instrument.cont_meas_off()
-        try:
-            with self.root_instrument.timeout.set_to(self.timeout_sa):
-                self.write('SENS:SWEEP:COUNT '+ str(self.avg()))
-                self.write('INIT:IMMEDIATE:SCOPE:SINGLE')                        
-                self.write('INIT:CONT OFF')
-                self.write('INIT:IMM; *WAI')
-                data_str = self.ask('FORM ASC;TRAC? TRACE1')
-
-            data = np.array(data_str.rstrip().split(',')).astype('float64')
-        finally:
-            self.root_instrument.cont_meas_on()
+        with self.acquisition(spectrum=True) as acq:
+            data = acq.fetch()
         return data
 
     def update_traces(self):
@@ -535,3 +563,78 @@ class ZVL13(VisaInstrument):
                     parameter.set_sweep(start, stop, npts)
                 except AttributeError:
                     pass
+
+
+class ZVL13Acquisition:
+    """
+    Fetches traces of a ZVL13 with the sweep setup sent only once.
+
+    Entering the session turns continuous measurement off, sets averaging,
+    the sweep count, the transfer format and (in network analyzer mode)
+    selects the trace. Each `fetch` then only clears the average, runs
+    the sweeps and transfers the data. Continuous measurement and the
+    timeout are restored when leaving the session.
+
+    Example::
+
+        with zvl.acquisition(averages=1) as acq:
+            traces = acq.fetch_many(100)
+    """
+
+    def __init__(self, instrument: ZVL13, averages: int, spectrum: bool):
+        self._instrument = instrument
+        self.averages = int(averages)
+        self.spectrum = spectrum
+        self._old_timeout: Optional[float] = None
+
+    def __enter__(self) -> "ZVL13Acquisition":
+        zvl = self._instrument
+        zvl.cont_meas_off()
+        self._old_timeout = zvl.timeout()
+        zvl.timeout(zvl.timeout_sa if self.spectrum else zvl.timeout_sweep)
+        zvl.write(f'SENS:AVER:STAT ON;:SENS:SWE:COUN {self.averages};'
+                  ':INIT:IMM:SCOP SING;:INIT:CONT OFF')
+        if not self.spectrum:
+            zvl.write(f"CALC:PAR:SEL '{zvl._tracename}'")
+        zvl._ensure_transfer_format()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        zvl = self._instrument
+        try:
+            zvl.timeout(self._old_timeout)
+        finally:
+            zvl.cont_meas_on()
+
+    def fetch(self, force_polar: bool = False) -> np.ndarray:
+        """
+        Run the sweeps of one trace and return its data.
+
+        Args:
+            force_polar: In network analyzer mode, fetch the unformatted
+                complex data (SDAT, interleaved real and imaginary parts)
+                instead of the formatted trace (FDAT).
+        """
+        zvl = self._instrument
+        zvl.write('SENS:AVER:CLE;:INIT:IMM;*WAI')
+        if self.spectrum:
+            return zvl._fetch_trace('TRAC? TRACE1')
+        data_format_command = 'SDAT' if force_polar else 'FDAT'
+        return zvl._fetch_trace(f'CALC:DATA? {data_format_command}')
+
+    def fetch_many(self, count: int,
+                   force_polar: bool = False) -> np.ndarray:
+        """
+        Fetch `count` traces into an array of shape (count, points).
+        No sweep is run for a `count` of zero.
+        """
+        if count < 0:
+            raise ValueError(f'Cannot fetch {count} traces')
+        if count == 0:
+            return np.empty((0, 0))
+        first = self.fetch(force_polar)
+        traces = np.empty((count, len(first)))
+        traces[0] = first
+        for i in range(1, count):
+            traces[i] = self.fetch(force_polar)
+        return traces
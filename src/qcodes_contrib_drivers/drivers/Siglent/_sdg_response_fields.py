@@ -1,5 +1,6 @@
+from functools import lru_cache
 from itertools import takewhile
-from typing import Any, Callable, Iterable, Optional, Tuple, TypeVar
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, TypeVar
 
 T = TypeVar("T")
 
@@ -26,6 +27,27 @@ def find_first_by_key(
         return not_found
 
 
+@lru_cache(maxsize=64)
+def split_response(response: str, _result_prefix_len: int) -> Tuple[str, ...]:
+    """
+    Split a response into its comma separated items, once per response.
+    """
+    return tuple(response[_result_prefix_len:].split(","))
+
+
+@lru_cache(maxsize=64)
+def response_fields(response: str, _result_prefix_len: int) -> Dict[str, str]:
+    """
+    Parse a response of key, value pairs into a dict, once per response.
+    The first occurrence of a key wins. The returned dict must not be
+    modified.
+    """
+    fields: Dict[str, str] = {}
+    for key, value in group_by_two(split_response(response, _result_prefix_len)):
+        fields.setdefault(key, value)
+    return fields
+
+
 def substr_from(_n, /, *, then=identity) -> Callable[[str], Any]:
     if then is identity:
         return lambda _s: _s[_n:]
@@ -70,7 +92,7 @@ def extract_standalone_first_field_or_regular_field(
     if name is None:
 
         def result_func(response: str):
-            response_items = iter(response[_result_prefix_len:].split(","))
+            response_items = iter(split_response(response, _result_prefix_len))
             first = next(response_items)
             return then(first)
 
@@ -79,7 +101,7 @@ def extract_standalone_first_field_or_regular_field(
     else:
 
         def result_func(response: str):
-            response_items = iter(response[_result_prefix_len:].split(","))
+            response_items = iter(split_response(response, _result_prefix_len))
             next(response_items)
             return find_first_by_key(
                 name,
@@ -100,7 +122,7 @@ def extract_first_state_field_or_any_group_prefixed_field(
     else_default=None,
 ) -> Callable[[str], Any]:
     def result_func(response: str):
-        response_items = iter(response[_result_prefix_len:].split(","))
+        response_items = iter(split_response(response, _result_prefix_len))
 
         try:
             # STATE ON/OFF
@@ -142,12 +164,10 @@ def extract_regular_field(
     else_default=None,
 ) -> Callable[[str], Any]:
     def result_func(response: str):
-        return find_first_by_key(
-            name,
-            group_by_two(response[_result_prefix_len:].split(",")),
-            transform_found=then,
-            not_found=else_default,
-        )
+        fields = response_fields(response, _result_prefix_len)
+        if name not in fields:
+            return else_default
+        return then(fields[name])
 
     return result_func
 
@@ -169,7 +189,7 @@ def extract_regular_field_before_group_or_group_prefixed_field(
         def result_func_standalone(response: str):
             items = takewhile(
                 lambda str: str != _group,
-                iter(response[_result_prefix_len:].split(",")),
+                iter(split_response(response, _result_prefix_len)),
             )
 
             return find_first_by_key(
@@ -185,7 +205,7 @@ def extract_regular_field_before_group_or_group_prefixed_field(
         name = name[len(_group) + 1 :]
 
         def result_func_group(response: str):
-            items = iter(response[_result_prefix_len:].split(","))
+            items = iter(split_response(response, _result_prefix_len))
 
             for item in items:
                 if item == _group:
@@ -1,6 +1,6 @@
 import functools
 from functools import partial
-from typing import Dict, Mapping, Optional, Set, Tuple, Union
+from typing import Callable, Dict, Mapping, Optional, Set, Tuple, Union
 
 from qcodes.parameters import Parameter
 from qcodes.parameters import create_on_off_val_mapping as _create_on_off_val_mapping
@@ -57,12 +57,19 @@ class SiglentSDGChannel(SiglentChannel):
 
         self._add_invert_parameter()
 
+    def _cached_get_cmd(self, cmd: str) -> Callable[[], str]:
+        """
+        All parameters of a group (e.g. BSWV) share the same query.
+        Answer it from the response cache of the instrument.
+        """
+        return partial(self._parent.ask_cached, cmd)
+
     # ---------------------------------------------------------------
 
     def _add_output_parameters(self, *, extra_params: Set[str]):
         ch_command = self._ch_num_prefix + "OUTP"
         set_cmd_ = ch_command + " "
-        get_cmd = ch_command + "?"
+        get_cmd = self._cached_get_cmd(ch_command + "?")
 
         result_prefix_len = len(ch_command) + 1
 
@@ -136,7 +143,7 @@ class SiglentSDGChannel(SiglentChannel):
     def _add_basic_wave_parameters(self, *, extra_params: Set[str]):
         ch_command = self._ch_num_prefix + "BSWV"
         set_cmd_ = ch_command + " "
-        get_cmd = ch_command + "?"
+        get_cmd = self._cached_get_cmd(ch_command + "?")
 
         result_prefix_len = len(ch_command) + 1
 
@@ -474,7 +481,7 @@ class SiglentSDGChannel(SiglentChannel):
     def _add_modulate_wave_parameters(self, *, extra_params: Set[str]):
         ch_command = self._ch_num_prefix + "MDWV"
         set_cmd_ = ch_command + " "
-        get_cmd = ch_command + "?"
+        get_cmd = self._cached_get_cmd(ch_command + "?")
 
         result_prefix_len = len(ch_command) + 1
 
@@ -1002,7 +1009,7 @@ class SiglentSDGChannel(SiglentChannel):
     def _add_sweep_wave_parameters(self, *, extra_params: Set[str]):
         ch_command = self._ch_num_prefix + "SWWV"
         set_cmd_ = ch_command + " "
-        get_cmd = ch_command + "?"
+        get_cmd = self._cached_get_cmd(ch_command + "?")
 
         result_prefix_len = len(ch_command) + 1
 
@@ -1385,7 +1392,7 @@ class SiglentSDGChannel(SiglentChannel):
 
         ch_command = self._ch_num_prefix + "BTWV"
         set_cmd_ = ch_command + " "
-        get_cmd = ch_command + "?"
+        get_cmd = self._cached_get_cmd(ch_command + "?")
 
         result_prefix_len = len(ch_command) + 1
 
@@ -1770,7 +1777,7 @@ class SiglentSDGChannel(SiglentChannel):
     def _add_arbitrary_wave_parameters(self):
         ch_command = self._ch_num_prefix + "ARWV"
         set_cmd_ = ch_command + " "
-        get_cmd = ch_command + "?"
+        get_cmd = self._cached_get_cmd(ch_command + "?")
 
         result_prefix_len = len(ch_command) + 1
 
@@ -1813,7 +1820,7 @@ class SiglentSDGChannel(SiglentChannel):
 
         ch_command = self._ch_num_prefix + "SYNC"
         set_cmd_ = ch_command + " "
-        get_cmd = ch_command + "?"
+        get_cmd = self._cached_get_cmd(ch_command + "?")
 
         result_prefix_len = len(ch_command) + 1
 
@@ -1857,7 +1864,7 @@ class SiglentSDGChannel(SiglentChannel):
     def _add_invert_parameter(self):
         ch_command = self._ch_num_prefix + "INVT"
         set_cmd_ = ch_command + " "
-        get_cmd = ch_command + "?"
+        get_cmd = self._cached_get_cmd(ch_command + "?")
 
         result_prefix_len = len(ch_command) + 1
 
@@ -7,7 +7,7 @@ import re
 import numpy as np
 import numpy.typing as npt
 
-from typing import Callable, Tuple
+from typing import Callable, Optional, Sequence, Tuple
 
 
 class TriggerMode(Enum):
@@ -40,6 +40,40 @@ class WaveformSetup:
     start_idx: int = 0
 
 
+@dataclass
+class CaptureSetup:
+    """
+    Scaling metadata of a multi-channel capture
+
+    channels
+        channel numbers, in the order of the rows of the captured data
+
+    sample_rate
+        SARA, samples per second
+
+    wfsu
+        waveform download setup (WFSU)
+
+    vdiv, ofst
+        per channel vertical scale and offset in volts
+    """
+
+    channels: Tuple[int, ...]
+    sample_rate: int
+    wfsu: WaveformSetup
+    vdiv: npt.NDArray
+    ofst: npt.NDArray
+
+    @property
+    def gain(self) -> npt.NDArray:
+        "volts per code, as a column to broadcast over the raw data"
+        return (self.vdiv / 25)[:, np.newaxis]
+
+    @property
+    def offset(self) -> npt.NDArray:
+        return self.ofst[:, np.newaxis]
+
+
 # Not a proper QCoDeS instrument
 # TODO: Add channels, add parameters, add parameter axes
 class Siglent_SDS_120NxE(SiglentSDx):
@@ -181,6 +215,162 @@ class Siglent_SDS_120NxE(SiglentSDx):
         )
         return (axis, data)
 
+    def get_capture_setup(self, channels: Sequence[int]) -> CaptureSetup:
+        """
+        Query the scaling metadata of `channels` once, to be reused by
+        `capture` and `capture_history` for as long as the vertical and
+        timebase settings are not changed.
+        """
+        channels = tuple(channels)
+        return CaptureSetup(
+            channels=channels,
+            sample_rate=self.get_sample_rate(),
+            wfsu=self.get_waveform_setup(),
+            vdiv=np.array([self.get_vdiv(ch) for ch in channels]),
+            ofst=np.array([self.get_ofst(ch) for ch in channels]),
+        )
+
+    def _read_block_header(self, channel: int) -> int:
+        """
+        Read the response to `C{channel}:WF? DAT2` up to the end of the
+        ``#N<length>`` block header and return the block length.
+        """
+        visa_handle = self.visa_handle
+        # "C1:WF DAT2,#" and the digit count of the length, in one read
+        expected = f"C{channel:d}:WF DAT2,#".encode()
+        prefix = visa_handle.read_bytes(
+            count=len(expected) + 1, break_on_termchar=False
+        )
+        num_digits = prefix[-1:]
+        if prefix[:-1] != expected:
+            raise ValueError(
+                f"C{channel:d}: no block header in response {prefix!r}"
+            )
+        if not num_digits.isdigit() or num_digits == b"0":
+            raise ValueError(f"C{channel:d}: invalid block header {prefix!r}")
+        length = visa_handle.read_bytes(
+            count=int(num_digits), break_on_termchar=False
+        )
+        if not length.isdigit():
+            raise ValueError(
+                f"C{channel:d}: invalid block header {prefix + length!r}"
+            )
+        return int(length)
+
+    def _read_waveform_block_into(self, channel: int, out: npt.NDArray) -> int:
+        """
+        Transfer `C{channel}:WF? DAT2` into the int8 array `out` and return
+        the number of points received.
+        """
+        visa_handle = self.visa_handle
+        visa_handle.write(f"C{channel:d}:WF? DAT2")
+        num_points = self._read_block_header(channel)
+        if num_points > len(out):
+            raise ValueError(
+                f"C{channel:d} returned {num_points} points, "
+                f"buffer only holds {len(out)}"
+            )
+        # the block is followed by two newlines
+        data = visa_handle.read_bytes(count=num_points + 2, break_on_termchar=False)
+        out[:num_points] = np.frombuffer(data, dtype=np.int8, count=num_points)
+        return num_points
+
+    @staticmethod
+    def _capture_axis(setup: CaptureSetup, received: int) -> npt.NDArray:
+        """Time axis of the `received` points of a capture."""
+        wfsu = setup.wfsu
+        spacing = wfsu.spacing if wfsu.spacing != 0 else 1
+        return (np.arange(received) * spacing + wfsu.start_idx) / setup.sample_rate
+
+    def _capture_num_points(self, setup: CaptureSetup) -> int:
+        wfsu = setup.wfsu
+        if wfsu.num_points != 0:
+            return wfsu.num_points
+        spacing = wfsu.spacing if wfsu.spacing != 0 else 1
+        num_samples = self.get_num_samples(setup.channels[0]) - wfsu.start_idx
+        return -(-num_samples // spacing)
+
+    def _get_raw_buffer(self, shape: Tuple[int, ...]) -> npt.NDArray:
+        buffer = getattr(self, "_raw_capture_buffer", None)
+        if buffer is None or buffer.shape != shape:
+            buffer = np.empty(shape, dtype=np.int8)
+            self._raw_capture_buffer = buffer
+        return buffer
+
+    def capture(
+        self,
+        channels: Sequence[int] = (1, 2),
+        *,
+        setup: Optional[CaptureSetup] = None,
+        out: Optional[npt.NDArray] = None,
+    ) -> Tuple[npt.NDArray, npt.NDArray]:
+        """
+        Download the current acquisition of `channels` back to back.
+
+        The scaling metadata is queried once for all channels (or taken from
+        `setup`, see `get_capture_setup`), the raw codes are transferred into
+        a reused int8 buffer and converted to volts in one step.
+
+        Returns the time axis and an array of shape (len(channels), points),
+        written into `out` if given.
+        """
+        if setup is None:
+            setup = self.get_capture_setup(channels)
+        raw = self._read_channels(setup)
+        return self._capture_axis(setup, raw.shape[-1]), self._scale(setup, raw, out)
+
+    def _read_channels(
+        self, setup: CaptureSetup, raw: Optional[npt.NDArray] = None
+    ) -> npt.NDArray:
+        if raw is None:
+            num_points = self._capture_num_points(setup)
+            raw = self._get_raw_buffer((len(setup.channels), num_points))
+        received = min(
+            self._read_waveform_block_into(channel, row)
+            for channel, row in zip(setup.channels, raw)
+        )
+        return raw[..., :received]
+
+    @staticmethod
+    def _scale(
+        setup: CaptureSetup, raw: npt.NDArray, out: Optional[npt.NDArray] = None
+    ) -> npt.NDArray:
+        out = np.multiply(raw, setup.gain, out=out)
+        out += setup.offset
+        return out
+
+    def set_history_mode(self, enabled: bool):
+        self.write(f"HSMD {'ON' if enabled else 'OFF'}")
+
+    def set_history_frame(self, frame: int):
+        self.write(f"FRAM {frame:d}")
+
+    def capture_history(
+        self,
+        frames: Sequence[int],
+        channels: Sequence[int] = (1, 2),
+        *,
+        setup: Optional[CaptureSetup] = None,
+    ) -> Tuple[npt.NDArray, npt.NDArray]:
+        """
+        Download segments recorded in history mode.
+
+        The scaling metadata is read once for all `frames`; each frame is
+        selected with FRAM and its channels transferred into one
+        preallocated int8 array of shape (len(frames), len(channels), points),
+        which is scaled to volts at the end.
+        """
+        if setup is None:
+            setup = self.get_capture_setup(channels)
+        num_points = self._capture_num_points(setup)
+        raw = np.empty((len(frames), len(setup.channels), num_points), np.int8)
+        received = num_points
+        for frame, frame_raw in zip(frames, raw):
+            self.set_history_frame(frame)
+            received = min(received, self._read_channels(setup, frame_raw).shape[-1])
+        raw = raw[..., :received]
+        return self._capture_axis(setup, received), self._scale(setup, raw)
+
     def get_math_waveform(self) -> npt.NDArray:
         MtDiv = self.get_math_vdiv()
         return MtDiv * self.get_raw_math_waveform_data() / 25
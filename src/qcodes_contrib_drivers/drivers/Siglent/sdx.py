@@ -1,4 +1,7 @@
 from collections import ChainMap
+from time import monotonic
+from typing import Dict, Tuple
+
 from qcodes.instrument.channel import InstrumentChannel
 from qcodes.instrument.instrument_base import InstrumentBase
 from qcodes.instrument.visa import VisaInstrument
@@ -18,6 +21,11 @@ class SiglentChannel(InstrumentChannel):
 
 class SiglentSDx(VisaInstrument):
     def __init__(self, *args, **kwargs):
+        # seconds during which a response of `ask_cached` is reused
+        self.response_cache_validity: float = kwargs.pop(
+            "response_cache_validity", 0.5
+        )
+        self._response_cache: Dict[str, Tuple[float, str]] = {}
         kwargs = ChainMap(kwargs, {"terminator": "\n"})
         super().__init__(*args, **kwargs)
         self.visa_handle.response_delay = 0.25
@@ -26,6 +34,28 @@ class SiglentSDx(VisaInstrument):
     def reset(self):
         self.write("*RST")
 
+    def ask_cached(self, cmd: str) -> str:
+        """
+        Like `ask`, but reuse the response to the same query if it is not
+        older than `response_cache_validity` seconds and nothing was written
+        to the instrument in the meantime.
+        """
+        now = monotonic()
+        cached = self._response_cache.get(cmd)
+        if cached is not None and now - cached[0] <= self.response_cache_validity:
+            return cached[1]
+        response = self.ask(cmd)
+        self._response_cache[cmd] = (now, response)
+        return response
+
+    def invalidate_response_cache(self) -> None:
+        self._response_cache.clear()
+
+    def write_raw(self, cmd: str) -> None:
+        # any command may change the response of any query group
+        self.invalidate_response_cache()
+        super().write_raw(cmd)
+
     def screen_dump_bmp(self, file_name):
         """
         Save screen dump to `file_name`
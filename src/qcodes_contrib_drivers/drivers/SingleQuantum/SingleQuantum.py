@@ -16,14 +16,29 @@ import json
 import threading
 import time
 import sys
+import logging
 
 from qcodes.instrument.ip import Instrument
 from qcodes.instrument.base import Parameter
 from qcodes.instrument.parameter import ParameterWithSetpoints, MultiParameter
 from qcodes.utils.validators import Arrays
 
+log = logging.getLogger(__name__)
+
 
 class SQTalk(threading.Thread):
+    """Listener thread for the control port of the Single Quantum server.
+
+    The server sends JSON objects terminated by ``\\x17``; several objects
+    may share one frame. Received bytes are accumulated in a bytearray and
+    every complete frame is decoded incrementally with
+    ``json.JSONDecoder.raw_decode``, so nested objects are handled
+    correctly. Threads waiting in :meth:`get_label` are woken up as soon as
+    the requested label arrives.
+    """
+
+    FRAME_END = b"\x17"
+
     def __init__(self, TCP_IP_ADR='localhost', TCP_IP_PORT=12000,
                  error_callback=None):
         threading.Thread.__init__(self)
@@ -34,109 +49,149 @@ class SQTalk(threading.Thread):
             socket.AF_INET, socket.SOCK_STREAM)
         self.socket.connect((self.TCP_IP_ADR, self.TCP_IP_PORT))
         self.socket.settimeout(.1)
-        self.BUFFER = 10000000
+        self.BUFFER = 65536
         self.shutdown = False
         self.labelProps = dict()
 
         self.error_callback = error_callback
 
         self.lock = threading.Lock()
+        self._buffer = bytearray()
+        self._decoder = json.JSONDecoder()
+        self._label_events = dict()
 
     def close(self):
-        # Print("Closing Socket")
-        self.socket.close()
         self.shutdown = True
+        self.socket.close()
 
     def send(self, msg):
-        self.socket.send(bytes(msg, "utf-8"))
+        self.socket.sendall(bytes(msg, "utf-8"))
 
-    def sub_jsons(self, msg):
-        """Return sub json strings.
-        {}{} will be returned as [{},{}]
+    def request_label_props(self):
+        self.send(json.dumps(
+            {"request": "labelProps", "value": "None"}))
+
+    def feed(self, chunk):
+        """Add received bytes to the buffer and handle complete frames.
+
+        Args:
+            chunk (bytes): raw bytes as received from the socket
+        Returns (list): the decoded messages
+        """
+        self._buffer += chunk
+        end = self._buffer.rfind(self.FRAME_END)
+        if end < 0:
+            return []
+        frames = bytes(self._buffer[:end])
+        del self._buffer[:end + 1]
+
+        messages = []
+        for frame in frames.split(self.FRAME_END):
+            messages.extend(self.decode_frame(frame))
+        for data in messages:
+            self.handle_message(data)
+        return messages
+
+    def decode_frame(self, frame):
+        """Decode all JSON objects contained in one frame.
+
+        Args:
+            frame (bytes): frame without the terminating ``\\x17``
+        Returns (list): the decoded objects
         """
-        i = 0
+        try:
+            text = frame.decode("utf-8")
+        except UnicodeDecodeError:
+            log.warning("Dropping non UTF-8 frame: %r", frame)
+            return []
+
         result = []
-        split_msg = msg.split('}{')
-        for s in range(len(split_msg)):
-            if i == 0 and len(split_msg) == 1:
-                result.append(split_msg[s])
-            elif i == 0 and len(split_msg) > 1:
-                result.append(split_msg[s] + "}")
-            elif i == len(split_msg) - 1 and len(split_msg) > 1:
-                result.append("{" + split_msg[s])
-            else:
-                result.append("{" + split_msg[s] + "}")
-            i += 1
+        idx = 0
+        end = len(text)
+        while idx < end:
+            while idx < end and text[idx].isspace():
+                idx += 1
+            if idx == end:
+                break
+            try:
+                obj, idx = self._decoder.raw_decode(text, idx)
+            except json.JSONDecodeError as e:
+                log.warning("Dropping malformed message %r: %s",
+                            text[idx:], e)
+                break
+            result.append(obj)
         return result
 
+    def handle_message(self, data):
+        if not isinstance(data, dict):
+            return
+        with self.lock:
+            self.add_labelProps(data)
+        self.check_error(data)
+
     def add_labelProps(self, data):
         if "label" in data.keys():
+            label = data["label"]
             # After get labelProps, queries also bounds, units etc...
-            if isinstance(data["value"], (dict)):
-                self.labelProps[data["label"]] = data["value"]
+            if isinstance(data.get("value"), (dict)):
+                self.labelProps[label] = data["value"]
+                event = self._label_events.pop(label, None)
+                if event is not None:
+                    event.set()
             # General label communication, for example from broadcasts
-            else:
-                try:
-                    self.labelProps[data["label"]
-                                    ]["value"] = data["value"]
-                except Exception:
-                    None
+            elif label in self.labelProps:
+                self.labelProps[label]["value"] = data.get("value")
 
     def check_error(self, data):
         if "label" in data.keys():
-            if "Error" in data["label"]:
-                self.error_callback(data["value"])
-
-    def get_label(self, label):
-        timeout = 10
-        dt = .1
-        i = 0
-        while True:
-            if i * dt > timeout:
-                raise IOError("Could not acquire label")
-            try:
+            if "Error" in data["label"] and self.error_callback is not None:
+                self.error_callback(data.get("value"))
+
+    def get_label(self, label, timeout=10):
+        """Return the properties of a label.
+
+        If the label is not known yet, the label properties are requested
+        once and the call blocks until the answer arrives.
+
+        Args:
+            label (str): name of the label
+            timeout (float): maximum time to wait in seconds
+        Return (dict): the label properties
+        """
+        with self.lock:
+            if label in self.labelProps:
                 return self.labelProps[label]
-            except Exception:
-                self.send(json.dumps(
-                    {"request": "labelProps", "value": "None"}))
-                time.sleep(dt)
-            i += 1
+            event = self._label_events.setdefault(label, threading.Event())
+        self.request_label_props()
+        if not event.wait(timeout):
+            with self.lock:
+                if self._label_events.get(label) is event:
+                    del self._label_events[label]
+            raise IOError("Could not acquire label")
+        with self.lock:
+            return self.labelProps[label]
 
     def get_all_labels(self, label):
         return self.labelProps
 
     def run(self):
-        self.send(json.dumps(
-            {"request": "labelProps", "value": "None"}))
-        rcv_msg = []
+        self.request_label_props()
 
         while self.shutdown is False:
             try:
-                rcv = "" + rcv_msg[1]
-            except Exception:
-                rcv = ""
-            data = {}
-            r = ""
-            while "\x17" not in rcv:
-                try:
-                    r = str(self.socket.recv(self.BUFFER), 'utf-8')
-                except Exception:
-                    None
-                rcv = rcv + r
-
-            rcv_msg = rcv.split("\x17")
-
-            for rcv_line in rcv_msg:
-                rcv_split = self.sub_jsons(rcv_line)
-                for msg in rcv_split:
-                    try:
-                        data = json.loads(msg)
-                    except Exception:
-                        None
-
-                    with self.lock:
-                        self.add_labelProps(data)
-                        self.check_error(data)
+                chunk = self.socket.recv(self.BUFFER)
+            except socket.timeout:
+                continue
+            except OSError:
+                if not self.shutdown:
+                    log.exception("Connection to %s:%s lost",
+                                  self.TCP_IP_ADR, self.TCP_IP_PORT)
+                break
+            if not chunk:
+                log.warning("Connection to %s:%s closed by server",
+                            self.TCP_IP_ADR, self.TCP_IP_PORT)
+                break
+            self.feed(chunk)
 
 
 class SQCounts(threading.Thread):
@@ -9,8 +9,11 @@ Author:
 """
 
 import abc
+import logging
+import threading
 import time
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
+import numpy as np
 import pyvisa
 import warnings
 
@@ -460,9 +463,14 @@ class SirahMatissePowerDiode(SirahMatisseChannel):
                            deactivated. Setting the level to 0 (zero) de-activates this function.
                            """)
 
+    def read_wave_table(self) -> np.ndarray:
+        """Gets the current waveform like `wave_table`, but through the fast query path of
+        the instrument, which skips the parameter machinery. Meant for tight polling loops."""
+        return self._wave_table_parser(self.root_instrument.ask_fast(self._cmd_prefix + "WAVTAB?"))
+
     @staticmethod
-    def _wave_table_parser(raw_wave_table: str) -> List[float]:
-        return [float(raw_value) for raw_value in raw_wave_table.split()]
+    def _wave_table_parser(raw_wave_table: str) -> np.ndarray:
+        return np.array(raw_wave_table.split(), dtype=float)
 
 
 class SirahMatisseBiFiMotor(SirahMatisseChannel):
@@ -972,6 +980,9 @@ class SirahMatisse(VisaInstrument):
     def __init__(self, name: str, address: str):
         super().__init__(name, address)
 
+        # Serializes queries of the main thread and of a `SirahMatisseSampler`
+        self._io_lock = threading.RLock()
+
         self.add_parameter("error_codes",
                            label="Last error codes",
                            get_cmd="ERR:CODE?",
@@ -1057,57 +1068,75 @@ class SirahMatisse(VisaInstrument):
             str: The instrument's response.
         """
         with DelayedKeyboardInterrupt():
-            self.visa_log.debug(f"Querying: {cmd}")
+            return self.ask_fast(cmd)
+
+    def ask_fast(self, cmd: str) -> str:
+        """Queries the instrument like `ask_raw`, but without delaying keyboard interrupts and
+        without the error wrapping of `ask`. Meant for high-rate queries like wave tables, and
+        safe to use from a background thread (see `SirahMatisseSampler`).
+
+        Args:
+            cmd: The command to send to the instrument.
+
+        Returns:
+            str: The instrument's response.
+        """
+        with self._io_lock:
             response = self.visa_handle.query(cmd)
+        if self.visa_log.isEnabledFor(logging.DEBUG):
+            self.visa_log.debug(f"Querying: {cmd}")
             self.visa_log.debug(f"Response: {response}")
 
-            # Handle error response
-            if response.startswith('!ERROR'):
-                try:
-                    # Extract error code from response
-                    err_code = int(response.split(maxsplit=1)[1])
-                    exc = None
-                except Exception as exc:
-                    err_code = None
-
-                try:
-                    err_codes_list = self.error_codes()
-                except Exception:
-                    err_codes_list = [err_code] if err_code is not None else None
-
-                # Try to clear error buffer
-                try:
-                    self.clear_errors()
-                except Exception as exc:
-                    warnings.warn(f"Couldn't clear error buffer after receiving an error "
-                                  f"response.\n -> {type(exc).__name__}: {exc}")
-
-                if exc is None:
-                    raise SirahMatisseError(f"Error querying \"{cmd}\": {err_code}",
-                                            err_codes_list)
-                else:
-                    raise SirahMatisseError(f"Unknown error querying \"{cmd}\"",
-                                            err_codes_list) from exc
-            elif response == "OK":
-                return ""
-            else:
-                try:
-                    # Extract result from response-string
-                    result = response.split(maxsplit=1)[1]
-
-                    # If response is surrounded by quotes, remove them
-                    if result[0] == result[-1] == "\"":
-                        return result[1:-1]
-                    else:
-                        return result
-                except Exception:
-                    return ""
-
-    def write(self, *args, **kwargs):
-        """This instrument always gives an answer, even when writing. Therefore the write-function
-        is redirected to the ask-function, so that the answer is popped from the answer queue.
+        # Handle error response
+        if response.startswith('!ERROR'):
+            self._raise_error_response(cmd, response)
+        elif response == "OK":
+            return ""
+
+        # Extract result from response-string
+        parts = response.split(maxsplit=1)
+        if len(parts) < 2:
+            return ""
+        result = parts[1]
+
+        # If response is surrounded by quotes, remove them
+        if result[0] == result[-1] == "\"":
+            return result[1:-1]
+        return result
+
+    def _raise_error_response(self, cmd: str, response: str) -> None:
+        try:
+            # Extract error code from response
+            err_code = int(response.split(maxsplit=1)[1])
+            exc = None
+        except Exception as e:
+            err_code = None
+            exc = e
+
+        try:
+            err_codes_list = self.error_codes()
+        except Exception:
+            err_codes_list = [err_code] if err_code is not None else None
+
+        # Try to clear error buffer
+        try:
+            self.error_clear()
+        except Exception as clear_exc:
+            warnings.warn(f"Couldn't clear error buffer after receiving an error "
+                          f"response.\n -> {type(clear_exc).__name__}: {clear_exc}")
+
+        if exc is None:
+            raise SirahMatisseError(f"Error querying \"{cmd}\": {err_code}",
+                                    err_codes_list)
+        else:
+            raise SirahMatisseError(f"Unknown error querying \"{cmd}\"",
+                                    err_codes_list) from exc
+
+    def write_raw(self, cmd: str) -> None:
+        """This instrument always gives an answer, even when writing. Therefore writing is
+        redirected to `ask_raw`, so that the answer is popped from the answer queue.
         """
-        self.ask(*args, **kwargs)
+        self.ask_raw(cmd)
 
     @staticmethod
     def _parse_error_codes(error_codes: str) -> List[int]:
@@ -1121,3 +1150,142 @@ class SirahMatisse(VisaInstrument):
             List of integer error-codes
         """
         return [int(code) for code in error_codes.split()]
+
+
+class SirahMatisseSampler:
+    """Records wave tables and powers of a Sirah Matisse in a background thread
+
+    The queries go through `SirahMatisse.ask_fast` at a fixed rate and the results are stored in
+    ring buffers holding the last `length` samples. By default the piezo etalon wave table (the
+    power diode signal over one modulation period of the piezo etalon), the DC power of the power
+    diode and the reference cell input of the fast piezo are recorded.
+
+    Args:
+        matisse: Instrument to sample
+        rate: Samples per second
+        length: Number of samples kept in the ring buffers
+        queries: Maps record names to query commands, overriding the defaults. Responses of
+                 commands ending in "WAVTAB?" are stored as arrays of `piezo_etalon.oversampling`
+                 values, all others as floats.
+    """
+
+    # record name -> (channel, command without the channel prefix)
+    DEFAULT_QUERIES = {
+        "piezo_etalon_wave_table": ("power_diode", "WAVTAB?"),
+        "power": ("power_diode", "DC?"),
+        "reference": ("fast_piezo", "INP?"),
+    }
+
+    def __init__(self, matisse: SirahMatisse, rate: float, length: int = 1000,
+                 queries: Optional[Dict[str, str]] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.matisse = matisse
+        self.period = 1 / rate
+        self.length = length
+        self.queries = dict(self.default_queries(matisse) if queries is None else queries)
+
+        self._buffers: Dict[str, np.ndarray] = {}
+        self._parsers: Dict[str, Callable[[str], object]] = {}
+        self._timestamps = np.full(length, np.nan)
+        self._count = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.error: Optional[Exception] = None
+
+    @classmethod
+    def default_queries(cls, matisse: SirahMatisse) -> Dict[str, str]:
+        """Returns the default query commands, built from the command prefixes of the channels"""
+        return {name: matisse.submodules[channel]._cmd_prefix + cmd
+                for name, (channel, cmd) in cls.DEFAULT_QUERIES.items()}
+
+    def _allocate(self) -> None:
+        points = None
+        for name, cmd in self.queries.items():
+            if cmd.endswith("WAVTAB?"):
+                if points is None:
+                    points = self.matisse.piezo_etalon.oversampling()
+                self._buffers[name] = np.full((self.length, points), np.nan)
+                self._parsers[name] = SirahMatissePowerDiode._wave_table_parser
+            else:
+                self._buffers[name] = np.full(self.length, np.nan)
+                self._parsers[name] = float
+        self._timestamps[:] = np.nan
+        self._count = 0
+
+    def start(self) -> None:
+        """Starts sampling into empty buffers"""
+        if self.running:
+            raise RuntimeError("Sampler is already running")
+        self._allocate()
+        self.error = None
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name=f"{self.matisse.name}_sampler")
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops sampling, the recorded data stays available"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def __enter__(self) -> "SirahMatisseSampler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def sample(self) -> None:
+        """Takes one sample of every query and stores it in the ring buffers"""
+        values = {name: self._parsers[name](self.matisse.ask_fast(cmd))
+                  for name, cmd in self.queries.items()}
+        with self._lock:
+            index = self._count % self.length
+            for name, value in values.items():
+                buffer = self._buffers[name]
+                if buffer.ndim == 2 and np.shape(value) != buffer.shape[1:]:
+                    # oversampling was changed while sampling
+                    self._buffers[name] = buffer = np.full(
+                        (self.length, np.size(value)), np.nan)
+                buffer[index] = value
+            self._timestamps[index] = time.time()
+            self._count += 1
+
+    def _run(self) -> None:
+        next_time = time.perf_counter()
+        while not self._stop.is_set():
+            try:
+                self.sample()
+            except Exception as exc:
+                self.error = exc
+                return
+            next_time += self.period
+            delay = next_time - time.perf_counter()
+            if delay < 0:
+                # too slow for the requested rate, skip the missed samples
+                next_time -= (delay // self.period) * self.period
+                delay = next_time - time.perf_counter()
+            self._stop.wait(max(delay, 0))
+
+    @property
+    def count(self) -> int:
+        """Number of samples taken since `start`"""
+        return self._count
+
+    def data(self) -> Dict[str, np.ndarray]:
+        """Returns copies of the recorded samples, oldest first, including the "timestamp" of
+        every sample in seconds since the epoch."""
+        with self._lock:
+            n = min(self._count, self.length)
+            order = (np.arange(self._count - n, self._count)) % self.length
+            result = {name: buffer[order] for name, buffer in self._buffers.items()}
+            result["timestamp"] = self._timestamps[order]
+        return result
@@ -37,6 +37,12 @@ class SIM928(VisaInstrument):
                 raise ValueError('Duplicate names in slot_names')
             self.module_nr[self.slot_names[i]] = i
 
+        self.add_parameter('module_poll_interval', unit='s',
+                           label="Delay between polls of the output queue "
+                                 "of a module while waiting for a response",
+                           get_cmd=None, set_cmd=None,
+                           vals=vals.Numbers(0, 1), initial_value=0.005)
+
         self.write('*DCL')  # device clear
         self.write('FLSH')  # flush port buffers
         self.write('SRST')  # SIM reset (causes 100 ms delay)
@@ -119,19 +125,40 @@ class SIM928(VisaInstrument):
         """
         if not isinstance(i, int):
             i = self.module_nr[i]
-        msg = 'SNDT {},"{}"'.format(i, cmd)
-        self.write(msg)
-        time.sleep(100e-3)
-        msg = 'GETN? {},128'.format(i)
-        msg = self.ask(msg)
-        # first read consumes the terminator of the message from the submodule,
-        # so we have a terminator from the message to us still in the input
-        # buffer.
-        self.visa_handle.read()
-
-        if msg[:2] != '#3':
-            raise RuntimeError('Unexpected format of answer: {}'.format(msg))
-        return msg[5:]
+        self.write('SNDT {},"{}"'.format(i, cmd))
+        return self._read_module_output(i)
+
+    def _read_module_output(self, i):
+        """
+        Wait for a complete line in the output queue of module ``i`` and
+        return it without the terminator.
+
+        Instead of waiting a fixed time, the number of bytes waiting in the
+        queue is polled with ``NINP?`` and read as soon as it is non-zero,
+        until the terminator of the module arrived.
+        """
+        deadline = time.perf_counter() + (self.timeout() or float('inf'))
+        response = ''
+        while not response.endswith('\n'):
+            waiting = int(self.ask('NINP? {}'.format(i)))
+            if waiting == 0:
+                if time.perf_counter() > deadline:
+                    raise TimeoutError('No response from module {}'.format(i))
+                time.sleep(self.module_poll_interval())
+                continue
+            response += self._get_module_bytes(i, min(waiting, 128))
+        return response.rstrip('\r\n')
+
+    def _get_module_bytes(self, i, count):
+        self.write('GETN? {},{}'.format(i, count))
+        # definite length block '#3nnn', the data, and the terminator of the
+        # mainframe (the data may contain the terminator of the module)
+        header = self.visa_handle.read_bytes(5)
+        if header[:2] != b'#3':
+            raise RuntimeError('Unexpected format of answer: {}'.format(header))
+        length = int(header[2:])
+        data = self.visa_handle.read_bytes(length + 1)
+        return data[:length].decode()
 
     def write_module(self, i, cmd):
         """
@@ -146,6 +173,23 @@ class SIM928(VisaInstrument):
             i = self.module_nr[i]
         self.write('SNDT {},"{}"'.format(i, cmd))
 
+    def write_modules(self, cmds):
+        """
+        Write command strings to several modules in a single write to the
+        mainframe, with NO response expected.
+
+        Args:
+            cmds (Dict[int, str]): A dictionary where keys are module slot
+                numbers or names and values are the command strings.
+        """
+        msgs = []
+        for i, cmd in cmds.items():
+            if not isinstance(i, int):
+                i = self.module_nr[i]
+            msgs.append('SNDT {},"{}"'.format(i, cmd))
+        if msgs:
+            self.write(';'.join(msgs))
+
     def set_voltage(self, i, voltage):
         """
         Set the output voltage of a module.
@@ -215,46 +259,66 @@ class SIM928(VisaInstrument):
             vdict[name] = voltagedict[i]
             self.parameters['volt_{}'.format(name)].validate(vdict[name])
 
-        intermediate = []
+        names = list(vdict)
+        start = [self.parameters['volt_{}'.format(i)]() for i in names]
+        stepsize = [self.parameters['volt_{}_step'.format(i)]() for i in names]
+        voltages, active = self.plan_smooth(start, [vdict[i] for i in names],
+                                            stepsize, equitime)
+
+        timestep = self.smooth_timestep()
+        t0 = time.perf_counter()
+        for step, (row, row_active) in enumerate(zip(voltages, active)):
+            slots = {name: 'VOLT {:.3f}'.format(v)
+                     for name, v, a in zip(names, row, row_active) if a}
+            self.write_modules(slots)
+            for name, v, a in zip(names, row, row_active):
+                if a:
+                    self.parameters['volt_{}'.format(name)].cache.set(v)
+            # keep the step rate independent of the time spent writing
+            delay = t0 + (step + 1) * timestep - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+    @staticmethod
+    def plan_smooth(start, target, stepsize, equitime=False):
+        """
+        Compute all intermediate voltages of a smooth voltage change.
+
+        Args:
+            start (Sequence[float]): Voltage of every module before the ramp.
+            target (Sequence[float]): Voltage of every module after the ramp.
+            stepsize (Sequence[float]): Maximum voltage step of every module.
+            equitime (bool): If ``True``, uses smaller step sizes for some of
+                the modules so that all modules reach the desired value at the
+                same time.
+
+        Returns:
+            np.ndarray, np.ndarray: The voltages, of shape
+            ``(steps, modules)``, and a boolean array of the same shape that
+            is ``False`` where a module has already reached its target and
+            does not need to be written to.
+        """
+        start = np.asarray(start, dtype=float)
+        target = np.asarray(target, dtype=float)
+        stepsize = np.asarray(stepsize, dtype=float)
+        deltav = target - start
+        with np.errstate(divide='ignore', invalid='ignore'):
+            steps = np.ceil(np.abs(deltav) / stepsize)
+        # a module within one step (or with zero step size) jumps directly
+        steps = np.where(np.isfinite(steps), np.maximum(steps, 1), 1)
+        steps = steps.astype(int)
+
         if equitime:
-            maxsteps = 0
-            deltav = {}
-            for i in vdict:
-                deltav[i] = vdict[i]-self.parameters['volt_{}'.format(i)]()
-                stepsize = self.parameters['volt_{}_step'.format(i)]()
-                steps = abs(int(np.ceil(deltav[i]/stepsize)))
-                if steps > maxsteps:
-                    maxsteps = steps
-            for s in range(maxsteps):
-                intermediate.append({})
-                for i in vdict:
-                    intermediate[-1][i] = vdict[i] - \
-                                          deltav[i]*(maxsteps-s-1)/maxsteps
+            maxsteps = steps.max(initial=0) if np.any(deltav) else 0
+            fraction = np.arange(1, maxsteps + 1)[:, np.newaxis] / maxsteps
+            voltages = start + deltav * fraction
+            active = np.ones(voltages.shape, dtype=bool)
         else:
-            done = []
-            prevvals = {}
-            for i in vdict:
-                prevvals[i] = self.parameters['volt_{}'.format(i)]()
-            while len(done) != len(vdict):
-                intermediate.append({})
-                for i in vdict:
-                    if i in done:
-                        continue
-                    stepsize = self.parameters['volt_{}_step'.format(i)]()
-                    deltav = vdict[i]-prevvals[i]
-                    if abs(deltav) <= stepsize:
-                        intermediate[-1][i] = vdict[i]
-                        done.append(i)
-                    elif deltav > 0:
-                        intermediate[-1][i] = prevvals[i] + stepsize
-                    else:
-                        intermediate[-1][i] = prevvals[i] - stepsize
-                    prevvals[i] = intermediate[-1][i]
-
-        for voltages in intermediate:
-            for i in voltages:
-                self.set_voltage(i, voltages[i])
-            time.sleep(self.smooth_timestep())
+            k = np.arange(1, steps.max(initial=0) + 1)[:, np.newaxis]
+            voltages = start + np.sign(deltav) * stepsize * k
+            voltages = np.where(k >= steps, target, voltages)
+            active = k <= steps
+        return voltages, active
 
     def get_module_status(self, i):
         """
@@ -1,6 +1,7 @@
 from functools import partial
+import time
 import numpy as np
-from typing import Any, Iterable, Tuple, Union
+from typing import Any, Iterable, Optional, Tuple, Union
 from numpy.typing import NDArray
 from qcodes import VisaInstrument
 from qcodes.instrument.parameter import (
@@ -36,6 +37,11 @@ class SR844(VisaInstrument):
     }
     value_sensitivity_map = {v: k for k, v in sensitivity_value_map.items()}
 
+    # Size of each channel buffer in points
+    BUFFER_SIZE = 16383
+    # Binary TRCL format: int16 mantissa followed by int16 exponent per point
+    TRCL_DTYPE = np.dtype([("mantissa", "<i2"), ("exponent", "<i2")])
+
     def __init__(self, name: str, address: str, **kwargs: Any) -> None:
         super().__init__(name, address, **kwargs)
 
@@ -485,6 +491,110 @@ class SR844(VisaInstrument):
 
         return tuple(float(val) for val in output.split(","))
 
+    @classmethod
+    def parse_trcl(cls, rawdata: bytes, npts: Optional[int] = None) -> NDArray:
+        """
+        Decode the binary ``TRCL`` buffer format in one vectorized step.
+        Each point is a little endian int16 mantissa m and int16 exponent e,
+        its value is m * 2**(e - 124).
+
+        Args:
+            rawdata: Bytes as returned by the instrument.
+            npts: Number of points to decode. Default: all complete points
+                in `rawdata`.
+        """
+        if npts is None:
+            npts = len(rawdata) // cls.TRCL_DTYPE.itemsize
+        points = np.frombuffer(rawdata, dtype=cls.TRCL_DTYPE, count=npts)
+        return np.ldexp(points["mantissa"].astype(np.float64),
+                        points["exponent"].astype(np.int32) - 124)
+
+    def read_buffer(self, channel: int, start: int, npts: int) -> NDArray:
+        """
+        Read `npts` points of one channel buffer starting at point `start`.
+        """
+        self.write(f"TRCL ? {channel}, {start}, {npts}")
+        rawdata = self.visa_handle.read_bytes(npts * self.TRCL_DTYPE.itemsize)
+        return self.parse_trcl(rawdata, npts)
+
+    def read_buffers(
+        self, start: int = 0, npts: Optional[int] = None
+    ) -> Tuple[NDArray, NDArray]:
+        """
+        Read both channel buffers from point `start` on.
+
+        Args:
+            start: First point to read.
+            npts: Number of points to read. Default: all stored points
+                from `start` on.
+
+        Returns:
+            Tuple of channel 1 and channel 2 arrays of equal length.
+        """
+        if npts is None:
+            npts = self.buffer_npts() - start
+        if npts <= 0:
+            empty = np.empty(0, dtype=np.float64)
+            return empty, empty.copy()
+        return self.read_buffer(1, start, npts), self.read_buffer(2, start, npts)
+
+    def acquire_buffers(
+        self,
+        npts: int,
+        poll_interval: float = 0.1,
+        timeout: Optional[float] = None,
+        start: bool = True,
+    ) -> Tuple[NDArray, NDArray]:
+        """
+        Acquire `npts` points into both channel buffers while reading them
+        out incrementally, so transfer overlaps with acquisition.
+
+        The buffers are reset and started (unless `start` is False, e.g. if
+        storage is started by a trigger), then every `poll_interval` the
+        points stored since the last poll are read from both channels with
+        ``TRCL`` and a start offset. Storage is paused once `npts` points
+        have been read. The buffer acquisition mode should be "single shot".
+
+        Args:
+            npts: Number of points to acquire per channel.
+            poll_interval: Time in seconds between polls of the buffers.
+            timeout: Maximum acquisition time in seconds. Default: no limit.
+            start: Whether to reset and start the buffers.
+
+        Returns:
+            Tuple of channel 1 and channel 2 arrays of length `npts`.
+        """
+        if not 0 < npts <= self.BUFFER_SIZE:
+            raise ValueError(
+                f"npts must be between 1 and {self.BUFFER_SIZE}, got {npts}."
+            )
+        data = np.empty((2, npts), dtype=np.float64)
+        if start:
+            self.buffer_reset()
+            self.buffer_start()
+        t0 = time.perf_counter()
+        n_read = 0
+        try:
+            while n_read < npts:
+                n_stored = min(self.buffer_npts(), npts)
+                if n_stored > n_read:
+                    n_new = n_stored - n_read
+                    for ch in (1, 2):
+                        data[ch - 1, n_read:n_stored] = self.read_buffer(
+                            ch, n_read, n_new
+                        )
+                    n_read = n_stored
+                    continue
+                if timeout is not None and time.perf_counter() - t0 > timeout:
+                    raise TimeoutError(
+                        f"Only {n_read} of {npts} points acquired within "
+                        f"{timeout} s."
+                    )
+                time.sleep(poll_interval)
+        finally:
+            self.buffer_pause()
+        return data[0], data[1]
+
     def increment_sensitivity(self) -> bool:
         """
         Increment the sensitivity setting of the lock-in. This is equivalent
@@ -699,8 +809,7 @@ class ChannelTrace(ParameterWithSetpoints):
         return self.parse_binary(rawdata)
 
     def parse_binary(self, rawdata: bytes) -> NDArray:
-        realdata = np.frombuffer(rawdata, dtype="<i2")
-        return realdata[::2] * 2.0 ** (realdata[1::2] - 124)
+        return SR844.parse_trcl(rawdata)
 
     def poll_raw_binary_data(self, N: int) -> Any:
         assert isinstance(self.root_instrument, SR844)
@@ -1,4 +1,7 @@
-from typing import Any, Tuple, Sequence, cast
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Sequence, cast
 
 import numpy as np
 from qcodes import VisaInstrument
@@ -9,6 +12,7 @@ from qcodes.utils.helpers import create_on_off_val_mapping
 
 MIN_WAVEFORM_LENGTH = 2
 MAX_WAVEFORM_LENGTH = 131072
+USER_MEMORIES = (1, 2, 3, 4)
 
 
 class AFG3000(VisaInstrument):
@@ -20,6 +24,9 @@ class AFG3000(VisaInstrument):
     def __init__(self, name: str, address: str, **kwargs: Any):
         super().__init__(name, address, terminator='\n', timeout=20, **kwargs)
 
+        # set by AFG3000WaveformLibrary to keep track of USER memory contents
+        self.waveform_library: Optional["AFG3000WaveformLibrary"] = None
+
         self.add_parameter(
             name='trigger_mode',
             label='Trigger mode',
@@ -660,25 +667,12 @@ class AFG3000(VisaInstrument):
                 containing values from 0 to 1.
             memory: The USER# memory where to to store the waveform, from 1 to 4.
         """
-        if (len(waveform) < MIN_WAVEFORM_LENGTH or
-            len(waveform) > MAX_WAVEFORM_LENGTH):
-            raise ValueError(f"Invalid waveform length: {len(waveform)}")
-
-        if memory not in [1, 2, 3, 4]:
+        if memory not in USER_MEMORIES:
             raise ValueError(f"Invalid value for memory: '{memory}'")
 
-        # convert to numpy array and raise ValueError if data contains inf or nan
-        wf_array = np.asarray_chkfinite(waveform)
-
-        if np.any(wf_array > 1.0):
-            raise ValueError("Waveform contains data above 1.0")
-        if np.any(wf_array < 0.0):
-            raise ValueError("Waveform contains data below 0.0")
-
-        self.reset_edit_memory(len(waveform))
+        wf_codes = self.waveform_codes(waveform)
 
-        # convert waveform to two-byte integer values in the range 0..16382 (= 2**14-2)
-        wf_codes = (wf_array * (2**14-2)).astype(np.uint16)
+        self.reset_edit_memory(len(wf_codes))
 
         # write data to the editable memory
         self.visa_handle.write_binary_values(
@@ -692,6 +686,215 @@ class AFG3000(VisaInstrument):
         # copy data from editable memory to USER.
         self.write(f"DATA:COPY USER{memory},EMEM")
 
+        if self.waveform_library is not None:
+            self.waveform_library.forget_memory(memory)
+
+    @staticmethod
+    def waveform_codes(waveform: Sequence[float]) -> np.ndarray:
+        """
+        Validate a waveform with values in the range 0..1 and convert it to
+        the two-byte integer codes stored by the instrument.
+        """
+        if (len(waveform) < MIN_WAVEFORM_LENGTH or
+            len(waveform) > MAX_WAVEFORM_LENGTH):
+            raise ValueError(f"Invalid waveform length: {len(waveform)}")
+
+        # convert to numpy array and raise ValueError if data contains inf or nan
+        wf_array = np.asarray_chkfinite(waveform)
+
+        if np.any(wf_array > 1.0):
+            raise ValueError("Waveform contains data above 1.0")
+        if np.any(wf_array < 0.0):
+            raise ValueError("Waveform contains data below 0.0")
+
+        # convert waveform to two-byte integer values in the range 0..16382 (= 2**14-2)
+        return (wf_array * (2**14-2)).astype(np.uint16)
+
+    def upload_waveforms(self, waveforms: Mapping[int, Sequence[float]]) -> None:
+        """
+        Upload several waveforms to USER memories in a single message.
+
+        For every waveform the commands ``DATA:DEFINE``, ``DATA:DATA`` and
+        ``DATA:COPY`` are chained, and all of them are sent with one
+        ``write_raw`` call.
+
+        Args:
+            waveforms: Mapping from USER# memory (1 to 4) to waveform data,
+                containing values from 0 to 1.
+        """
+        self._upload_waveforms(waveforms)
+
+        if self.waveform_library is not None:
+            for memory in waveforms:
+                self.waveform_library.forget_memory(memory)
+
+    def _upload_waveforms(self, waveforms: Mapping[int, Sequence[float]]) -> None:
+        """``upload_waveforms`` without updating the waveform library."""
+        commands = []
+        for memory, waveform in waveforms.items():
+            if memory not in USER_MEMORIES:
+                raise ValueError(f"Invalid value for memory: '{memory}'")
+            wf_codes = self.waveform_codes(waveform)
+            data = wf_codes.astype('>u2').tobytes()
+            length = str(len(data))
+            commands.append(
+                f"DATA:DEFINE EMEM,{len(wf_codes)};:DATA:DATA EMEM,"
+                f"#{len(length)}{length}".encode('ascii') + data +
+                f";:DATA:COPY USER{memory},EMEM".encode('ascii'))
+        if not commands:
+            return
+        message = b';:'.join(commands) + self.visa_handle.write_termination.encode('ascii')
+        self.visa_handle.write_raw(message)
+
+
+class AFG3000WaveformLibrary:
+    """
+    Keeps track of the waveforms stored in the USER memories of an AFG3000.
+
+    Waveforms are loaded by name with ``load``. A waveform whose content
+    (hash of its integer codes) is already stored in a USER memory is not
+    uploaded again. Otherwise it replaces the least recently used
+    waveform. Several waveforms can be loaded at once with ``load_many``,
+    which uploads all missing waveforms in a single message.
+
+    The USER memories are non-volatile, so the bookkeeping can be
+    persisted to a JSON file and reused in later sessions.
+
+    Args:
+        afg: The instrument.
+        path: Optional JSON file in which the bookkeeping is stored. It is
+            read on construction if it exists and was written for the same
+            instrument (serial number).
+    """
+
+    def __init__(self, afg: AFG3000, path: Optional[str] = None):
+        self.afg = afg
+        self.path = path
+        self._serial = str(afg.IDN().get('serial'))
+        # USER memory -> {'hash': ..., 'name': ...}
+        self._memories: Dict[int, Dict[str, str]] = {}
+        # least recently used memory first
+        self._usage: List[int] = list(USER_MEMORIES)
+        if path is not None and os.path.exists(path):
+            self._read()
+        afg.waveform_library = self
+
+    @property
+    def names(self) -> Dict[str, int]:
+        """Mapping from waveform name to USER memory."""
+        return {entry['name']: memory for memory, entry in self._memories.items()
+                if entry['name']}
+
+    def memory_of(self, name: str) -> Optional[int]:
+        """Return the USER memory in which waveform `name` is stored, if any."""
+        return self.names.get(name)
+
+    def load(self, name: str, waveform: Sequence[float]) -> int:
+        """
+        Make sure a waveform is stored in a USER memory.
+
+        Args:
+            name: Name of the waveform.
+            waveform: Waveform data, containing values from 0 to 1.
+
+        Returns:
+            The USER# memory holding the waveform.
+        """
+        return self.load_many({name: waveform})[name]
+
+    def load_many(self, waveforms: Mapping[str, Sequence[float]]) -> Dict[str, int]:
+        """
+        Make sure several waveforms are stored in USER memories, uploading
+        the missing ones in one message.
+
+        Args:
+            waveforms: Mapping from name to waveform data, at most 4 entries.
+
+        Returns:
+            Mapping from name to USER# memory.
+        """
+        if len(waveforms) > len(USER_MEMORIES):
+            raise ValueError(f"At most {len(USER_MEMORIES)} waveforms can be "
+                             f"stored at the same time, got {len(waveforms)}.")
+        hashes = {name: self._hash(AFG3000.waveform_codes(wf))
+                  for name, wf in waveforms.items()}
+        resident = {entry['hash']: memory for memory, entry in self._memories.items()}
+
+        result: Dict[str, int] = {}
+        missing = []
+        for name, wf_hash in hashes.items():
+            memory = resident.get(wf_hash)
+            if memory is None or memory in result.values():
+                missing.append(name)
+            else:
+                result[name] = memory
+
+        free = [memory for memory in self._usage if memory not in result.values()]
+        uploads = {}
+        for name, memory in zip(missing, free):
+            uploads[memory] = waveforms[name]
+            result[name] = memory
+
+        if uploads:
+            # the bookkeeping of the uploaded memories is replaced below
+            self.afg._upload_waveforms(uploads)
+        state = self._state()
+        for name, memory in result.items():
+            for entry in self._memories.values():
+                if entry['name'] == name:
+                    # the old shape stays resident, but under no name
+                    entry['name'] = ''
+            self._memories[memory] = {'hash': hashes[name], 'name': name}
+            self._usage.remove(memory)
+            self._usage.append(memory)
+        if uploads or self._state() != state:
+            self._write()
+        return result
+
+    def forget_memory(self, memory: int) -> None:
+        """Mark the content of a USER memory as unknown."""
+        if self._memories.pop(memory, None) is not None:
+            self._write()
+
+    def clear(self) -> None:
+        """Forget all bookkeeping, e.g. after the memories were changed
+        from the front panel."""
+        self._memories.clear()
+        self._write()
+
+    @staticmethod
+    def _hash(wf_codes: np.ndarray) -> str:
+        return hashlib.sha1(wf_codes.astype('>u2').tobytes()).hexdigest()
+
+    def _read(self) -> None:
+        assert self.path is not None
+        with open(self.path) as f:
+            state = json.load(f)
+        if state.get('serial') != self._serial:
+            self.afg.log.warning(f'Ignoring waveform library {self.path}, it '
+                                 f'was written for instrument {state.get("serial")}.')
+            return
+        self._memories = {int(memory): entry
+                          for memory, entry in state['memories'].items()}
+        usage = [int(memory) for memory in state.get('usage', [])]
+        self._usage = [m for m in USER_MEMORIES if m not in usage] + \
+            [m for m in usage if m in USER_MEMORIES]
+
+    def _state(self) -> Dict[str, Any]:
+        return {'serial': self._serial,
+                'memories': {str(memory): dict(entry)
+                             for memory, entry in self._memories.items()},
+                'usage': list(self._usage)}
+
+    def _write(self) -> None:
+        if self.path is None:
+            return
+        state = self._state()
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.path)
+
 
 class AFG3252(AFG3000):
     pass
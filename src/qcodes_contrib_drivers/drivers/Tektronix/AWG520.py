@@ -21,10 +21,16 @@
 
 import time
 import logging
+import hashlib
+import os
 import numpy as np
 import struct
 from qcodes import VisaInstrument, validators as vals
 
+# One point of a WFM/PAT file: float32 value followed by a marker byte
+# (bit 0: marker 1, bit 1: marker 2)
+WFM_POINT_DTYPE = np.dtype([('w', '<f4'), ('m', 'u1')])
+
 
 class Tektronix_AWG520(VisaInstrument):
     """
@@ -44,7 +50,7 @@ class Tektronix_AWG520(VisaInstrument):
     """
 
     def __init__(self, name, address, reset=False, clock=1e9, numpoints=1000,
-                 **kw):
+                 cache_dir=None, keep_waveforms=True, **kw):
         """
         Initializes the AWG520.
 
@@ -54,6 +60,10 @@ class Tektronix_AWG520(VisaInstrument):
                                via ethernet)
             reset (bool)     : resets to default values, default=false
             numpoints (int)  : sets the number of datapoints
+            cache_dir (str)  : optional directory in which encoded WFM/PAT
+                               files are cached, keyed by content hash
+            keep_waveforms (bool) : keep the sent waveforms in memory for
+                               resend_waveform, default=True
 
         Output:
             None
@@ -66,6 +76,10 @@ class Tektronix_AWG520(VisaInstrument):
         self._clock = clock
         self._numpoints = numpoints
         self._fname = ''
+        self._cache_dir = cache_dir
+        self._keep_waveforms = keep_waveforms
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
 
         self.add_function('reset', call_cmd='*RST')
         self.add_parameter('state',
@@ -435,6 +449,83 @@ class Tektronix_AWG520(VisaInstrument):
         return self
     # Send waveform to the device
 
+    @staticmethod
+    def _block(data):
+        """
+        Prepends an IEEE 488.2 definite length block header to data (bytes)
+        """
+        length = str(len(data))
+        return ('#%d%s' % (len(length), length)).encode('ascii') + data
+
+    @staticmethod
+    def encode_points(w, m1, m2):
+        """
+        Encodes waveform and markers to the binary point format of WFM/PAT
+        files in one step.
+
+        Input:
+            w (float[numpoints]) : waveform
+            m1 (int[numpoints])  : marker1
+            m2 (int[numpoints])  : marker2
+
+        Output:
+            bytes, 5 bytes per point
+        """
+        points = np.empty(len(w), dtype=WFM_POINT_DTYPE)
+        points['w'] = w
+        points['m'] = np.asarray(m1, dtype=np.uint8) + \
+            2 * np.asarray(m2, dtype=np.uint8)
+        return points.tobytes()
+
+    def _encode_file(self, magic, w, m1, m2, clock):
+        """
+        Returns the content of a WFM (magic 1000) or PAT (magic 2000) file,
+        from the on-disk cache if available.
+        """
+        w = np.asarray(w, dtype='<f4')
+        m1 = np.asarray(m1, dtype=np.uint8)
+        m2 = np.asarray(m2, dtype=np.uint8)
+        clock_line = ('CLOCK %.10e\n' % clock).encode('ascii')
+
+        cache_file = None
+        if self._cache_dir is not None:
+            h = hashlib.sha256(b'MAGIC %d\n' % magic)
+            for a in (w, m1, m2):
+                h.update(np.ascontiguousarray(a).tobytes())
+            h.update(clock_line)
+            cache_file = os.path.join(self._cache_dir,
+                                      h.hexdigest() + '.awg520')
+            if os.path.exists(cache_file):
+                with open(cache_file, 'rb') as f:
+                    return f.read()
+
+        content = (b'MAGIC %d\n' % magic +
+                   self._block(self.encode_points(w, m1, m2)) + clock_line)
+
+        if cache_file is not None:
+            tmp_file = cache_file + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_file, cache_file)
+        return content
+
+    def _send_file(self, filename, content):
+        """
+        Writes the content (bytes) of a file to the mass memory
+        """
+        mes = ('MMEM:DATA "%s",' % filename).encode('ascii') + \
+            self._block(content)
+        self.visa_handle.write_raw(mes)
+
+    def _store_file(self, filename, w, m1, m2, clock):
+        self._values['files'][filename] = {}
+        if self._keep_waveforms:
+            self._values['files'][filename]['w'] = w
+            self._values['files'][filename]['m1'] = m1
+            self._values['files'][filename]['m2'] = m2
+        self._values['files'][filename]['clock'] = clock
+        self._values['files'][filename]['numpoints'] = len(w)
+
     def send_waveform(self, w, m1, m2, filename, clock):
         """
         Sends a complete waveform. All parameters need to be specified.
@@ -454,32 +545,11 @@ class Tektronix_AWG520(VisaInstrument):
         logging.debug(__name__ + ' : Sending waveform %s to instrument' % filename)
 
         # Check for errors
-        dim = len(w)
-
         if (not((len(w) == len(m1)) and ((len(m1) == len(m2))))):
             return 'error'
-        self._values['files'][filename] = {}
-        self._values['files'][filename]['w'] = w
-        self._values['files'][filename]['m1'] = m1
-        self._values['files'][filename]['m2'] = m2
-        self._values['files'][filename]['clock'] = clock
-        self._values['files'][filename]['numpoints'] = len(w)
-
-        m = m1 + np.multiply(m2, 2)
-        ws = ''
-        for i in range(0, len(w)):
-            ws = ws + struct.pack('<fB', w[i], int(m[i]))
-        s1 = 'MMEM:DATA "%s",' % filename
-        s3 = 'MAGIC 1000\n'
-        s5 = ws
-        s6 = 'CLOCK %.10e\n' % clock
+        self._store_file(filename, w, m1, m2, clock)
 
-        s4 = '#' + str(len(str(len(s5)))) + str(len(s5))
-        lenlen = str(len(str(len(s6) + len(s5) + len(s4) + len(s3))))
-        s2 = '#' + lenlen + str(len(s6) + len(s5) + len(s4) + len(s3))
-
-        mes = s1 + s2 + s3 + s4 + s5 + s6
-        self.visa_handle.write(mes)
+        self._send_file(filename, self._encode_file(1000, w, m1, m2, clock))
 
     def send_pattern(self, w, m1, m2, filename, clock):
         """
@@ -501,32 +571,11 @@ class Tektronix_AWG520(VisaInstrument):
         logging.debug(__name__ + ' : Sending pattern %s to instrument' % filename)
 
         # Check for errors
-        dim = len(w)
         if (not((len(w)==len(m1)) and ((len(m1)==len(m2))))):
             return 'error'
-        self._values['files'][filename]={}
-        self._values['files'][filename]['w']=w
-        self._values['files'][filename]['m1']=m1
-        self._values['files'][filename]['m2']=m2
-        self._values['files'][filename]['clock']=clock
-        self._values['files'][filename]['numpoints']=len(w)
-
-        m = m1 + np.multiply(m2, 2)
-        ws = ''
-        for i in range(0, len(w)):
-            ws = ws + struct.pack('<fB', w[i], int(m[i]))
+        self._store_file(filename, w, m1, m2, clock)
 
-        s1 = 'MMEM:DATA "%s",' % filename
-        s3 = 'MAGIC 2000\n'
-        s5 = ws
-        s6 = 'CLOCK %.10e\n' % clock
-
-        s4 = '#' + str(len(str(len(s5)))) + str(len(s5))
-        lenlen=str(len(str(len(s6) + len(s5) + len(s4) + len(s3))))
-        s2 = '#' + lenlen + str(len(s6) + len(s5) + len(s4) + len(s3))
-
-        mes = s1 + s2 + s3 + s4 + s5 + s6
-        self.visa_handle.write(mes)
+        self._send_file(filename, self._encode_file(2000, w, m1, m2, clock))
 
 
     def resend_waveform(self, channel, w=[], m1=[], m2=[], clock=[]):
@@ -545,19 +594,35 @@ class Tektronix_AWG520(VisaInstrument):
 
         Output:
             None
+
+        Raises:
+            RuntimeError: if no waveform was sent to the channel, or if the
+                waveform was not kept in memory (keep_waveforms=False) and
+                not all of w, m1 and m2 are given
         """
-        filename = self._values['recent_channel_%s' %channel]['filename']
+        recent = self._values.get('recent_channel_%s' % channel)
+        if recent is None:
+            raise RuntimeError('No waveform has been loaded on channel %s'
+                               % channel)
+        filename = recent['filename']
         logging.debug(__name__ + ' : Resending %s to channel %s' % (filename, channel))
 
-
-        if (w==[]):
-            w = self._values['recent_channel_%s' %channel]['w']
-        if (m1==[]):
-            m1 = self._values['recent_channel_%s' %channel]['m1']
-        if (m2==[]):
-            m2 = self._values['recent_channel_%s' %channel]['m2']
+        given = {'w': w, 'm1': m1, 'm2': m2}
+        missing = [key for key, value in given.items()
+                   if len(value) == 0 and key not in recent]
+        if missing:
+            raise RuntimeError(
+                'Waveform %s was not kept in memory (keep_waveforms=False), '
+                'resend_waveform needs %s' % (filename, ', '.join(missing)))
+
+        if len(w) == 0:
+            w = recent['w']
+        if len(m1) == 0:
+            m1 = recent['m1']
+        if len(m2) == 0:
+            m2 = recent['m2']
         if (clock==[]):
-            clock = self._values['recent_channel_%s' %channel]['clock']
+            clock = recent['clock']
 
         if not ( (len(w) == self._numpoints) and (len(m1) == self._numpoints) and (len(m2) == self._numpoints)):
             logging.error(__name__ + ' : one (or more) lengths of waveforms do not match with numpoints')
@@ -590,27 +655,19 @@ class Tektronix_AWG520(VisaInstrument):
             wfs.remove(N*[None])
         except ValueError:
             pass
-        s1 = 'MMEM:DATA "%s",' % filename
-
         if len(np.shape(wfs)) ==1:
-            s3 = 'MAGIC 3001\n'
-            s5 = ''
-            for k in range(len(rep)):
-                s5 = s5+ '"%s",%s,%s,%s,%s\n'%(wfs[k],rep[k],wait[k],goto[k],logic_jump[k])
-
+            magic = 'MAGIC 3001\n'
+            lines = ['"%s",%s,%s,%s,%s\n' % (wfs[k], rep[k], wait[k], goto[k],
+                                            logic_jump[k])
+                     for k in range(len(rep))]
         else:
-            s3 = 'MAGIC 3002\n'
-            s5 = ''
-            for k in range(len(rep)):
-                s5 = s5+ '"%s","%s",%s,%s,%s,%s\n'%(wfs[0][k],wfs[1][k],rep[k],wait[k],goto[k],logic_jump[k])
-
-        s4 = 'LINES %s\n'%N
-        lenlen=str(len(str(len(s5) + len(s4) + len(s3))))
-        s2 = '#' + lenlen + str(len(s5) + len(s4) + len(s3))
-
+            magic = 'MAGIC 3002\n'
+            lines = ['"%s","%s",%s,%s,%s,%s\n' % (wfs[0][k], wfs[1][k], rep[k],
+                                                 wait[k], goto[k], logic_jump[k])
+                     for k in range(len(rep))]
 
-        mes = s1 + s2 + s3 + s4 + s5
-        self.visa_handle.write(mes)
+        content = magic + 'LINES %s\n' % N + ''.join(lines)
+        self._send_file(filename, content.encode('ascii'))
 
     def send_sequence2(self,wfs1,wfs2,rep,wait,goto,logic_jump,filename):
         """
@@ -632,21 +689,12 @@ class Tektronix_AWG520(VisaInstrument):
 
 
         N = str(len(rep))
-        s1 = 'MMEM:DATA "%s",' % filename
-        s3 = 'MAGIC 3002\n'
-        s4 = 'LINES %s\n'%N
-        s5 = ''
-
-
-        for k in range(len(rep)):
-            s5 = s5+ '"%s","%s",%s,%s,%s,%s\n'%(wfs1[k],wfs2[k],rep[k],wait[k],goto[k],logic_jump[k])
-
-        lenlen=str(len(str(len(s5) + len(s4) + len(s3))))
-        s2 = '#' + lenlen + str(len(s5) + len(s4) + len(s3))
-
+        lines = ['"%s","%s",%s,%s,%s,%s\n' % (wfs1[k], wfs2[k], rep[k], wait[k],
+                                             goto[k], logic_jump[k])
+                 for k in range(len(rep))]
 
-        mes = s1 + s2 + s3 + s4 + s5
-        self.visa_handle.write(mes)
+        content = 'MAGIC 3002\n' + 'LINES %s\n' % N + ''.join(lines)
+        self._send_file(filename, content.encode('ascii'))
 
     def set_sequence(self,filename):
         """
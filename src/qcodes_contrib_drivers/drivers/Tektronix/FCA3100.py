@@ -1,12 +1,17 @@
 import logging
 import numpy as np
-from typing import Any, Tuple
+from typing import Any, Optional, Tuple
 from qcodes.instrument import VisaInstrument
 from qcodes.parameters import MultiParameter, Parameter, ParameterWithSetpoints
-from qcodes.validators import Arrays, Ints
+from qcodes.validators import Arrays, Enum, Ints
 
 log = logging.getLogger(__name__)
 
+
+def _parse_data_format(reply: str) -> str:
+    return 'REAL' if reply.strip().upper().startswith('REAL') else 'ASC'
+
+
 class TimeStatistics(MultiParameter):
     """
     Returns the statistical values of a timing statistics.
@@ -14,6 +19,7 @@ class TimeStatistics(MultiParameter):
     def __init__(self,
                  name:str,
                  instrument:"FCA3100",
+                 from_time_array: bool = False,
                  **kwargs: Any
                  ) -> None:
         """
@@ -22,7 +28,11 @@ class TimeStatistics(MultiParameter):
         Args:
             name: name of the timing statistics
             instrument: Instrument to which the timing statistic is bound to.
+            from_time_array (optional): If True, the statistics are computed
+                locally from the latest ``time_array`` instead of being
+                measured by the counter. Defaults to False.
         """
+        self._from_time_array = from_time_array
 
         super().__init__(name=name,
                          instrument=instrument,
@@ -49,6 +59,8 @@ class TimeStatistics(MultiParameter):
             Tuple: Statistical values of the time statistic
         """
         assert isinstance(self.instrument, FCA3100)
+        if self._from_time_array:
+            return FCA3100.statistics(self.instrument.time_array.get_latest())
         self.instrument.write('CALCulate:AVERage:STAT 1')
         self.instrument.write('INIT') # start measurement
         self.instrument.ask('*OPC?') # wait for it to complete
@@ -85,11 +97,7 @@ class CompleteTimeStatistics(ParameterWithSetpoints):
             np.ndarray: Array of swithing times
         """
         assert isinstance(self.instrument, FCA3100)
-        self.instrument.write('CALCulate:AVERage:STATe 0')
-        self.instrument.write('ARM:COUN {}'.format(self.instrument.samples_number.get_latest()))
-        data_str=self.instrument.ask("READ:ARRay? {}".format(self.instrument.samples_number.get_latest()))
-        data = np.array(data_str.rstrip().split(",")).astype("float64")
-        return data
+        return self.instrument.read_time_array()
 
 class GeneratedSetPoints(Parameter):
     """
@@ -173,10 +181,95 @@ class FCA3100(VisaInstrument):
                           docstring='Absolute voltage trigger threshold channel B'
                           )
 
+        self.add_parameter(name='data_format',
+                           label='data_format',
+                           get_cmd='FORMat:DATA?',
+                           set_cmd='FORMat:DATA {}',
+                           get_parser=_parse_data_format,
+                           vals=Enum('ASC', 'REAL'),
+                           docstring='Format of array transfers, ASCII or '
+                                     'binary 64 bit floats'
+                           )
+
+        self.add_parameter(name='chunk_size',
+                           label='chunk_size',
+                           get_cmd=None,
+                           set_cmd=None,
+                           initial_value=10000,
+                           vals=Ints(1, int(2e9)),
+                           docstring='Number of samples fetched per transfer '
+                                     'while reading out a time array'
+                           )
+
         self.add_parameter(name='time_array',
                            parameter_class=CompleteTimeStatistics,
                            setpoints=(self.counter_axis,),
                            vals=Arrays(shape=(self.samples_number.get_latest,))
                            )
 
+        self.add_parameter(name='timestats_local',
+                           parameter_class=TimeStatistics,
+                           from_time_array=True)
+
         self.connect_message()
+
+    def fetch_array(self, count: int) -> np.ndarray:
+        """
+        Fetches the next ``count`` results of the running measurement in the
+        current ``data_format``. The counter answers once enough results
+        are available, so the VISA timeout has to cover their acquisition.
+
+        Args:
+            count: Number of results to fetch
+
+        Returns:
+            np.ndarray: Array of results
+        """
+        if self.data_format.get_latest() == 'REAL':
+            return self.visa_handle.query_binary_values(
+                f'FETCh:ARRay? {count}', datatype='d', is_big_endian=True,
+                container=np.array)
+        data_str = self.ask(f'FETCh:ARRay? {count}')
+        return np.array(data_str.rstrip().split(','), dtype=np.float64)
+
+    def read_time_array(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Measures ``samples_number`` time intervals and reads them out in
+        chunks of ``chunk_size`` while the counter keeps acquiring.
+
+        Args:
+            out (optional): Preallocated float64 array receiving the data.
+                Its length sets the number of samples if given.
+
+        Returns:
+            np.ndarray: Array of switching times
+        """
+        if out is None:
+            out = np.empty(int(self.samples_number.get_latest()))
+        npts = len(out)
+        chunk_size = self.chunk_size.get()
+        self.write(f'CALCulate:AVERage:STATe 0;:ARM:COUN {npts};:INIT')
+        for start in range(0, npts, chunk_size):
+            count = min(chunk_size, npts - start)
+            data = self.fetch_array(count)
+            if len(data) != count:
+                raise RuntimeError(f'Expected {count} results, '
+                                   f'received {len(data)}.')
+            out[start:start + count] = data
+        return out
+
+    @staticmethod
+    def statistics(data: np.ndarray) -> Tuple[float, float, float, float]:
+        """
+        Computes the statistics of a time array like
+        ``CALCulate:AVERage:ALL?`` does on the counter.
+
+        Args:
+            data: Array of measured times
+
+        Returns:
+            Tuple: Mean, standard deviation, min and max value
+        """
+        data = np.asarray(data)
+        return (float(data.mean()), float(data.std(ddof=1)),
+                float(data.min()), float(data.max()))
@@ -57,9 +57,11 @@ class Keithley_2000_Scan_Channel(InstrumentChannel):
         Returns: Measurement result
 
         """
-        if self.dmm.active_terminal.get() == 'REAR':
-            self.write(f"SENS:FUNC '{quantity}', (@{self.channel:d})")
-            self.write(f"ROUT:CLOS (@{self.channel:d})")
-            return self.ask("READ?")
+        if self.dmm.active_terminal.cache.get() == 'REAR':
+            # the function of this channel may differ from the one of a configured scan
+            self.dmm._scan_config = None
+            # function, relay and reading in a single round trip
+            return self.ask(f"SENS:FUNC '{quantity}', (@{self.channel:d});"
+                            f":ROUT:CLOS (@{self.channel:d});:READ?")
         else:
             raise RuntimeError("Front terminal is active instead of rear terminal.")
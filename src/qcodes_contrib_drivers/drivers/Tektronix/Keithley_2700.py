@@ -23,8 +23,11 @@
 # Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
 
 import logging
+import time
 from functools import partial
 
+import numpy as np
+
 from qcodes.instrument.visa import VisaInstrument
 from qcodes.utils.validators import Strings as StringValidator
 from qcodes.utils.validators import Ints as IntsValidator
@@ -86,6 +89,8 @@ class Keithley_2700(VisaInstrument):
         # self._change_autozero = change_autozero
         self._averaging_types = ['MOV', 'REP']
         self._trigger_sent = False
+        # number of readings of the armed burst, None if no burst is armed
+        self._burst_points = None
 
         # Add parameters to wrapper
         self.add_parameter('mode',
@@ -345,6 +350,152 @@ class Keithley_2700(VisaInstrument):
         string = ':%s:%s?' % (mode, par, )
         return string
 
+    # --------------------------------------
+    #           burst acquisition
+    # --------------------------------------
+
+    def arm_burst(self, npts, nplc=None, autozero=None):
+        '''
+        Configure the reading buffer for a burst of readings, taken as fast
+        as the integration time allows once started with start_burst.
+
+        Readings and relative timestamps are transferred in binary
+        (single precision, little-endian) until finish_burst is called.
+
+        Input:
+            npts (int) : number of readings (at most 55000)
+            nplc (float) : integration time, unchanged if None
+            autozero (bool) : autozero state, unchanged if None
+
+        Output:
+            None
+        '''
+        npts = int(npts)
+        if not 1 <= npts <= 55000:
+            raise ValueError('npts must be between 1 and 55000, not %d' % npts)
+        if nplc is not None:
+            self.nplc.set(nplc)
+        commands = [':ABOR', ':INIT:CONT OFF', ':TRIG:SOUR IMM',
+                    ':TRIG:COUN 1', ':SAMP:COUN %d' % npts,
+                    ':TRAC:CLE', ':TRAC:POIN %d' % npts, ':TRAC:FEED SENS',
+                    ':TRAC:FEED:CONT NEXT', ':FORM:ELEM READ,TST',
+                    ':FORM:DATA SREAL', ':FORM:BORD SWAP']
+        if autozero is not None:
+            commands.append(':SYST:AZER:STAT %s' % bool_to_str(autozero))
+        self.write(';'.join(commands))
+        self._burst_points = npts
+
+    def start_burst(self):
+        '''
+        Start the armed burst, returns immediately.
+        '''
+        if self._burst_points is None:
+            raise RuntimeError('No burst armed, call arm_burst first')
+        self.write(':INIT')
+
+    def burst_count(self):
+        '''
+        Number of readings stored in the buffer so far.
+        '''
+        return int(self.ask(':TRAC:POIN:ACT?'))
+
+    def fetch_burst(self, start=None, count=None):
+        '''
+        Read readings of the burst from the buffer.
+
+        Input:
+            start (int) : zero-based index of the first reading, all
+                readings if None
+            count (int) : number of readings from start
+
+        Output:
+            timestamps, readings (np.ndarray, np.ndarray) : timestamps in
+                seconds relative to the start of the burst and the readings
+        '''
+        if start is None:
+            if self._burst_points is None:
+                raise RuntimeError('No burst armed, call arm_burst first')
+            query = ':TRAC:DATA?'
+            count = self._burst_points
+        else:
+            query = ':TRAC:DATA:SEL? %d,%d' % (start, count)
+        # the binary block has the indefinite '#0' header, so the number of
+        # values (reading and timestamp per point) must be given to read
+        # the exact byte count instead of stopping at a newline byte
+        data = self.visa_handle.query_binary_values(
+            query, datatype='f', is_big_endian=False, container=np.array,
+            data_points=2 * count, expect_termination=True)
+        if len(data) != 2 * count:
+            raise ValueError('Expected %d values from %s, got %d' %
+                             (2 * count, query, len(data)))
+        # FORM:ELEM READ,TST interleaves reading and timestamp
+        data = data.reshape(-1, 2)
+        return data[:, 1].astype(float), data[:, 0].astype(float)
+
+    def finish_burst(self):
+        '''
+        Return to ASCII readings without timestamps, as expected by the
+        other parameters, and restore continuous triggering if it was on.
+        '''
+        commands = [':ABOR', ':TRAC:FEED:CONT NEV', ':FORM:DATA ASC',
+                    ':FORM:ELEM READ']
+        if self.trigger_continuous.get_latest():
+            commands.append(':INIT:CONT ON')
+        self.write(';'.join(commands))
+        self._burst_points = None
+
+    def burst(self, npts, nplc=None, chunk_size=None, callback=None,
+              poll_interval=0.05, timeout=None):
+        '''
+        Acquire npts readings into the reading buffer and transfer them
+        in binary.
+
+        Input:
+            npts (int) : number of readings (at most 55000)
+            nplc (float) : integration time, unchanged if None
+            chunk_size (int) : if given, readings are transferred in chunks
+                of at least this size while the buffer fills, otherwise all
+                at once when the burst is complete
+            callback (callable) : called with (timestamps, readings) of
+                every transferred chunk
+            poll_interval (float) : time between polls of the buffer count
+            timeout (float) : maximum duration of the burst in seconds
+
+        Output:
+            timestamps, readings (np.ndarray, np.ndarray)
+        '''
+        self.arm_burst(npts, nplc=nplc)
+        timestamps = np.empty(npts)
+        readings = np.empty(npts)
+        fetched = 0
+        t0 = time.perf_counter()
+        try:
+            self.start_burst()
+            while fetched < npts:
+                available = self.burst_count()
+                if available == npts and chunk_size is None:
+                    chunk = self.fetch_burst()
+                elif (chunk_size is not None and
+                      available - fetched >= min(chunk_size, npts - fetched)):
+                    chunk = self.fetch_burst(fetched, available - fetched)
+                else:
+                    if timeout is not None and \
+                            time.perf_counter() - t0 > timeout:
+                        raise TimeoutError('Burst of %d readings not done '
+                                           'after %g s (%d readings)' %
+                                           (npts, timeout, available))
+                    time.sleep(poll_interval)
+                    continue
+                n = len(chunk[0])
+                timestamps[fetched:fetched + n] = chunk[0]
+                readings[fetched:fetched + n] = chunk[1]
+                fetched += n
+                if callback is not None:
+                    callback(*chunk)
+        finally:
+            self.finish_burst()
+        return timestamps, readings
+
     def reset(self):
         '''
         Resets instrument to default values
@@ -1,8 +1,9 @@
 # Qcodes driver Keithley 6430 SMU
 # Based on QtLab legacy driver
 # https://github.com/qdev-dk/qtlab/blob/master/instrument_plugins/Keithley_6430.py
-from typing import List, Tuple
+from typing import List, Optional, Sequence, Tuple
 
+import numpy as np
 from qcodes.instrument.visa import VisaInstrument
 from qcodes.utils.validators import Ints, Numbers, Bool, Strings, Enum
 from qcodes.utils.helpers import create_on_off_val_mapping
@@ -14,6 +15,10 @@ log = logging.getLogger(__name__)
 
 on_off_vals = create_on_off_val_mapping(on_val=1, off_val=0)
 
+#: Maximum number of points of a source sweep and of a source list
+MAX_SWEEP_POINTS = 2500
+MAX_LIST_POINTS = 100
+
 
 class Keithley_6430(VisaInstrument):
 
@@ -146,7 +151,7 @@ class Keithley_6430(VisaInstrument):
                            )
         self.add_parameter('output_auto_off_enabled',
                            set_cmd=':SOUR:CLE:AUTO {}',
-                           get_cmd='OUTP?',
+                           get_cmd=':SOUR:CLE:AUTO?',
                            val_mapping=on_off_vals,
                            )
         self.add_parameter('source_mode',
@@ -163,7 +168,8 @@ class Keithley_6430(VisaInstrument):
                            docstring="Sensing mode."
                                      "Set to 'VOLT:DC', "
                                      "'CURR:DC', or 'RES', or a combination "
-                                     "thereof by using comma.",
+                                     "thereof by using comma. Reads of the "
+                                     "sense parameters use the cached value.",
                            )
         self.add_parameter('sense_autorange',
                            set_cmd=self._set_sense_autorange,
@@ -219,6 +225,7 @@ class Keithley_6430(VisaInstrument):
         self.add_parameter('trigger_count',
                            set_cmd=':TRIG:COUN {}',
                            get_cmd=':TRIG:COUN?',
+                           get_parser=int,
                            vals=Ints(),
                            docstring="How many times to trigger.",
                            )
@@ -300,6 +307,8 @@ class Keithley_6430(VisaInstrument):
                                      " in the moving average filter.",
                            )
 
+        self._sweep_points: Optional[int] = None
+
         self.connect_message()
 
         if reset:
@@ -318,17 +327,156 @@ class Keithley_6430(VisaInstrument):
         Returns:
             tuple of (voltage (V), current (A), resistance (Ohm))
         """
-        if not (self.output_enabled() or self.output_auto_off_enabled()):
+        self._check_output()
+        s = self.ask(':READ?')
+        logging.debug(f'Read: {s}')
+
+        v, i, r = [float(n) for n in s.split(',')][:3]
+        return v, i, r
+
+    def _check_output(self) -> None:
+        """
+        Raise if the source is neither on nor switched on automatically.
+        The cached output state is used, so that repeated reads do not add
+        any queries.
+        """
+        if not (self.output_enabled.cache.get()
+                or self.output_auto_off_enabled.cache.get()):
             raise Exception(
                     "Either source must be turned on manually or "
                     "``output_auto_off_enabled`` has to be enabled before "
                     "measuring a sense parameter."
                     )
-        s = self.ask(':READ?')
-        logging.debug(f'Read: {s}')
 
-        v, i, r = [float(n) for n in s.split(',')][:3]
-        return v, i, r
+    def configure_sweep(self, start: float, stop: float, points: int,
+                        spacing: str = 'LIN',
+                        mode: Optional[str] = None) -> None:
+        """
+        Configure a staircase sweep of the source, performed by the
+        instrument on the next ``read_sweep``.
+
+        Args:
+            start: First source level, in V or A.
+            stop: Last source level, in V or A.
+            points: Number of source-measure points.
+            spacing: 'LIN' or 'LOG' spacing of the source levels.
+            mode: 'VOLT' or 'CURR'. Defaults to the current ``source_mode``.
+        """
+        Ints(2, MAX_SWEEP_POINTS).validate(points)
+        Enum('LIN', 'LOG').validate(spacing)
+        mode = self._sweep_mode(mode)
+        self.write(f':SOUR:{mode}:STAR {start:.6e};'
+                   f':SOUR:{mode}:STOP {stop:.6e};'
+                   f':SOUR:SWE:POIN {points};'
+                   f':SOUR:SWE:SPAC {spacing};'
+                   f':SOUR:{mode}:MODE SWE;'
+                   f':TRIG:COUN {points};'
+                   f':FORM:ELEM VOLT,CURR,RES')
+        self._sweep_configured(points)
+
+    def configure_list(self, values: Sequence[float],
+                       mode: Optional[str] = None) -> None:
+        """
+        Configure the source to step through an arbitrary list of levels,
+        performed by the instrument on the next ``read_sweep``.
+
+        Args:
+            values: Source levels, in V or A.
+            mode: 'VOLT' or 'CURR'. Defaults to the current ``source_mode``.
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        if not 1 <= len(values) <= MAX_LIST_POINTS:
+            raise ValueError(f'A source list holds 1 to {MAX_LIST_POINTS} '
+                             f'points, got {len(values)}.')
+        mode = self._sweep_mode(mode)
+        levels = ','.join(f'{v:.6e}' for v in values)
+        self.write(f':SOUR:LIST:{mode} {levels};'
+                   f':SOUR:{mode}:MODE LIST;'
+                   f':TRIG:COUN {len(values)};'
+                   f':FORM:ELEM VOLT,CURR,RES')
+        self._sweep_configured(len(values))
+
+    def _sweep_mode(self, mode: Optional[str]) -> str:
+        if mode is None:
+            mode = self.source_mode.cache.get()
+        Enum('VOLT', 'CURR').validate(mode)
+        return mode
+
+    def _sweep_configured(self, points: int) -> None:
+        self._sweep_points = points
+        self.trigger_count.cache.set(points)
+
+    def read_sweep(self, timeout: Optional[float] = None
+                   ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Run the configured sweep or list and read the whole curve in a
+        single transfer. Resistances are only valid if 'RES' is part of
+        ``sense_mode``.
+
+        Args:
+            timeout: VISA timeout for the acquisition in seconds. Defaults
+                to the present timeout, which must cover the whole sweep.
+        Returns:
+            tuple of arrays (voltage (V), current (A), resistance (Ohm))
+        """
+        if self._sweep_points is None:
+            raise RuntimeError('No sweep configured, call configure_sweep '
+                               'or configure_list first.')
+        self._check_output()
+        if timeout is None:
+            s = self.ask(':READ?')
+        else:
+            with self.timeout.set_to(timeout):
+                s = self.ask(':READ?')
+        data = np.array(s.split(','), dtype=float)
+        if len(data) % self._sweep_points:
+            raise ValueError(f'Got {len(data)} values for a sweep of '
+                             f'{self._sweep_points} points.')
+        data = data.reshape(self._sweep_points, -1)
+        return data[:, 0], data[:, 1], data[:, 2]
+
+    def finish_sweep(self) -> None:
+        """
+        Return the source to a fixed level and the trigger count to one.
+        """
+        mode = self.source_mode.cache.get()
+        self.write(f':SOUR:{mode}:MODE FIX;:TRIG:COUN 1')
+        self._sweep_configured(1)
+        self._sweep_points = None
+
+    def sweep(self, start: float, stop: float, points: int,
+              spacing: str = 'LIN', mode: Optional[str] = None,
+              timeout: Optional[float] = None
+              ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Acquire an IV curve with a sweep of the source performed by the
+        instrument. See ``configure_sweep`` and ``read_sweep``.
+
+        Returns:
+            tuple of arrays (voltage (V), current (A), resistance (Ohm))
+        """
+        self.configure_sweep(start, stop, points, spacing, mode)
+        try:
+            return self.read_sweep(timeout)
+        finally:
+            self.finish_sweep()
+
+    def list_sweep(self, values: Sequence[float],
+                   mode: Optional[str] = None,
+                   timeout: Optional[float] = None
+                   ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Acquire an IV curve at arbitrary source levels performed by the
+        instrument. See ``configure_list`` and ``read_sweep``.
+
+        Returns:
+            tuple of arrays (voltage (V), current (A), resistance (Ohm))
+        """
+        self.configure_list(values, mode)
+        try:
+            return self.read_sweep(timeout)
+        finally:
+            self.finish_sweep()
 
     def _read_value(self, quantity: str) -> float:
         """
@@ -340,7 +488,7 @@ class Keithley_6430(VisaInstrument):
         Returns:
             Measured value of the requested quantity.
         """
-        mode_now = self.sense_mode()
+        mode_now = self.sense_mode.cache.get()
         if quantity not in mode_now:
             warnings.warn(f"{self.short_name} tried reading {quantity}, but "
                           f"mode is set to {mode_now}. Value might be out of "
@@ -376,10 +524,7 @@ class Keithley_6430(VisaInstrument):
 
         modes_str = '"' + '","'.join(modes) + '"'
 
-        string = f':SENS:FUNC {modes_str}'
-
-        self.write(':SENS:FUNC:OFF:ALL')
-        self.write(string)
+        self.write(f':SENS:FUNC:OFF:ALL;:SENS:FUNC {modes_str}')
 
     def _get_sense_mode(self) -> str:
         """
@@ -402,15 +547,13 @@ class Keithley_6430(VisaInstrument):
         Switch sense_autorange on or off for all modes.
         """
         n = int(val)
-        self.write(f'SENS:CURR:RANG:AUTO {n}')
-        self.write(f'SENS:VOLT:RANG:AUTO {n}')
-        self.write(f'SENS:RES:RANG:AUTO {n}')
+        self.write(f':SENS:CURR:RANG:AUTO {n};:SENS:VOLT:RANG:AUTO {n};'
+                   f':SENS:RES:RANG:AUTO {n}')
 
     def _get_sense_autorange(self) -> bool:
         """
         Get status of sense_autorange. Returns true iff true for all modes
         """
-        reply0 = bool(int(self.ask('SENS:CURR:RANG:AUTO?')))
-        reply1 = bool(int(self.ask('SENS:VOLT:RANG:AUTO?')))
-        reply2 = bool(int(self.ask('SENS:RES:RANG:AUTO?')))
-        return reply0 and reply1 and reply2
+        replies = self.ask(':SENS:CURR:RANG:AUTO?;:SENS:VOLT:RANG:AUTO?;'
+                           ':SENS:RES:RANG:AUTO?')
+        return all(bool(int(r)) for r in replies.split(';'))
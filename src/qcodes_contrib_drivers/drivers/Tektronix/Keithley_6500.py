@@ -1,3 +1,6 @@
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
 from qcodes.instrument.visa import VisaInstrument
 from qcodes.instrument import InstrumentChannel
 from qcodes.utils.validators import Numbers
@@ -74,9 +77,13 @@ class Keithley_6500(VisaInstrument):
     """
     This is the qcodes driver for a Keithley DMM6500 digital multimeter.
     """
+    # allowance for switching the scanner card relay before each reading, in seconds
+    _scan_switch_time = 0.05
+
     def __init__(self, name: str,
                  address: str,
                  terminator="\n",
+                 terminal_cache_age: float = 5.0,
                  **kwargs):
         """
         Initialize instance of digital multimeter Keithley6500. Check if scanner card is inserted.
@@ -84,9 +91,15 @@ class Keithley_6500(VisaInstrument):
             name: Name of instrument
             address: Address of instrument
             terminator: Termination character for SCPI commands
+            terminal_cache_age: Seconds for which the active terminal is not queried again before a
+                measurement. The terminal can only be switched on the front panel.
             **kwargs: Keyword arguments to pass to __init__ function of VisaInstrument class
         """
         super().__init__(name, address, terminator=terminator, **kwargs)
+        # channels, quantity and scan count of the configured hardware scan
+        self._scan_config: Optional[Tuple[Tuple[int, ...], str, int]] = None
+        # upper estimate of the duration of the configured scan in seconds
+        self._scan_duration = 0.0
         for quantity in ['VOLT', 'CURR', 'RES', 'FRES', 'TEMP']:
             channel = Keithley_Sense(self, quantity.lower(), quantity)
             self.add_submodule(quantity.lower(), channel)
@@ -94,6 +107,7 @@ class Keithley_6500(VisaInstrument):
         self.add_parameter('active_terminal',
                            label='active terminal',
                            get_cmd="ROUTe:TERMinals?",
+                           max_val_age=terminal_cache_age,
                            docstring="Active terminal of instrument. Can only be switched via knob on front panel.")
 
         self.add_parameter('resistance',
@@ -156,7 +170,72 @@ class Keithley_6500(VisaInstrument):
         Returns: Measurement result
 
         """
-        if self.active_terminal.get() == 'FRON':
+        if self.active_terminal.cache.get() == 'FRON':
             return self.ask(f"MEAS:{quantity}?")
         else:
             raise RuntimeError("Rear terminal is active instead of front terminal.")
+
+    def configure_scan(self, channels: Sequence[int], quantity: str = 'VOLT', scan_count: int = 1,
+                       interval: Optional[float] = None, nplc: Optional[float] = None) -> None:
+        """
+        Set up a hardware scan over channels of the scanner card. The measurement function, the scan
+        list and the scan count are sent once, the readings are then taken with `read_scan`.
+        Args:
+            channels: Channel numbers of the scanner card, in scan order
+            quantity: Quantity to be measured on all channels (e.g. 'VOLT', 'RES')
+            scan_count: Number of scans through the channel list per `read_scan`
+            interval: Time between the starts of two scans in seconds, as fast as possible if None
+            nplc: Integration rate (Number of Power Line Cycles) of the scanned channels, the
+                duration of the scan is estimated for the longest integration if None
+        """
+        quantity = quantity.upper()
+        valid_quantities = ['VOLT', 'CURR', 'RES', 'FRES', 'TEMP']
+        if quantity not in valid_quantities:
+            raise ValueError(f"Quantity must be one of the following: {', '.join(valid_quantities)}")
+        channels = tuple(int(ch) for ch in channels)
+        if not channels:
+            raise ValueError("No channels to scan.")
+        if self.active_terminal.cache.get() != 'REAR':
+            raise RuntimeError("Front terminal is active instead of rear terminal.")
+        ch_list = ','.join(str(ch) for ch in channels)
+        self.write(f"SENS:FUNC '{quantity}', (@{ch_list})")
+        if nplc is not None:
+            self.write(f"SENS:{quantity}:NPLC {nplc:.4f}, (@{ch_list})")
+        self.write(f"ROUT:SCAN:CRE (@{ch_list})")
+        self.write(f"ROUT:SCAN:COUN:SCAN {int(scan_count):d}")
+        if interval is not None:
+            self.write(f"ROUT:SCAN:INT {interval}")
+        self.write(f'TRAC:POIN {max(len(channels) * int(scan_count), 10):d}, "defbuffer1"')
+        self._scan_config = (channels, quantity, int(scan_count))
+        reading_time = (12 if nplc is None else nplc) / 50 + self._scan_switch_time
+        self._scan_duration = int(scan_count) * max(interval or 0, len(channels) * reading_time)
+
+    def read_scan(self) -> np.ndarray:
+        """
+        Run the configured hardware scan and read the whole reading buffer in one transfer. The
+        VISA timeout is extended by the estimated duration of the scan for the transfer.
+        Returns: Readings with shape (scan count, number of channels)
+        """
+        if self._scan_config is None:
+            raise RuntimeError("No scan configured, call configure_scan first.")
+        channels, _, scan_count = self._scan_config
+        n_readings = len(channels) * scan_count
+        timeout = self.timeout()
+        if timeout is not None:
+            timeout += self._scan_duration
+        with self.timeout.set_to(timeout):
+            response = self.ask(f'TRAC:CLE "defbuffer1";:INIT;*WAI;'
+                                f':TRAC:DATA? 1, {n_readings:d}, "defbuffer1", READ')
+        readings = np.array(response.split(','), dtype=float)
+        return readings.reshape(scan_count, len(channels))
+
+    def scan(self, channels: Sequence[int], quantity: str = 'VOLT', scan_count: int = 1) -> np.ndarray:
+        """
+        Measure `quantity` on `channels` with a hardware scan. The scan is only configured again if
+        channels, quantity or scan count differ from the previous scan.
+        Returns: Readings with shape (scan count, number of channels)
+        """
+        config = (tuple(int(ch) for ch in channels), quantity.upper(), int(scan_count))
+        if config != self._scan_config:
+            self.configure_scan(*config)
+        return self.read_scan()
@@ -1,3 +1,4 @@
+from concurrent.futures import Future
 import enum
 from typing import Tuple, Optional
 
@@ -32,6 +33,8 @@ class Thorlabs_K10CR1(Instrument):
         serial_number (optional): Serial number of the device.
         device_id (optional): Device id from APT discovery.
         dll_path (optional): Path of the APT.dll
+        apt (optional): APT server to use, e.g. the one of another Thorlabs instrument.
+            Devices sharing a server share its lock and its motion polling thread.
 
     Attributes:
         apt: Thorlabs APT server.
@@ -41,11 +44,12 @@ class Thorlabs_K10CR1(Instrument):
     """
 
     def __init__(self, name: str, *, serial_number: int = None,
-                 device_id: int = 0, dll_path: str = None, **kwargs):
+                 device_id: int = 0, dll_path: str = None,
+                 apt: Optional["Thorlabs_APT"] = None, **kwargs):
         super().__init__(name, **kwargs)
 
         # Save APT server reference
-        self.apt = Thorlabs_APT(dll_path)
+        self.apt = apt if apt is not None else Thorlabs_APT(dll_path)
 
         # Store serial number
         if serial_number is None:
@@ -174,11 +178,41 @@ class Thorlabs_K10CR1(Instrument):
         return {"vendor": "Thorlabs", "model": self.model,
                 "firmware": self.version, "serial": self.serial_number}
 
+    def move_to(self, position: float) -> Future:
+        """Starts moving to `position` without blocking.
+
+        Moves of several devices started this way run at the same time. While moving, `position`
+        returns the value of the last status poll.
+
+        Returns:
+            Future resolved with the final position once the motion has finished.
+        """
+        self.position.validate(position)
+        future = self.apt.motion.move_absolute(self.serial_number, position)
+        future.add_done_callback(self._update_position_cache)
+        return future
+
+    def home(self) -> Future:
+        """Starts moving home without blocking.
+
+        Returns:
+            Future resolved with the final position once homing has finished.
+        """
+        future = self.apt.motion.move_home(self.serial_number)
+        future.add_done_callback(self._update_position_cache)
+        return future
+
+    def _update_position_cache(self, future: Future) -> None:
+        if future.exception() is None:
+            self.position.cache.set(future.result())
+
     def _get_position(self) -> float:
-        return self.apt.mot_get_position(self.serial_number)
+        return self.apt.motion.position(self.serial_number)
 
     def _set_position(self, position: float):
-        self.apt.mot_move_absolute_ex(self.serial_number, position, True)
+        # wait on the motion layer instead of a blocking DLL call, which
+        # would hold the server lock for the whole move
+        self.move_to(position).result()
 
     def _set_position_async(self, position: float):
         self.apt.mot_move_absolute_ex(self.serial_number, position, False)
@@ -279,7 +313,7 @@ class Thorlabs_K10CR1(Instrument):
         self.apt.disable_hw_channel(self.serial_number)
 
     def _move_home(self):
-        self.apt.mot_move_home(self.serial_number, True)
+        self.home().result()
 
     def _move_home_async(self):
         self.apt.mot_move_home(self.serial_number, False)
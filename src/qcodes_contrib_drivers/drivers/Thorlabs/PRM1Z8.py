@@ -1,3 +1,6 @@
+from concurrent.futures import Future
+from typing import Optional
+
 from qcodes import Instrument
 from .private.APT import Thorlabs_APT, ThorlabsHWType
 
@@ -15,6 +18,8 @@ class Thorlabs_PRM1Z8(Instrument):
         serial_number (optional): Serial number of the device.
         device_id (optional): Device id from APT discovery.
         dll_path (optional): Path of the APT.dll
+        apt (optional): APT server to use, e.g. the one of another Thorlabs instrument.
+            Devices sharing a server share its lock and its motion polling thread.
 
     Attributes:
         apt: Thorlabs APT server.
@@ -24,11 +29,12 @@ class Thorlabs_PRM1Z8(Instrument):
     """
 
     def __init__(self, name: str, *, serial_number: int = None,
-                 device_id: int = 0, dll_path: str = None, **kwargs):
+                 device_id: int = 0, dll_path: str = None,
+                 apt: Optional["Thorlabs_APT"] = None, **kwargs):
         super().__init__(name, **kwargs)
 
         # save APT server link
-        self.apt = apt
+        self.apt = apt if apt is not None else Thorlabs_APT(dll_path)
 
         # Store serial number
         if serial_number is None:
@@ -62,9 +68,28 @@ class Thorlabs_PRM1Z8(Instrument):
         return {'vendor': 'Thorlabs', 'model': self.model,
                 'firmware': self.version, 'serial': self.serial_number}
 
+    def move_to(self, position: float) -> Future:
+        """Starts moving to `position` without blocking.
+
+        Moves of several devices started this way run at the same time. While moving, `position`
+        returns the value of the last status poll.
+
+        Returns:
+            Future resolved with the final position once the motion has finished.
+        """
+        future = self.apt.motion.move_absolute(self.serial_number, position)
+        future.add_done_callback(self._update_position_cache)
+        return future
+
+    def _update_position_cache(self, future: Future) -> None:
+        if future.exception() is None:
+            self.position.cache.set(future.result())
+
     def _get_position(self):
-        return self.apt.mot_get_position(self.serial_number)
+        return self.apt.motion.position(self.serial_number)
 
     # set methods
     def _set_position(self, position):
-        self.apt.mot_move_absolute_ex(self.serial_number, position, True)
+        # wait on the motion layer instead of a blocking DLL call, which
+        # would hold the server lock for the whole move
+        self.move_to(position).result()
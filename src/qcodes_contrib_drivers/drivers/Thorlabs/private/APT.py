@@ -1,11 +1,14 @@
+from concurrent.futures import Future
 import ctypes
-from typing import List, Optional, Tuple, Union
+from typing import Callable, Dict, List, Mapping, Optional, Tuple, Union
 import enum
 import logging
+import threading
+import time
 
 from .apt_error_codes import APT_ERROR_CODES
 
-__all__ = ["ThorlabsHWType", "ThorlabsException", "Thorlabs_APT"]
+__all__ = ["ThorlabsHWType", "ThorlabsException", "Thorlabs_APT", "ThorlabsAPTMotion"]
 
 
 class ThorlabsHWType(enum.IntEnum):
@@ -78,6 +81,18 @@ class Thorlabs_APT:
         # Create sets to save initialized and closed devices
         self._hw_devices = set()
         self._closed_hw_devices = set()
+
+        # Serializes all calls into the DLL, from the callers of every device sharing this server
+        # and from the motion polling thread
+        self.lock = threading.RLock()
+        self._motion: Optional["ThorlabsAPTMotion"] = None
+
+    @property
+    def motion(self) -> "ThorlabsAPTMotion":
+        """Non-blocking motion layer shared by all devices of this APT server"""
+        if self._motion is None:
+            self._motion = ThorlabsAPTMotion(self)
+        return self._motion
     
     def __del__(self):
         """Destruct object"""
@@ -104,45 +119,56 @@ class Thorlabs_APT:
                 raise ThorlabsException("{}: Unknown code: {}".format(function_name, code))
 
     def check_server_initialized(func: callable) -> callable:
-        """Decorator that automatically initializes the APT server if not done yet."""
+        """Decorator that automatically initializes the APT server if not done yet. The call
+        holds the server lock."""
         def wrapper(self, *args, **kwargs):
-            if not self._initialized:
-                self.apt_init()
-                self.enable_event_dlg(False)  # Disable event dialog by default
-            return func(self, *args, **kwargs)
+            with self.lock:
+                if not self._initialized:
+                    self.apt_init()
+                    self.enable_event_dlg(False)  # Disable event dialog by default
+                return func(self, *args, **kwargs)
         return wrapper
 
     def check_device_initialized(func: callable) -> callable:
-        """Decorator checking if the device is initialized before calling the function."""
+        """Decorator checking if the device is initialized before calling the function. The call
+        holds the server lock."""
         def wrapper(self, serial_number, *args, **kwargs):
-            if serial_number not in self._hw_devices:
-                raise ThorlabsException("Device has not been initialized." +
-                    "'init_hw_device' must be called before using the device.")
-            return func(self, serial_number, *args, **kwargs)
+            with self.lock:
+                if serial_number not in self._hw_devices:
+                    raise ThorlabsException("Device has not been initialized." +
+                        "'init_hw_device' must be called before using the device.")
+                return func(self, serial_number, *args, **kwargs)
         return wrapper
 
     def apt_init(self) -> None:
         """Initialization of APT.dll"""
-        if not self._initialized:
-            code = self.dll.APTInit()
-            self.error_check(code, 'APTInit')
+        with self.lock:
+            if not self._initialized:
+                code = self.dll.APTInit()
+                self.error_check(code, 'APTInit')
 
-            # Mark as initialized
-            self._initialized = True
+                # Mark as initialized
+                self._initialized = True
 
     def apt_clean_up(self) -> None:
         """Cleans up the resources of APT.dll"""
-        if self._initialized:
-            code = self.dll.APTCleanUp()
-            self.error_check(code, 'APTCleanUp')
+        # The polling thread takes the lock, so stop it before taking the lock ourselves
+        if self._motion is not None:
+            self._motion.shutdown()
+            self._motion = None
 
-            # Mark as closed
-            self._initialized = False
+        with self.lock:
+            if self._initialized:
+                code = self.dll.APTCleanUp()
+                self.error_check(code, 'APTCleanUp')
 
-        # Remove open devices as well as closed devices since both cannot be
-        # re-used anymore.
-        self._hw_devices.clear()
-        self._closed_hw_devices.clear()
+                # Mark as closed
+                self._initialized = False
+
+            # Remove open devices as well as closed devices since both cannot be
+            # re-used anymore.
+            self._hw_devices.clear()
+            self._closed_hw_devices.clear()
 
     @check_server_initialized
     def list_available_devices(self, hw_type: Union[int, ThorlabsHWType, None] = None) \
@@ -280,13 +306,15 @@ class Thorlabs_APT:
         Args:
             serial_number: Serial number of the device to close.
         """
-        if serial_number in self._hw_devices:
-            # Device already initialized
-            self._hw_devices.remove(serial_number)
-            self._closed_hw_devices.add(serial_number)
-        
+        with self.lock:
+            if serial_number in self._hw_devices:
+                # Device already initialized
+                self._hw_devices.remove(serial_number)
+                self._closed_hw_devices.add(serial_number)
+            last_device = not self._hw_devices
+
         # If this is the last device that was closed, close the APT server too
-        if not self._hw_devices:
+        if last_device:
             # Clean up APT server
             self.apt_clean_up()
 
@@ -511,3 +539,210 @@ class Thorlabs_APT:
         code = self.dll.MOT_SetHomeParams(c_serial_number,
                                           c_direction, c_lim_switch, c_velocity, c_zero_offset)
         self.error_check(code, 'MOT_SetHomeParams')
+
+
+class ThorlabsAPTMotion:
+    """Non-blocking motion layer on top of the APT server.
+
+    Moves are started without waiting (``wait=False``) and return a ``Future``, so that several
+    devices can move at the same time. A single thread polls the status bits of all moving devices
+    and resolves the futures once the motion has finished. The poll interval starts at
+    `min_interval` whenever a move is issued or completes and grows up to `max_interval` while
+    nothing changes. Positions read during a motion are served from the values read by the
+    polling thread. The polling thread is only started by the first move.
+
+    Args:
+        apt: APT server the devices are connected to.
+        min_interval: Shortest time between two polls in seconds.
+        max_interval: Longest time between two polls in seconds.
+        settle_time: A move which has not shown up in the status bits after this many seconds is
+                     considered to have finished immediately (e.g. a move to the current position).
+        tolerance: Position tolerance for absolute moves.
+    """
+
+    # MOT_GetStatusBits: moving cw/ccw, jogging cw/ccw and homing
+    MOVING_BITS = 0x00000010 | 0x00000020 | 0x00000040 | 0x00000080 | 0x00000200
+    HOMED_BIT = 0x00000400
+
+    def __init__(self, apt: "Thorlabs_APT", min_interval: float = 0.01,
+                 max_interval: float = 0.2, settle_time: float = 0.5,
+                 tolerance: float = 1e-3):
+        self.apt = apt
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.settle_time = settle_time
+        self.tolerance = tolerance
+
+        self._moves: Dict[int, "_APTMove"] = {}
+        self._positions: Dict[int, float] = {}
+        self._condition = threading.Condition()
+        self._running = True
+        self._thread: Optional[threading.Thread] = None
+
+    def move_absolute(self, serial_number: int, position: float) -> Future:
+        """Starts moving the motor to an absolute position.
+
+        Args:
+            serial_number: Serial number of the device.
+            position: Target position (in degrees for rotators).
+
+        Returns:
+            Future resolved with the final position.
+        """
+        return self._start(serial_number, lambda: self.apt.mot_move_absolute_ex(
+            serial_number, position, False), target=position)
+
+    def move_home(self, serial_number: int) -> Future:
+        """Starts homing the motor.
+
+        Returns:
+            Future resolved with the final position.
+        """
+        return self._start(serial_number, lambda: self.apt.mot_move_home(
+            serial_number, False), homing=True)
+
+    def move_jog(self, serial_number: int, direction: int) -> Future:
+        """Starts a jog of the motor.
+
+        Args:
+            serial_number: Serial number of the device.
+            direction: Forward (1) or reverse (2)
+
+        Returns:
+            Future resolved with the final position.
+        """
+        return self._start(serial_number, lambda: self.apt.mot_move_jog(
+            serial_number, direction, False))
+
+    def move_many(self, positions: Mapping[int, float]) -> Dict[int, Future]:
+        """Starts absolute moves on several devices at once.
+
+        Args:
+            positions: Maps serial numbers to target positions.
+
+        Returns:
+            Maps serial numbers to the futures of their moves.
+        """
+        return {serial_number: self.move_absolute(serial_number, position)
+                for serial_number, position in positions.items()}
+
+    def stop(self, serial_number: int) -> None:
+        """Stops the motor, the future of its move is resolved by the polling thread."""
+        self.apt.mot_stop_profiled(serial_number)
+        with self._condition:
+            move = self._moves.get(serial_number)
+            if move is not None:
+                move.target = None
+            self._condition.notify()
+
+    def is_moving(self, serial_number: int) -> bool:
+        with self._condition:
+            return serial_number in self._moves
+
+    def position(self, serial_number: int) -> float:
+        """Returns the position of the device, from the last poll while it is moving."""
+        with self._condition:
+            if serial_number in self._moves and serial_number in self._positions:
+                return self._positions[serial_number]
+        position = self.apt.mot_get_position(serial_number)
+        with self._condition:
+            self._positions[serial_number] = position
+        return position
+
+    def shutdown(self) -> None:
+        """Stops the polling thread, pending futures fail with a ThorlabsException."""
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        for move in self._moves.values():
+            move.future.set_exception(ThorlabsException("Motion polling was shut down"))
+        self._moves.clear()
+
+    def _start(self, serial_number: int, start: Callable[[], None],
+               target: Optional[float] = None, homing: bool = False) -> Future:
+        with self._condition:
+            if not self._running:
+                raise ThorlabsException("Motion polling was shut down")
+            previous = self._moves.pop(serial_number, None)
+        if previous is not None:
+            previous.future.set_exception(ThorlabsException("Move was superseded"))
+        future: Future = Future()
+        future.set_running_or_notify_cancel()
+        start()
+        with self._condition:
+            self._moves[serial_number] = _APTMove(future, target, homing)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._poll_loop, daemon=True,
+                                                name="thorlabs_apt_motion")
+                self._thread.start()
+            self._condition.notify()
+        return future
+
+    def _poll_loop(self) -> None:
+        interval = self.min_interval
+        while True:
+            with self._condition:
+                while self._running and not self._moves:
+                    self._condition.wait()
+                    interval = self.min_interval
+                if not self._running:
+                    return
+                moves = dict(self._moves)
+
+            finished = self._poll(moves)
+
+            with self._condition:
+                for serial_number, position in finished.items():
+                    move = self._moves.get(serial_number)
+                    if move is moves[serial_number]:
+                        del self._moves[serial_number]
+                        move.future.set_result(position)
+                # poll quickly again while things change, slow down otherwise
+                interval = self.min_interval if finished else min(2 * interval,
+                                                                  self.max_interval)
+                self._condition.wait(interval)
+
+    def _poll(self, moves: Mapping[int, "_APTMove"]) -> Dict[int, float]:
+        finished = {}
+        now = time.monotonic()
+        for serial_number, move in moves.items():
+            try:
+                # read status and position of the same instant
+                with self.apt.lock:
+                    status = self.apt.mot_get_status_bits(serial_number)
+                    position = self.apt.mot_get_position(serial_number)
+            except Exception as exc:
+                with self._condition:
+                    if self._moves.get(serial_number) is move:
+                        del self._moves[serial_number]
+                move.future.set_exception(exc)
+                continue
+            with self._condition:
+                self._positions[serial_number] = position
+
+            if status & self.MOVING_BITS:
+                move.seen_moving = True
+                continue
+            if move.homing:
+                done = bool(status & self.HOMED_BIT) and (move.seen_moving or
+                                                          now - move.started > self.settle_time)
+            elif move.target is not None and abs(position - move.target) <= self.tolerance:
+                done = True
+            else:
+                done = move.seen_moving or now - move.started > self.settle_time
+            if done:
+                finished[serial_number] = position
+        return finished
+
+
+class _APTMove:
+    """Bookkeeping of a move in progress"""
+
+    def __init__(self, future: Future, target: Optional[float], homing: bool):
+        self.future = future
+        self.target = target
+        self.homing = homing
+        self.started = time.monotonic()
+        self.seen_moving = False
@@ -0,0 +1,129 @@
+import threading
+import time
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+
+class RingBufferLogger:
+    """
+    Base class for loggers that record instrument readings in a background
+    thread.
+
+    Every ``interval`` seconds the thread calls ``record``, which subclasses
+    implement to read the instrument and pass the values to ``_store``.
+    Readings are kept in timestamped ring buffers holding the last
+    ``length`` readings. If reading falls behind the interval, missed
+    readings are skipped instead of being taken in a burst. An exception
+    raised by ``record`` stops the thread and is kept in ``error``.
+
+    Args:
+        columns: Names of the recorded values, in the order of ``_store``
+        interval: Time between readings in seconds
+        length: Number of readings kept
+        name: Name of the thread
+    """
+
+    def __init__(self, columns: Sequence[str], interval: float, length: int,
+                 name: str):
+        if interval <= 0:
+            raise ValueError('interval must be positive')
+        self.columns = tuple(columns)
+        self.interval = interval
+        self.length = length
+        self.name = name
+
+        self._buffer = np.full((length, len(self.columns)), np.nan)
+        self._timestamps = np.full(length, np.nan)
+        self._count = 0
+        self._condition = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.error: Optional[Exception] = None
+
+    def record(self) -> None:
+        """Read the instrument once and store the values with ``_store``"""
+        raise NotImplementedError
+
+    def start(self) -> None:
+        """Start recording into empty buffers"""
+        if self.running:
+            raise RuntimeError('{} is already running'.format(self.name))
+        self._buffer[:] = np.nan
+        self._timestamps[:] = np.nan
+        self._count = 0
+        self.error = None
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name=self.name)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop recording, the recorded data stays available"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def __enter__(self) -> "RingBufferLogger":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    @property
+    def count(self) -> int:
+        """Number of readings since ``start``"""
+        return self._count
+
+    def _store(self, values: Sequence[float],
+               timestamp: Optional[float] = None) -> None:
+        """
+        Store one reading, None values are stored as NaN. Threads waiting
+        on ``_condition`` are notified.
+        """
+        with self._condition:
+            index = self._count % self.length
+            self._buffer[index] = [np.nan if v is None else v for v in values]
+            self._timestamps[index] = (time.time() if timestamp is None
+                                       else timestamp)
+            self._count += 1
+            self._condition.notify_all()
+
+    def _run(self) -> None:
+        next_time = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                self.record()
+                next_time += self.interval
+                delay = next_time - time.perf_counter()
+                if delay < 0:
+                    # too slow for the requested interval, skip missed
+                    # readings
+                    next_time -= (delay // self.interval) * self.interval
+                    delay = next_time - time.perf_counter()
+                self._stop.wait(max(delay, 0))
+        except Exception as exc:
+            self.error = exc
+        finally:
+            with self._condition:
+                self._condition.notify_all()
+
+    def data(self) -> Dict[str, np.ndarray]:
+        """
+        Returns copies of the recorded readings, oldest first: the
+        "timestamp" of every reading in seconds since the epoch and the
+        values of every column.
+        """
+        with self._condition:
+            n = min(self._count, self.length)
+            order = np.arange(self._count - n, self._count) % self.length
+            result = {'timestamp': self._timestamps[order]}
+            for i, column in enumerate(self.columns):
+                result[column] = self._buffer[order, i]
+        return result
@@ -29,3 +29,36 @@ def test_freq_axis(driver):
     driver.start_freq(9000)
     driver.stop_freq(2900000000.0)
     assert (driver.freq_axis() == np.linspace(9000, 2900000000.0, 401)).all
+
+
+def test_freq_axis_uses_cache(driver, monkeypatch):
+    driver.start_freq(1e6)
+    driver.stop_freq(2e6)
+    asked = []
+    monkeypatch.setattr(driver, "ask_raw", lambda cmd: asked.append(cmd) or "0")
+    np.testing.assert_allclose(driver.freq_axis(), np.linspace(1e6, 2e6, 401))
+    assert asked == []
+
+    # center/span change start and stop on the instrument
+    monkeypatch.setattr(driver, "write_raw", lambda cmd: None)
+    driver.span(1e5)
+    driver.freq_axis()
+    assert asked == ["FA?", "FB?"]
+
+
+def test_decode_trace_bytes():
+    data = bytes(range(256)) + bytes(145)
+    expected = [(x * 32 - 8000) * 0.01 - 10 for x in data]
+    np.testing.assert_allclose(HP8594E.decode_trace_bytes(data, -10), expected)
+
+
+def test_acquire_sweeps(driver, monkeypatch):
+    written = []
+    monkeypatch.setattr(driver, "write_raw", written.append)
+    driver.reference_level(20)
+    traces = [bytes([i]) * 401 for i in range(3)]
+    monkeypatch.setattr(driver, "_read_trace_bytes", lambda: traces.pop(0))
+    data = driver.acquire_sweeps(3)
+    assert data.shape == (3, 401)
+    np.testing.assert_allclose(data[:, 0], [-60, -59.68, -59.36])
+    assert written == ["RL 20 DB", "SNGLS", "TDF B;MDS B"] + ["TS;TRA?"] * 3
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from qcodes_contrib_drivers.drivers.CopperMountain.M5180 import M5180
+
+
+@pytest.fixture(scope="function")
+def driver():
+    vna = M5180(
+        "m5180_sim",
+        "TCPIP::192.168.0.3::INSTR",
+        pyvisa_sim_file="qcodes_contrib_drivers.sims:M5180.yaml",
+    )
+    vna.visa_handle.response_delay = 0
+    yield vna
+    vna.close()
+
+
+@pytest.fixture
+def writes(driver, monkeypatch):
+    sent = []
+    write_raw = driver.write_raw
+
+    def recording_write_raw(cmd):
+        sent.append(cmd)
+        return write_raw(cmd)
+
+    monkeypatch.setattr(driver, "write_raw", recording_write_raw)
+    return sent
+
+
+@pytest.fixture
+def binary_queries(driver, monkeypatch):
+    """Serve REAL64 blocks, the simulation only handles text responses."""
+    blocks = {
+        "SENS1:FREQ:DATA?": np.array([1e9, 2e9, 3e9]),
+        **{f"CALC1:TRAC{n}:DATA:FDAT?": np.arange(6) + 10 * n
+           for n in range(1, 5)},
+    }
+    queries = []
+
+    def query_binary_values(cmd, datatype, is_big_endian, container):
+        queries.append((cmd, datatype, is_big_endian))
+        assert container is np.ndarray
+        return np.asarray(blocks[cmd], dtype=float)
+
+    monkeypatch.setattr(driver.visa_handle, "query_binary_values",
+                        query_binary_values)
+    return queries
+
+
+def test_get_s_matrix_ascii(driver):
+    freq, s = driver.get_s_matrix(binary=False)
+    np.testing.assert_allclose(freq, [1e9, 2e9, 3e9])
+    assert s.shape == (4, 3)
+    np.testing.assert_allclose(s[0], [0.1 + 0.2j, 0.3 + 0.4j, 0.5 + 0.6j])
+    np.testing.assert_allclose(s[3], [3.1 + 3.2j, 3.3 + 3.4j, 3.5 + 3.6j])
+
+
+def test_get_s_matrix_binary(driver, writes, binary_queries):
+    freq, s = driver.get_s_matrix()
+    np.testing.assert_allclose(freq, [1e9, 2e9, 3e9])
+    np.testing.assert_allclose(s[1], [20 + 21j, 22 + 23j, 24 + 25j])
+    assert all(datatype == "d" and not big_endian
+               for _, datatype, big_endian in binary_queries)
+    assert "FORM:DATA real" in writes
+    assert writes.count("FORM:BORD SWAP") == 1
+
+
+def test_configuration_is_cached(driver, writes, binary_queries):
+    driver.get_s_matrix()
+    driver.get_s_matrix()
+    assert writes.count("FORM:BORD SWAP") == 1
+    assert writes.count("FORM:DATA real") == 1
+    assert sum(cmd.startswith("CALC1:PAR:COUN") for cmd in writes) == 1
+    assert writes.count("TRIG:SEQ:SING") == 2
+
+
+def test_reset_restores_byte_order(driver, writes, binary_queries):
+    driver.get_s_matrix()
+    driver.reset()
+    driver.get_s_matrix()
+    # *RST sets FORM:BORD back to NORM, so the swap is sent again
+    assert writes.count("FORM:BORD SWAP") == 2
+    assert sum(cmd.startswith("CALC1:PAR:COUN") for cmd in writes) == 2
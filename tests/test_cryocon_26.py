@@ -0,0 +1,60 @@
+import math
+import time
+
+import numpy as np
+import pytest
+
+from qcodes_contrib_drivers.drivers.Cryocon.cryocon_26 import (
+    Cryocon26Logger, Cryocon_26)
+
+
+@pytest.fixture
+def cryocon():
+    instr = Cryocon_26(
+        'cryocon', 'GPIB::1::INSTR',
+        pyvisa_sim_file='qcodes_contrib_drivers.sims:Cryocon_26.yaml')
+    instr.visa_handle.response_delay = 0
+    instr.queries = []
+    ask_raw = instr.ask_raw
+
+    def recording_ask_raw(cmd):
+        instr.queries.append(cmd)
+        return ask_raw(cmd)
+
+    instr.ask_raw = recording_ask_raw
+    yield instr
+    instr.close()
+
+
+def test_read_inputs_single_query(cryocon):
+    temperatures = cryocon.read_inputs()
+    assert cryocon.queries == ['input? A:B:C:D']
+    assert temperatures['A'] == 4.2135
+    assert math.isnan(temperatures['B'])
+    assert cryocon.chD_temperature.cache.get(get_if_invalid=False) == 295.01
+    assert cryocon.chB_status.cache.get(get_if_invalid=False) == 'no reading'
+    assert cryocon.chC_status.cache.get(get_if_invalid=False) == \
+        'out of range'
+
+
+def test_single_input_parameters(cryocon):
+    assert cryocon.chA_temperature() == 4.2135
+    assert cryocon.chA_status() == 'ok'
+    assert cryocon.queries == ['input? A', 'input? A']
+
+
+def test_logger_ring_buffer(cryocon):
+    logger = Cryocon26Logger(cryocon, interval=0.001, length=4,
+                             channels=['A', 'D'])
+    with logger:
+        deadline = time.monotonic() + 5
+        while logger.count < 6:
+            assert time.monotonic() < deadline
+            time.sleep(0.001)
+    assert logger.error is None
+    data = logger.data()
+    assert len(data['timestamp']) == 4
+    assert np.all(np.diff(data['timestamp']) >= 0)
+    np.testing.assert_array_equal(data['A'], 4.2135)
+    np.testing.assert_array_equal(data['D'], 295.01)
+    assert all(q == 'input? A:D' for q in cryocon.queries)
@@ -0,0 +1,127 @@
+import time
+
+import numpy as np
+import pytest
+from qcodes.instrument import Instrument, VisaInstrument
+
+from qcodes_contrib_drivers.drivers.Cryogenic.CryogenicSMS120C import \
+    CryogenicSMS120C
+
+
+class FakeSMS:
+    """Ramps the output by `step` tesla per output reading."""
+
+    def __init__(self, step=0.0):
+        self.step = step
+        self.field = 0.0
+        self.target = 0.0
+        self.unit = 'TESLA'
+        self.queries = []
+
+    def ask(self, cmd):
+        self.queries.append(cmd)
+        if cmd == 'GET OUTPUT':
+            delta = self.target - self.field
+            self.field += max(-self.step, min(self.step, delta))
+            if self.unit == 'AMPS':
+                return ('12:00:00 OUTPUT: %.4f AMPS AT 0.125 VOLTS'
+                        % (self.field / 0.113375))
+            return ('12:00:00 OUTPUT: %.4f TESLA AT 0.125 VOLTS'
+                    % self.field)
+        if cmd == 'RAMP STATUS':
+            state = 'HOLDING' if self.field == self.target else 'RAMPING'
+            return '12:00:00 RAMP STATUS: %s TO 1.0 TESLA' % state
+        if cmd == 'TESLA':
+            return '12:00:00 UNITS: %s' % self.unit
+        raise AssertionError(cmd)
+
+    def flush(self, mask):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def magnet(monkeypatch):
+    fake = FakeSMS()
+
+    def fake_init(self, name, address, **kwargs):
+        Instrument.__init__(self, name)
+        self.visa_handle = fake
+
+    monkeypatch.setattr(VisaInstrument, '__init__', fake_init)
+    monkeypatch.setattr(VisaInstrument, 'ask_raw',
+                        lambda self, cmd: fake.ask(cmd))
+    monkeypatch.setattr(CryogenicSMS120C, '_command_gap', 0)
+    instr = CryogenicSMS120C('sms', 'ASRL1::INSTR')
+    instr.fake = fake
+    yield instr
+    instr.close()
+
+
+def test_output_without_telemetry(magnet):
+    magnet.fake.field = 0.5
+    assert magnet.current() == pytest.approx(0.5 / 0.113375)
+    assert magnet.voltage() == 0.125
+    assert magnet.field() == 0.5
+    assert magnet.fake.queries == ['GET OUTPUT', 'GET OUTPUT', 'TESLA',
+                                   'GET OUTPUT']
+
+
+def test_commands_spaced(magnet):
+    magnet._command_gap = 0.05
+    t0 = time.monotonic()
+    for _ in range(3):
+        magnet.voltage()
+    # the first command follows the last command of the initialization
+    assert time.monotonic() - t0 >= 0.1
+
+
+@pytest.mark.parametrize('telemetry', [False, True])
+def test_field_requires_tesla_mode(magnet, telemetry):
+    magnet.fake.unit = 'AMPS'
+    magnet.fake.field = 0.5
+    if telemetry:
+        magnet.start_telemetry(rate=1e-3, max_age=10)
+        magnet.telemetry.wait_for(lambda sample: True, timeout=5)
+    assert magnet.current() == pytest.approx(0.5 / 0.113375, rel=1e-4)
+    with pytest.raises(Exception, match='TESLA'):
+        magnet.field()
+
+
+def test_gets_served_from_telemetry(magnet):
+    magnet.fake.field = magnet.fake.target = 0.25
+    # one sample right away, the next one in 1000 s
+    magnet.start_telemetry(rate=1e-3, max_age=10)
+    magnet.wait_for_field(0.25, timeout=5)
+    n = len(magnet.fake.queries)
+    assert magnet.field() == 0.25
+    assert magnet.voltage() == 0.125
+    assert magnet.rampStatus() == 'HOLDING'
+    assert len(magnet.fake.queries) == n
+    magnet.stop_telemetry()
+    assert magnet.voltage() == 0.125
+    assert len(magnet.fake.queries) == n + 1
+
+
+def test_wait_for_field_follows_stream(magnet):
+    magnet.fake.step = 0.125
+    magnet.fake.target = 1.0
+    telemetry = magnet.start_telemetry(rate=1000, length=5)
+    assert magnet.wait_for_field(1.0, tolerance=1e-6, timeout=5) == 1.0
+    magnet.stop_telemetry()
+    data = telemetry.data()
+    assert set(data) == {'timestamp', 'field', 'current', 'voltage',
+                         'ramp_status'}
+    assert len(data['field']) == 5
+    assert np.all(np.diff(data['field']) >= 0)
+    assert data['ramp_status'][-1] == 0
+
+
+def test_wait_for_field_timeout(magnet):
+    with pytest.raises(RuntimeError):
+        magnet.wait_for_field(1.0)
+    magnet.start_telemetry(rate=1000)
+    with pytest.raises(TimeoutError):
+        magnet.wait_for_field(1.0, timeout=0.05)
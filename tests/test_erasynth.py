@@ -0,0 +1,80 @@
+import pytest
+
+from qcodes_contrib_drivers.drivers.ERAInstruments.erasynth import (
+    ERASynthBase, ERASynthPlus)
+
+
+@pytest.fixture(scope="function")
+def driver(monkeypatch):
+    # the simulated serial session does not report bytes_in_buffer, and
+    # there are never unsolicited messages to discard
+    monkeypatch.setattr(ERASynthBase, "clear_read_buffer", lambda self: None)
+    lo = ERASynthPlus(
+        "erasynth_sim",
+        "ASRL1::INSTR",
+        pyvisa_sim_file="qcodes_contrib_drivers.sims:ERASynth.yaml",
+    )
+    lo.visa_handle.response_delay = 0
+    yield lo
+    lo.close()
+
+
+@pytest.fixture
+def json_queries(driver, monkeypatch):
+    sent = []
+    get_json = driver._get_json
+
+    def counting_get_json(cmd, first_key):
+        sent.append(cmd)
+        return get_json(cmd, first_key)
+
+    monkeypatch.setattr(driver, "_get_json", counting_get_json)
+    return sent
+
+
+def test_idn(driver):
+    assert driver.IDN()["model"] == "ERASynth+"
+    assert driver.IDN()["serial"] == "0123456789"
+
+
+def test_gets_share_one_query(driver, json_queries):
+    driver.invalidate_json_cache()
+    assert driver.power() == -10.0
+    assert driver.frequency() == 1e9
+    assert driver.status() is False
+    assert driver.ref_osc_source() == "int"
+    assert driver.temperature() == "41.5"
+    assert json_queries == ["RA", "RD"]
+
+
+def test_set_invalidates_cache(driver, json_queries):
+    driver.invalidate_json_cache()
+    driver.power()
+    driver.power(10)
+    driver.power.get()
+    assert json_queries == ["RA", "RA"]
+
+
+def test_cache_expires(driver, json_queries):
+    driver.invalidate_json_cache()
+    driver.json_cache_validity = 0
+    driver.power()
+    driver.frequency()
+    assert json_queries == ["RA", "RA"]
+    assert driver.get_configuration("amplitude", use_cache=False) == "-10.00"
+    assert len(json_queries) == 3
+
+
+def test_skip_read_buffer_drains(driver, monkeypatch):
+    drains = []
+    monkeypatch.setattr(driver, "clear_read_buffer", lambda: drains.append(1))
+    driver.power(10)
+    assert len(drains) == 2
+    drains.clear()
+    with driver.skip_read_buffer_drains():
+        for _ in range(3):
+            driver.power(10)
+        assert len(drains) == 1
+    assert len(drains) == 2
+    driver.power(10)
+    assert len(drains) == 4
@@ -0,0 +1,125 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+import pyvisa.constants
+import pyvisa.errors
+from qcodes.instrument import Instrument, VisaInstrument
+
+from qcodes_contrib_drivers.drivers.QuTech.IVVI import IVVI
+
+
+class FakeRack:
+    """Emulates the D5 RS232 link: one reply per received descriptor."""
+
+    def __init__(self, numdacs):
+        self.dacs = [0] * numdacs
+        self.out = b''
+        self.writes = 0
+        self.session = None
+        self.visalib = self
+        self.bytes_in_buffer = 0
+        self.timeout_on_empty = False
+
+    def write_raw(self, message):
+        self.writes += 1
+        while message:
+            size, _, reply_size, action = message[:4]
+            if action == 1:
+                self.dacs[message[4] - 1] = int.from_bytes(message[5:7], 'big')
+            reply = bytes([reply_size, 0])
+            if action == 2:
+                reply += b''.join(v.to_bytes(2, 'big') for v in self.dacs)
+            self.out += reply[:reply_size]
+            message = message[size:]
+
+    def read(self, session, size):
+        # deliver at most 3 bytes per call, like a slow serial port
+        size = min(size, 3)
+        if not self.out and self.timeout_on_empty:
+            raise pyvisa.errors.VisaIOError(pyvisa.constants.VI_ERROR_TMO)
+        data, self.out = self.out[:size], self.out[size:]
+        return data, 0
+
+    def ignore_warning(self, *args):
+        return MagicMock()
+
+    def set_visa_attribute(self, *args):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def ivvi(monkeypatch):
+    rack = FakeRack(8)
+
+    def fake_init(self, name, address, **kwargs):
+        Instrument.__init__(self, name)
+        self._address = address
+        self.visa_handle = rack
+        self.add_parameter('timeout', get_cmd=None, set_cmd=None)
+
+    monkeypatch.setattr(VisaInstrument, '__init__', fake_init)
+    instr = IVVI('ivvi', 'ASRL1', numdacs=8, polarity=['BIP', 'POS'])
+    yield instr
+    instr.close()
+
+
+def test_get_dacs(ivvi):
+    ivvi.visa_handle.dacs[4] = 0x8000
+    ivvi._time_last_update = 0
+    values = ivvi.dac_voltages()
+    assert values[0] == -2000
+    assert values[4] == pytest.approx(0x8000 / 65535 * 4000)
+
+
+def test_set_dacs_single_round_trip(ivvi):
+    rack = ivvi.visa_handle
+    for dac in (ivvi.dac1, ivvi.dac2, ivvi.dac6):
+        dac.step = None
+    rack.writes = 0
+    replies = ivvi.set_dacs({1: 0, 'dac2': 1000, 6: 2000})
+    assert rack.writes == 1
+    assert replies == [bytes([2, 0])] * 3
+    assert rack.dacs[:2] == [0x8000, 0xbfff]
+    assert rack.dacs[5] == 0x8000
+    assert ivvi.dac2.cache.get() == 1000
+    assert rack.out == b''
+
+
+def test_set_dacs_validates(ivvi):
+    with pytest.raises(ValueError):
+        ivvi.set_dacs({5: -10})
+    with pytest.raises(ValueError):
+        ivvi.set_dacs({9: 0})
+
+
+def test_set_dacs_ramps(ivvi, monkeypatch):
+    rack = ivvi.visa_handle
+    sleeps = []
+    monkeypatch.setattr('qcodes_contrib_drivers.drivers.QuTech.IVVI.time.sleep',
+                        sleeps.append)
+    ivvi.dac1.step = 1000
+    ivvi.dac1.inter_delay = 0.2
+    ivvi.dac2.step = 500
+    ivvi.dac2.inter_delay = 0.1
+    rack.writes = 0
+    # dac1 from -2000 to 0 in 2 steps, dac2 from -2000 to -500 in 3 steps
+    replies = ivvi.set_dacs({1: 0, 2: -500})
+    assert rack.writes == 3
+    assert sleeps == [0.2, 0.1]
+    assert replies == [bytes([2, 0])] * 2
+    assert rack.dacs[:2] == [0x8000, 0x6000]
+    assert ivvi.dac1.cache.get() == 0
+    assert ivvi.dac2.cache.get() == -500
+
+
+@pytest.mark.parametrize('timeout_on_empty', [False, True])
+def test_read_timeout(ivvi, timeout_on_empty):
+    # visa raises on timeout, a short read is reported as TimeoutError
+    ivvi.visa_handle.timeout_on_empty = timeout_on_empty
+    ivvi.visa_handle.out = b'\x04'
+    with pytest.raises(TimeoutError):
+        ivvi.read(message_len=4)
@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+from pyvisa.resources import GPIBInstrument
+from qcodes.instrument import Instrument, VisaInstrument
+
+from qcodes_contrib_drivers.drivers.Tektronix.Keithley_2700 import \
+    Keithley_2700
+
+
+class FakeBuffer(GPIBInstrument):
+    """
+    Reading buffer that fills by `rate` readings per count query.
+
+    Binary transfers go through the read path of pyvisa: the block with
+    the indefinite '#0' header is delivered by `_read_raw`, which stops at
+    the first newline byte like a read with the termination character
+    enabled, and by `read_bytes`.
+    """
+
+    def __init__(self, rate):
+        self._session = None
+        self._read_termination = '\n'
+        self.rate = rate
+        self.npts = 0
+        self.stored = 0
+        self.queries = []
+        self._output = bytearray()
+
+    def ask(self, cmd):
+        if cmd == ':TRAC:POIN:ACT?':
+            self.stored = min(self.stored + self.rate, self.npts)
+            return str(self.stored)
+        if cmd == ':CONF?':
+            return '"VOLT:DC"'
+        return '1'
+
+    def write(self, cmd):
+        for part in cmd.split(';'):
+            if part.startswith(':SAMP:COUN'):
+                self.npts = int(part.split()[1])
+                self.stored = 0
+        if cmd.startswith(':TRAC:DATA'):
+            self.queries.append(cmd)
+            self._output = bytearray(b'#0' + self.block(cmd) + b'\n')
+
+    def block(self, query):
+        if query == ':TRAC:DATA?':
+            start, count = 0, self.stored
+        else:
+            start, count = (int(x) for x in query.split()[1].split(','))
+        # TRAC:DATA:SEL? counts readings from zero
+        index = np.arange(start, start + count)
+        assert index[-1] < self.stored
+        data = np.column_stack([index * 0.5, index * 1e-3]).astype('<f4')
+        return data.tobytes()
+
+    def _read_raw(self, size=None):
+        end = self._output.find(b'\n') + 1
+        chunk, self._output = self._output[:end], self._output[end:]
+        return chunk
+
+    def read_bytes(self, count, chunk_size=None, break_on_termchar=False):
+        assert count <= len(self._output)
+        chunk, self._output = self._output[:count], self._output[count:]
+        return bytes(chunk)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def dmm(monkeypatch):
+    buffer = FakeBuffer(rate=300)
+
+    def fake_init(self, name, address, **kwargs):
+        Instrument.__init__(self, name)
+        self._address = address
+        self.visa_handle = buffer
+
+    monkeypatch.setattr(VisaInstrument, '__init__', fake_init)
+    monkeypatch.setattr(VisaInstrument, 'ask_raw',
+                        lambda self, cmd: buffer.ask(cmd))
+    monkeypatch.setattr(VisaInstrument, 'write_raw',
+                        lambda self, cmd: buffer.write(cmd))
+    instr = Keithley_2700('dmm', 'GPIB::1')
+    yield instr
+    Instrument.close(instr)
+
+
+def test_burst_single_transfer(dmm):
+    t, r = dmm.burst(1000, poll_interval=0)
+    np.testing.assert_allclose(r, np.arange(1000) * 0.5)
+    np.testing.assert_allclose(t, np.arange(1000) * 1e-3, rtol=1e-6)
+    assert dmm.visa_handle.queries == [':TRAC:DATA?']
+    assert not dmm.visa_handle._output
+
+
+def test_burst_chunked(dmm):
+    chunks = []
+    t, r = dmm.burst(1000, chunk_size=250, poll_interval=0,
+                     callback=lambda t, r: chunks.append(len(r)))
+    np.testing.assert_allclose(r, np.arange(1000) * 0.5)
+    assert chunks == [300, 300, 300, 100]
+    assert dmm.visa_handle.queries[0] == ':TRAC:DATA:SEL? 0,300'
+
+
+def test_burst_timeout(dmm):
+    dmm.visa_handle.rate = 0
+    with pytest.raises(TimeoutError):
+        dmm.burst(10, poll_interval=0, timeout=0.01)
+    assert dmm._burst_points is None
+    with pytest.raises(ValueError):
+        dmm.arm_burst(0)
@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+from qcodes.instrument import Instrument, VisaInstrument
+
+from qcodes_contrib_drivers.drivers.Tektronix.Keithley_6430 import \
+    Keithley_6430
+
+
+class FakeSMU:
+    """Answers a sweep with V = level, I = level / 1 kOhm, R = 1 kOhm."""
+
+    def __init__(self):
+        self.writes = []
+        self.asks = []
+        self.levels = [0.0]
+
+    def ask(self, cmd):
+        self.asks.append(cmd)
+        if cmd == '*IDN?':
+            return 'KEITHLEY INSTRUMENTS INC.,MODEL 6430,1,1'
+        if cmd == 'SENS:FUNC?':
+            return '"VOLT:DC","CURR:DC"'
+        if cmd == 'SOUR:FUNC?':
+            return 'VOLT'
+        if cmd.startswith(':SENS:CURR:RANG:AUTO?'):
+            return '1;1;0'
+        if cmd == ':READ?':
+            return ','.join(f'{v:e},{v / 1e3:e},{1e3:e}'
+                            for v in self.levels)
+        return '1'
+
+    def write(self, cmd):
+        self.writes.append(cmd)
+        for part in cmd.split(';'):
+            if part.startswith(':SOUR:LIST:VOLT'):
+                self.levels = [float(v) for v in part.split()[1].split(',')]
+            elif part.startswith(':SOUR:VOLT:STAR'):
+                start = float(part.split()[1])
+            elif part.startswith(':SOUR:VOLT:STOP'):
+                stop = float(part.split()[1])
+            elif part.startswith(':SOUR:SWE:POIN'):
+                self.levels = list(np.linspace(start, stop,
+                                               int(part.split()[1])))
+            elif part.endswith('MODE FIX'):
+                self.levels = [0.0]
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def smu(monkeypatch):
+    fake = FakeSMU()
+
+    def fake_init(self, name, address, **kwargs):
+        Instrument.__init__(self, name)
+        self._address = address
+        self.visa_handle = fake
+
+    monkeypatch.setattr(VisaInstrument, '__init__', fake_init)
+    monkeypatch.setattr(VisaInstrument, 'ask_raw',
+                        lambda self, cmd: fake.ask(cmd))
+    monkeypatch.setattr(VisaInstrument, 'write_raw',
+                        lambda self, cmd: fake.write(cmd))
+    instr = Keithley_6430('smu_6430', 'GPIB::1')
+    instr.fake = fake
+    yield instr
+    instr.close()
+
+
+def test_read_uses_cached_state(smu):
+    smu.output_enabled(True)
+    smu.sense_current()
+    smu.fake.asks.clear()
+    smu.sense_current()
+    smu.sense_voltage()
+    assert smu.fake.asks == [':READ?', ':READ?']
+
+
+def test_sweep_single_transfer(smu):
+    smu.output_enabled(True)
+    smu.source_mode('VOLT')
+    smu.fake.asks.clear()
+    v, i, r = smu.sweep(-1, 1, 5)
+    assert smu.fake.asks == [':READ?']
+    np.testing.assert_allclose(v, np.linspace(-1, 1, 5))
+    np.testing.assert_allclose(i, np.linspace(-1e-3, 1e-3, 5))
+    np.testing.assert_allclose(r, 1e3)
+    assert ':TRIG:COUN 5' in smu.fake.writes[-2].split(';')
+    assert smu.fake.writes[-1] == ':SOUR:VOLT:MODE FIX;:TRIG:COUN 1'
+    assert smu.trigger_count.cache.get() == 1
+
+
+def test_list_sweep(smu):
+    smu.output_enabled(True)
+    v, i, _ = smu.list_sweep([0.1, 0.5, -0.2], mode='VOLT')
+    np.testing.assert_allclose(v, [0.1, 0.5, -0.2])
+    np.testing.assert_allclose(i, [1e-4, 5e-4, -2e-4])
+    with pytest.raises(ValueError):
+        smu.configure_list(np.zeros(101), mode='VOLT')
+
+
+def test_read_sweep_requires_configuration(smu):
+    with pytest.raises(RuntimeError):
+        smu.read_sweep()
+
+
+def test_sense_autorange_single_query(smu):
+    smu.fake.asks.clear()
+    assert smu.sense_autorange() is False
+    assert len(smu.fake.asks) == 1
+    smu.sense_autorange(True)
+    assert len(smu.fake.writes[-1].split(';')) == 3
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from qcodes.instrument import Instrument, VisaInstrument
+
+from qcodes_contrib_drivers.drivers.Tektronix.Keithley_6500 import Keithley_6500
+
+
+@pytest.fixture
+def dmm(monkeypatch):
+    log = []
+    responses = {'ROUTe:TERMinals?': 'REAR',
+                 ':SYSTem:CARD1:IDN?': '2000,10-Chan Mux,0.0.0a,00000000',
+                 '*IDN?': 'KEITHLEY INSTRUMENTS,MODEL DMM6500,1,1.0'}
+
+    def ask_raw(self, cmd):
+        log.append((cmd, self.timeout()) if 'TRAC:DATA?' in cmd else cmd)
+        if cmd in responses:
+            return responses[cmd]
+        if 'TRAC:DATA?' in cmd:
+            n = int(cmd.split('TRAC:DATA? 1, ')[1].split(',')[0])
+            return ','.join(str(float(i)) for i in range(n))
+        return '1.5'
+
+    def fake_init(self, name, address, **kwargs):
+        Instrument.__init__(self, name)
+        self._address = address
+        self.add_parameter('timeout', get_cmd=None, set_cmd=None,
+                           initial_value=5)
+
+    monkeypatch.setattr(VisaInstrument, '__init__', fake_init)
+    monkeypatch.setattr(VisaInstrument, 'ask_raw', ask_raw)
+    monkeypatch.setattr(VisaInstrument, 'write_raw',
+                        lambda self, cmd: log.append(cmd))
+    instr = Keithley_6500('dmm', 'GPIB::1')
+    instr.sent = log
+    yield instr
+    Instrument.close(instr)
+
+
+def test_channel_measure_single_round_trip(dmm):
+    dmm.sent.clear()
+    assert dmm.ch3.resistance() == 1.5
+    assert dmm.ch4.voltage_dc() == 1.5
+    # the terminal is only queried once within its cache age
+    assert dmm.sent == ['ROUTe:TERMinals?',
+                       "SENS:FUNC 'RES', (@3);:ROUT:CLOS (@3);:READ?",
+                       "SENS:FUNC 'VOLT', (@4);:ROUT:CLOS (@4);:READ?"]
+
+
+def test_hardware_scan(dmm):
+    data = dmm.scan([1, 2, 5], quantity='res', scan_count=4)
+    np.testing.assert_array_equal(data, np.arange(12.).reshape(4, 3))
+    assert 'ROUT:SCAN:CRE (@1,2,5)' in dmm.sent
+
+    dmm.sent.clear()
+    dmm.scan([1, 2, 5], quantity='RES', scan_count=4)
+    assert len(dmm.sent) == 1 and 'TRAC:DATA? 1, 12' in dmm.sent[0][0]
+
+    with pytest.raises(ValueError):
+        dmm.configure_scan([1], quantity='FOO')
+
+
+def test_scan_timeout_covers_scan(dmm):
+    dmm.configure_scan([1, 2], scan_count=10, interval=2.0, nplc=1)
+    dmm.sent.clear()
+    dmm.read_scan()
+    (_, timeout), = dmm.sent
+    assert timeout == pytest.approx(5 + 10 * 2.0)
+    assert dmm.timeout() == 5
+
+    dmm.configure_scan([1, 2], scan_count=10, nplc=5)
+    dmm.sent.clear()
+    dmm.read_scan()
+    assert dmm.sent[0][1] == pytest.approx(5 + 10 * 2 * (0.1 + 0.05))
+
+
+def test_scan_requires_rear_terminal(dmm):
+    dmm.active_terminal.cache.set('FRON')
+    with pytest.raises(RuntimeError):
+        dmm.configure_scan([1, 2])
@@ -0,0 +1,56 @@
+import time
+
+import numpy as np
+import pytest
+
+from qcodes_contrib_drivers.drivers.Lakeshore.Model_331 import (
+    Model331Logger, Model_331)
+
+
+@pytest.fixture
+def lakeshore():
+    instr = Model_331(
+        'ls331', 'GPIB::12::INSTR',
+        pyvisa_sim_file='qcodes_contrib_drivers.sims:Lakeshore_331.yaml')
+    instr.visa_handle.response_delay = 0
+    instr.queries = []
+    ask_raw = instr.ask_raw
+
+    def recording_ask_raw(cmd):
+        instr.queries.append(cmd)
+        return ask_raw(cmd)
+
+    instr.ask_raw = recording_ask_raw
+    yield instr
+    instr.close()
+
+
+def test_read_channels_single_query(lakeshore):
+    readings = lakeshore.read_channels()
+    assert lakeshore.queries == [
+        'KRDG? A;SRDG? A;RDGST? A;KRDG? B;SRDG? B;RDGST? B']
+    assert readings == {'A': (4.2135, 1234.5, 0), 'B': (0.0, 0.0, 2)}
+    chan = lakeshore.A
+    assert chan.temperature.cache.get(get_if_invalid=False) == 4.2135
+    assert chan.sensor_raw.cache.get(get_if_invalid=False) == 1234.5
+    assert chan.sensor_status.cache.get(get_if_invalid=False) == 'ok'
+    # unnamed status code
+    assert not lakeshore.B.sensor_status.cache.valid
+
+
+def test_logger_ring_buffer(lakeshore):
+    logger = Model331Logger(lakeshore, interval=0.001, length=3,
+                            channels=['A'])
+    with logger:
+        deadline = time.monotonic() + 5
+        while logger.count < 5:
+            assert time.monotonic() < deadline
+            time.sleep(0.001)
+    assert logger.error is None
+    data = logger.data()
+    assert set(data) == {'timestamp', 'A_temperature', 'A_sensor_raw',
+                         'A_sensor_status'}
+    np.testing.assert_array_equal(data['A_temperature'], 4.2135)
+    np.testing.assert_array_equal(data['A_sensor_raw'], 1234.5)
+    np.testing.assert_array_equal(data['A_sensor_status'], 0)
+    assert len(data['timestamp']) == 3
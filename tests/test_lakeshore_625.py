@@ -0,0 +1,117 @@
+import time
+
+import pytest
+from qcodes.instrument import Instrument, VisaInstrument
+
+from qcodes_contrib_drivers.drivers.Lakeshore.Model_625 import Lakeshore625
+
+
+class FakeSupply:
+    """Ramps the field by `step` tesla per OPST? query."""
+
+    def __init__(self, step=0.1):
+        self.step = step
+        self.field = 0.0
+        self.target = 0.0
+        self.registers = {'LIMIT': '60.0000,5.0000,0.5000',
+                          'PSHS': '0,50.0,20',
+                          'QNCH': '1,1.00',
+                          'FLDS': '0,0.1000',
+                          'RATE': '0.1000',
+                          'RSEG': '0'}
+        self.queries = []
+
+    def ask(self, cmd):
+        self.queries.append(cmd)
+        if cmd == '*IDN?':
+            return 'LSCI,MODEL625,1,1'
+        if cmd == 'RDGF?':
+            return f'{self.field:.4f}'
+        if cmd == 'OPST?':
+            delta = self.target - self.field
+            self.field += max(-self.step, min(self.step, delta))
+            # bit 1 cleared while ramping
+            return '2' if self.field == self.target else '4'
+        return self.registers[cmd.rstrip('?')]
+
+    def write(self, cmd):
+        name, _, args = cmd.partition(' ')
+        if name == 'SETF':
+            self.target = float(args)
+        else:
+            self.registers[name] = args.replace(' ', '')
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def magnet(monkeypatch):
+    fake = FakeSupply()
+
+    def fake_init(self, name, address, **kwargs):
+        Instrument.__init__(self, name)
+        self._address = address
+        self.visa_handle = fake
+
+    monkeypatch.setattr(VisaInstrument, '__init__', fake_init)
+    monkeypatch.setattr(VisaInstrument, 'ask_raw',
+                        lambda self, cmd: fake.ask(cmd))
+    monkeypatch.setattr(VisaInstrument, 'write_raw',
+                        lambda self, cmd: fake.write(cmd))
+    monkeypatch.setattr(Lakeshore625, '_sleep',
+                        lambda self, t: time.sleep(1e-3))
+    instr = Lakeshore625('ls625', coil_constant=None, field_ramp_rate=None,
+                         address='GPIB::1')
+    instr.fake = fake
+    yield instr
+    instr.close()
+
+
+def test_limit_register_read_once(magnet):
+    magnet.fake.queries.clear()
+    assert magnet.current_limit() == 60
+    assert magnet.voltage_limit() == 5
+    assert magnet.current_rate_limit() == 0.5
+    assert magnet.fake.queries == ['LIMIT?']
+
+
+def test_register_fills_sibling_caches(magnet):
+    magnet._registers.clear()
+    magnet.quench_detection()
+    assert magnet.quench_current_step_limit.cache.get(
+        get_if_invalid=False) == 1.0
+
+
+def test_register_write_discards_reply(magnet):
+    magnet.current_limit()
+    magnet.voltage_limit(2)
+    assert magnet.fake.registers['LIMIT'] == '60.0,2,0.5'
+    magnet.fake.queries.clear()
+    assert magnet.voltage_limit() == 2
+    assert magnet.fake.queries == ['LIMIT?']
+
+
+def test_ramp_field_future(magnet):
+    magnet.fake.step = 0.0
+    future = magnet.ramp_field(0.5, settle_time=0)
+    # 0.1 T/A * 0.1 A/s = 0.6 T/min, so the ramp takes about 50 s
+    assert 45 < magnet.ramp_time_remaining() <= 50
+    assert not future.done()
+    magnet.fake.step = 0.1
+    assert future.result(timeout=5) == pytest.approx(0.5)
+    assert magnet.ramp_time_remaining() == 0
+
+
+def test_new_ramp_cancels_previous(magnet):
+    magnet.fake.step = 0.0
+    first = magnet.ramp_field(1.0)
+    second = magnet.ramp_field(0.2, settle_time=0)
+    assert first.cancelled()
+    magnet.fake.step = 0.1
+    assert second.result(timeout=5) == pytest.approx(0.2)
+
+
+def test_set_field_blocks(magnet):
+    magnet.field(0.3)
+    assert magnet.fake.field == pytest.approx(0.3)
@@ -0,0 +1,143 @@
+import importlib
+import sys
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+NIDAQMX_MODULES = ('nidaqmx', 'nidaqmx.constants', 'nidaqmx.stream_readers',
+                   'nidaqmx.stream_writers')
+DAQ_MODULE = 'qcodes_contrib_drivers.drivers.NationalInstruments.DAQ'
+
+
+@pytest.fixture
+def daq(monkeypatch):
+    """The DAQ driver module, imported against mocked nidaqmx modules."""
+    for module in NIDAQMX_MODULES:
+        monkeypatch.setitem(sys.modules, module, MagicMock(name=module))
+    monkeypatch.delitem(sys.modules, DAQ_MODULE, raising=False)
+    yield importlib.import_module(DAQ_MODULE)
+    sys.modules.pop(DAQ_MODULE, None)
+
+
+def fill_ramp(data, number_of_samples_per_channel, timeout):
+    nchannels, nsamples = data.shape
+    data[:] = np.arange(nchannels * nsamples).reshape(nchannels, nsamples)
+    return nsamples
+
+
+@pytest.fixture
+def daq_ai(daq):
+    reader = daq.AnalogMultiChannelReader.return_value
+    reader.read_many_sample.side_effect = fill_ramp
+    task = MagicMock(name='ai_task')
+    instr = daq.DAQAnalogInputs('daq_ai', 'Dev1', 1000, {'a': 0, 'b': 1}, task,
+                            samples_to_read=8, target_points=2)
+    yield instr
+    instr.close()
+
+
+def test_finite_read_averages(daq_ai):
+    data = daq_ai.voltage()
+    expected = np.arange(16).reshape(2, 2, 4).mean(axis=2)
+    np.testing.assert_allclose(data, expected)
+
+
+def test_continuous_mean(daq, daq_ai):
+    task = daq_ai.task
+    daq_ai.start_continuous(samples_per_callback=6, downsample=3)
+    task.timing.cfg_samp_clk_timing.assert_called_with(
+        1000, sample_mode=daq.AcquisitionType.CONTINUOUS, samps_per_chan=60)
+    task.start.assert_called_once()
+    n, callback = task.register_every_n_samples_acquired_into_buffer_event.call_args[0]
+    assert n == 6
+
+    with pytest.raises(RuntimeError):
+        daq_ai.voltage()
+
+    for _ in range(3):
+        assert callback(None, None, 6, None) == 0
+    data = daq_ai.read_continuous()
+    block = np.arange(12).reshape(2, 2, 3).mean(axis=2)
+    np.testing.assert_allclose(data, np.tile(block, 3))
+    assert daq_ai.read_continuous().shape == (2, 0)
+
+    daq_ai.stop_continuous()
+    assert not daq_ai.continuous
+    task.timing.cfg_samp_clk_timing.assert_called_with(
+        1000, sample_mode=daq.AcquisitionType.FINITE, samps_per_chan=8)
+
+
+def test_continuous_decimate_with_callback(daq, daq_ai):
+    blocks = []
+    daq_ai.start_continuous(samples_per_callback=4, downsample=2,
+                            reduction='decimate', callback=blocks.append,
+                            clock_src='/Dev1/ao/SampleClock')
+    task = daq_ai.task
+    task.timing.cfg_samp_clk_timing.assert_called_with(
+        1000, source='/Dev1/ao/SampleClock',
+        sample_mode=daq.AcquisitionType.CONTINUOUS, samps_per_chan=40)
+    _, callback = task.register_every_n_samples_acquired_into_buffer_event.call_args[0]
+    callback(None, None, 4, None)
+    np.testing.assert_allclose(blocks[0], [[0, 2], [4, 6]])
+    assert daq_ai.stop_continuous().shape == (2, 0)
+    # the clock source only applies to the continuous acquisition
+    assert daq_ai.clock_src is None
+    task.timing.cfg_samp_clk_timing.assert_called_with(
+        1000, sample_mode=daq.AcquisitionType.FINITE, samps_per_chan=8)
+
+
+def test_continuous_invalid_downsample(daq_ai):
+    with pytest.raises(ValueError):
+        daq_ai.start_continuous(samples_per_callback=5, downsample=2)
+
+
+@pytest.fixture
+def daq_ao(daq):
+    instr = daq.DAQAnalogOutputs('daq_ao', 'Dev1', {'x': 0, 'y': 1})
+    yield instr
+    instr.close()
+
+
+def test_write_waveform_one_shot(daq, daq_ao):
+    x = np.linspace(0, 1, 5)
+    daq_ao.write_waveform({'x': x, 'y': -x}, rate=1000,
+                          trigger_src='/Dev1/PFI0')
+    task = daq.nidaqmx.Task.return_value
+    task.timing.cfg_samp_clk_timing.assert_called_with(
+        1000, sample_mode=daq.AcquisitionType.FINITE, samps_per_chan=5)
+    task.triggers.start_trigger.cfg_dig_edge_start_trig.assert_called_once()
+    data = daq.AnalogMultiChannelWriter.return_value.write_many_sample.call_args[0][0]
+    np.testing.assert_allclose(data, np.vstack([x, -x]))
+    assert data.flags['C_CONTIGUOUS']
+    task.start.assert_called_once()
+    # the final value is only known once the output is done
+    assert np.isnan(daq_ao.voltage_y())
+    daq_ao.wait_waveform()
+    task.wait_until_done.assert_called_once()
+    assert daq_ao.voltage_y() == -1
+
+    daq_ao.stop_waveform()
+    task.close.assert_called_once()
+    assert daq_ao.waveform_task is None
+
+
+def test_write_waveform_invalid(daq_ao):
+    with pytest.raises(ValueError):
+        daq_ao.write_waveform({'z': [0, 1]}, rate=1000)
+    with pytest.raises(ValueError):
+        daq_ao.write_waveform({'x': [0, 1], 'y': [0, 1, 2]}, rate=1000)
+
+
+def test_sweep_shares_sample_clock(daq, daq_ao, daq_ai):
+    data = daq_ao.sweep({'x': np.arange(4.)}, rate=500, daq_ai=daq_ai)
+    timing = daq_ai.task.timing.cfg_samp_clk_timing
+    timing.assert_any_call(
+        500, source='/Dev1/ao/SampleClock',
+        sample_mode=daq.AcquisitionType.FINITE, samps_per_chan=4)
+    # the inputs return to their own rate and clock afterwards
+    timing.assert_called_with(
+        1000, sample_mode=daq.AcquisitionType.FINITE, samps_per_chan=8)
+    np.testing.assert_allclose(data, np.arange(8).reshape(2, 4))
+    daq.nidaqmx.Task.return_value.close.assert_called_once()
+    assert daq_ao.voltage_x() == 3
@@ -0,0 +1,157 @@
+import pytest
+import pyvisa
+from qcodes.instrument import Instrument, VisaInstrument
+
+from qcodes_contrib_drivers.drivers.OxfordInstruments import IPS120
+from qcodes_contrib_drivers.drivers.OxfordInstruments.IPS120 import \
+    OxfordInstruments_IPS120
+
+
+class FakeIPS:
+    """Sweeps the output current by `step` ampere per R0 query.
+
+    Over serial, commands carry the ISOBUS `prefix` and nothing is buffered
+    to be read at connection."""
+
+    def __init__(self, step=10.0, prefix=''):
+        self.step = step
+        self.prefix = prefix
+        self.attributes = {}
+        self.written = []
+        self.current = 0.0
+        self.setpoint = 0.0
+        self.activity = 0
+        self.heater = 2
+        self.commands = []
+
+    def status(self):
+        sweeping = int(self.activity != 0 and self.current != self.target())
+        return f'X00A{self.activity}C3H{self.heater}M9{sweeping}P02'
+
+    def target(self):
+        return 0.0 if self.activity == 2 else self.setpoint
+
+    def ask(self, cmd):
+        self.commands.append(cmd)
+        assert cmd.startswith(self.prefix)
+        cmd = cmd[len(self.prefix):]
+        if cmd == 'X':
+            return self.status()
+        if cmd == 'R0':
+            if self.activity:
+                delta = self.target() - self.current
+                self.current += max(-self.step, min(self.step, delta))
+            return f'R{self.current:+.4f}'
+        if cmd == 'R5':
+            return f'R{self.setpoint:+.4f}'
+        if cmd == 'R6':
+            return 'R+60.000'
+        if cmd.startswith('I'):
+            self.setpoint = float(cmd[1:])
+        elif cmd.startswith('A'):
+            self.activity = int(cmd[1:])
+        elif cmd.startswith('H'):
+            self.heater = 1 if cmd == 'H1' else 2
+        elif cmd.startswith('Z'):
+            return '?' + cmd
+        return cmd[0]
+
+    def set_visa_attribute(self, attribute, value):
+        self.attributes[attribute] = value
+
+    def write(self, cmd):
+        self.written.append(cmd)
+
+    @property
+    def bytes_in_buffer(self):
+        raise pyvisa.VisaIOError(pyvisa.constants.StatusCode.error_timeout)
+
+    def close(self):
+        pass
+
+
+def make_ips(monkeypatch, use_gpib):
+    fake = FakeIPS(prefix='' if use_gpib else '@2')
+    sleeps = []
+
+    def fake_init(self, name, address, **kwargs):
+        Instrument.__init__(self, name)
+        self.visa_handle = fake
+
+    monkeypatch.setattr(VisaInstrument, '__init__', fake_init)
+    monkeypatch.setattr(VisaInstrument, 'ask_raw',
+                        lambda self, cmd: fake.ask(cmd))
+    monkeypatch.setattr(IPS120, 'sleep', sleeps.append)
+    instr = OxfordInstruments_IPS120('ips120', 'GPIB::1', use_gpib=use_gpib)
+    instr.fake = fake
+    instr.sleeps = sleeps
+    return instr
+
+
+@pytest.fixture
+def ips(monkeypatch):
+    instr = make_ips(monkeypatch, use_gpib=True)
+    yield instr
+    instr.close()
+
+
+@pytest.fixture
+def serial_ips(monkeypatch):
+    instr = make_ips(monkeypatch, use_gpib=False)
+    yield instr
+    instr.close()
+
+
+def test_single_status_query_fills_caches(ips):
+    assert ips.mode2() == 'At rest'
+    assert ips.switch_heater() == 'Off magnet at field (switch closed)'
+    assert ips.remote_status() == 'Remote and unlocked'
+    assert ips.fake.commands.count('X') == 1
+    assert ips.polarity.cache.get(get_if_invalid=False) == (
+        'Desired: Positive, Magnet: Positive, Commanded: Positive, '
+        'Positive contactor closed')
+
+
+def test_status_reread_after_command(ips):
+    ips.mode2()
+    ips.hold()
+    ips.mode2()
+    assert ips.fake.commands.count('X') == 2
+
+
+def test_wait_until_at_rest_adapts_poll_interval(ips):
+    ips.fake.setpoint = 35.0
+    ips.fake.activity = 1
+    ips.wait_until_at_rest()
+    assert ips.fake.current == 35.0
+    # 1 A/s: the interval follows half of the remaining sweep time
+    assert ips.sleeps == [5, 5, pytest.approx(2.5), 0.1]
+
+
+def test_wait_until_at_rest_timeout(ips):
+    ips.fake.step = 0.0
+    ips.fake.setpoint = 35.0
+    ips.fake.activity = 1
+    with pytest.raises(TimeoutError):
+        ips.wait_until_at_rest(timeout=0)
+
+
+def test_switch_heater_waits_for_reported_state(ips):
+    ips.switch_heater_delay(5)
+    ips.switch_heater(1)
+    assert ips.sleeps == [5]
+    assert ips.get_status()['switch_heater'] == 'On (switch open)'
+
+
+def test_serial_commands_use_isobus_prefix(serial_ips, capsys):
+    fake = serial_ips.fake
+    assert fake.attributes == {pyvisa.constants.VI_ATTR_ASRL_STOP_BITS:
+                               pyvisa.constants.VI_ASRL_STOP_TWO}
+    assert fake.written == ['@2V']
+    assert serial_ips.mode2() == 'At rest'
+    serial_ips.hold()
+    assert serial_ips.current_setpoint() == 0.0
+    assert fake.commands == ['@2X', '@2C3', '@2A0', '@2C2', '@2R5']
+    # unrecognized commands are reported instead of returned
+    assert serial_ips._execute('Z1') is None
+    assert 'Z1 not recognized' in capsys.readouterr().out
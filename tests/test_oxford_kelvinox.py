@@ -0,0 +1,98 @@
+import threading
+import time
+
+import pytest
+
+from qcodes_contrib_drivers.drivers.OxfordInstruments.kelvinox import \
+    OxfordInstruments_Kelvinox_IGH
+
+
+@pytest.fixture
+def igh():
+    instr = OxfordInstruments_Kelvinox_IGH(
+        'igh', 'ASRL4::INSTR',
+        pyvisa_sim_file='qcodes_contrib_drivers.sims:Kelvinox_IGH.yaml')
+    instr.visa_handle.response_delay = 0
+    instr.commands = []
+    ask_raw = instr.ask_raw
+
+    def recording_ask_raw(cmd):
+        assert cmd.startswith('@5')
+        instr.commands.append(cmd[2:])
+        return ask_raw(cmd)
+
+    instr.ask_raw = recording_ask_raw
+    yield instr
+    instr.close()
+
+
+def test_status_decoded_once(igh):
+    status = igh.get_status()
+    assert igh.commands == ['X']
+    assert status['mix_chamber_heater_status'] == 'temperature control'
+    assert status['remote_status'] == 'Remote and unlocked'
+    assert status['still_status'] == 'on'
+    assert status['sorb_status'] == 'on T control'
+    assert status['V9_valve'] == 'on'
+    assert status['V1_valve'] == 'on'
+    assert status['V8_valve'] == 'off'
+    assert igh.V1_valve.cache.get(get_if_invalid=False) == 'on'
+
+
+def test_snapshot_reads_status_once(igh):
+    igh.snapshot(update=True)
+    assert igh.commands.count('X') == 1
+
+
+def test_command_discards_status(igh):
+    igh.still_status()
+    igh.set_mix_chamber_heater_mode(1)
+    igh.still_status()
+    assert igh.commands == ['X', 'A1', 'X']
+
+
+def test_poller_serves_reads(igh):
+    igh.start_polling(interval=10)
+    deadline = time.monotonic() + 5
+    while igh.P2.cache.get(get_if_invalid=False) is None:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    n = len(igh.commands)
+    assert igh.mix_chamber_temp() == pytest.approx(12.345)
+    assert igh.G1() == 1
+    assert igh.V9_valve() == 'on'
+    assert len(igh.commands) == n
+    igh.stop_polling()
+    assert not igh.polling
+    igh.G1()
+    assert len(igh.commands) == n + 1
+
+
+def test_command_discards_reply_read_concurrently(igh):
+    ask = igh.ask_raw
+    reading, release = threading.Event(), threading.Event()
+
+    def slow_ask(cmd):
+        if cmd == '@5R8':
+            reading.set()
+            release.wait(1)
+        return ask(cmd)
+
+    igh.ask_raw = slow_ask
+    poll = threading.Thread(target=igh._execute, args=('R8',))
+    poll.start()
+    reading.wait(1)
+    command = threading.Thread(target=igh.set_mix_chamber_heater_mode,
+                               args=(1,))
+    command.start()
+    time.sleep(0.05)
+    release.set()
+    poll.join()
+    command.join()
+    assert igh.commands == ['R8', 'A1']
+    assert 'R8' not in igh._replies
+
+
+def test_idn(igh):
+    assert igh.IDN() == {'vendor': 'OXFORD', 'model': 'IGH',
+                         'serial': None, 'firmware': '1.04'}
@@ -0,0 +1,52 @@
+import time
+
+import numpy as np
+import pytest
+
+from qcodes_contrib_drivers.drivers.private.ring_buffer_logger import \
+    RingBufferLogger
+
+
+class CountingLogger(RingBufferLogger):
+
+    def __init__(self, fail_after=None, **kwargs):
+        super().__init__(('n', 'missing'), name='counting_logger', **kwargs)
+        self.fail_after = fail_after
+        self.calls = 0
+
+    def record(self):
+        if self.calls == self.fail_after:
+            raise ValueError('reading failed')
+        self.calls += 1
+        self._store([self.calls, None])
+
+
+def wait_until(condition):
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_ring_buffer_keeps_latest_readings():
+    logger = CountingLogger(interval=0.001, length=4)
+    with logger:
+        wait_until(lambda: logger.count >= 6)
+        with pytest.raises(RuntimeError):
+            logger.start()
+    data = logger.data()
+    n = logger.count
+    np.testing.assert_array_equal(data['n'], np.arange(n - 3, n + 1))
+    assert np.all(np.isnan(data['missing']))
+    assert np.all(np.diff(data['timestamp']) >= 0)
+
+
+def test_error_stops_recording():
+    logger = CountingLogger(fail_after=2, interval=0.001, length=4)
+    logger.start()
+    wait_until(lambda: not logger.running)
+    logger.stop()
+    assert isinstance(logger.error, ValueError)
+    np.testing.assert_array_equal(logger.data()['n'], [1, 2])
+    with pytest.raises(ValueError):
+        CountingLogger(interval=0, length=4)
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+from qcodes.instrument import Instrument, VisaInstrument
+
+from qcodes_contrib_drivers.drivers.RohdeSchwarz.ZVL13 import ZVL13
+
+RESPONSES = {
+    'INST?': 'NWA',
+    'CONFigure:TRACe:CATalog?': "'1,Trc1'",
+    'FREQ:STAR?': '1e6',
+    'FREQ:STOP?': '2e6',
+    'SWE:POIN?': '5',
+    'AVER:COUN?': '3',
+    'CONF:CHAN1:STAT?': '1',
+}
+
+
+class FakeVisaHandle:
+    def __init__(self, trace):
+        self.trace = trace
+        self.binary_queries = []
+
+    def query_binary_values(self, query, datatype, is_big_endian, container):
+        self.binary_queries.append((query, datatype, is_big_endian))
+        data = self.trace.astype('<f4' if datatype == 'f' else '<f8').tobytes()
+        return container(np.frombuffer(data, '<' + datatype))
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def zvl(monkeypatch):
+    written = []
+    trace = np.linspace(-1, 1, 5)
+
+    def fake_init(self, name, address, **kwargs):
+        Instrument.__init__(self, name)
+        self._address = address
+        self.visa_handle = FakeVisaHandle(trace)
+        self.add_parameter('timeout', get_cmd=None, set_cmd=None,
+                           initial_value=5)
+
+    monkeypatch.setattr(VisaInstrument, '__init__', fake_init)
+    monkeypatch.setattr(VisaInstrument, 'write_raw',
+                        lambda self, cmd: written.append(cmd))
+    monkeypatch.setattr(
+        VisaInstrument, 'ask_raw',
+        lambda self, cmd: RESPONSES.get(
+            cmd, ','.join(str(x) for x in trace)))
+    instr = ZVL13('zvl', 'TCPIP::1::INSTR')
+    instr.written = written
+    yield instr
+    instr.close()
+
+
+def test_binary_trace(zvl):
+    zvl.written.clear()
+    np.testing.assert_allclose(zvl.trace(), np.linspace(-1, 1, 5))
+    assert zvl.visa_handle.binary_queries == [('CALC:DATA? FDAT', 'd', False)]
+    assert 'FORM REAL,64;FORM:BORD SWAP' in zvl.written
+    assert zvl.timeout() == 5
+
+
+def test_ascii_trace(zvl):
+    zvl.transfer_format = 'ASC'
+    np.testing.assert_allclose(zvl.spectrum(), np.linspace(-1, 1, 5))
+    assert zvl.visa_handle.binary_queries == []
+    with pytest.raises(ValueError):
+        zvl.transfer_format = 'REAL,16'
+
+
+def test_acquisition_sends_setup_once(zvl):
+    zvl.transfer_format = 'REAL,32'
+    zvl.written.clear()
+    with zvl.acquisition(averages=2) as acq:
+        traces = acq.fetch_many(10)
+    assert traces.shape == (10, 5)
+    assert zvl.visa_handle.binary_queries[-1][1] == 'f'
+    setup = [cmd for cmd in zvl.written if 'SWE:COUN' in cmd]
+    assert setup == ['SENS:AVER:STAT ON;:SENS:SWE:COUN 2;'
+                     ':INIT:IMM:SCOP SING;:INIT:CONT OFF']
+    assert zvl.written.count('SENS:AVER:CLE;:INIT:IMM;*WAI') == 10
+    assert zvl.written[-1] == 'INIT:CONT:ALL ON'
+
+
+def test_fetch_many_without_traces(zvl):
+    with zvl.acquisition() as acq:
+        zvl.written.clear()
+        assert acq.fetch_many(0).shape == (0, 0)
+        with pytest.raises(ValueError):
+            acq.fetch_many(-1)
+    assert 'SENS:AVER:CLE;:INIT:IMM;*WAI' not in zvl.written
@@ -0,0 +1,60 @@
+import pytest
+
+from qcodes_contrib_drivers.drivers.Siglent.sdg import Siglent_SDG_2042X
+
+
+@pytest.fixture(scope="function")
+def driver():
+    sdg_sim = Siglent_SDG_2042X(
+        "sdg_sim",
+        "TCPIP::192.168.0.2::INSTR",
+        pyvisa_sim_file="qcodes_contrib_drivers.sims:Siglent_SDG.yaml",
+    )
+    sdg_sim.visa_handle.response_delay = 0
+    yield sdg_sim
+
+    sdg_sim.close()
+
+
+@pytest.fixture
+def queries(driver, monkeypatch):
+    sent = []
+    ask_raw = driver.ask_raw
+
+    def counting_ask_raw(cmd):
+        sent.append(cmd)
+        return ask_raw(cmd)
+
+    monkeypatch.setattr(driver, "ask_raw", counting_ask_raw)
+    return sent
+
+
+def test_basic_wave_fields(driver):
+    assert driver.channel1.wave_type() == "sine"
+    assert driver.channel1.frequency() == 1000.0
+    assert driver.channel1.amplitude() == 4.0
+    assert driver.channel2.offset() == 0.1
+    assert driver.channel2.load() == 50
+
+
+def test_snapshot_queries_each_group_once(driver, queries):
+    driver.snapshot(update=True)
+    assert sorted(queries) == sorted(set(queries))
+    assert queries.count("C1:BSWV?") == 1
+    assert queries.count("C2:BSWV?") == 1
+
+
+def test_write_invalidates_cache(driver, queries):
+    driver.channel1.frequency()
+    driver.channel1.amplitude()
+    assert queries == ["C1:BSWV?"]
+    driver.reset()
+    driver.channel1.frequency()
+    assert queries == ["C1:BSWV?", "C1:BSWV?"]
+
+
+def test_cache_disabled(driver, queries):
+    driver.response_cache_validity = -1
+    driver.channel1.frequency()
+    driver.channel1.amplitude()
+    assert queries == ["C1:BSWV?", "C1:BSWV?"]
@@ -0,0 +1,122 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from qcodes_contrib_drivers.drivers.Siglent.sds import Siglent_SDS_120NxE
+
+RESPONSES = {
+    "SARA?": "SARA 1.00GSa/s",
+    "WFSU?": "WFSU SP,1,NP,0,FP,0",
+    "SANU? C1": "SANU 4pts",
+    "C1:VDIV?": "C1:VDIV 2.50E+00V",
+    "C1:OFST?": "C1:OFST 0.00E+00V",
+    "C2:VDIV?": "C2:VDIV 5.00E-01V",
+    "C2:OFST?": "C2:OFST 1.00E+00V",
+}
+
+
+class FakeVisaHandle:
+    """Replies to ``Cn:WF? DAT2`` with the configured int8 codes."""
+
+    def __init__(self, codes, header=b"%(channel)s:WF DAT2,#9%(length)09d"):
+        self.codes = codes
+        self.header = header
+        self.pending = b""
+        self.written = []
+        self.reads = 0
+
+    def write(self, cmd):
+        self.written.append(cmd)
+        channel = cmd.split(":")[0]
+        data = np.asarray(self.codes[channel], dtype=np.int8).tobytes()
+        header = self.header % {b"channel": channel.encode(),
+                                b"length": len(data)}
+        self.pending = header + data + b"\n\n"
+
+    def read_bytes(self, count, break_on_termchar=False):
+        self.reads += 1
+        data, self.pending = self.pending[:count], self.pending[count:]
+        return data
+
+
+@pytest.fixture
+def sds():
+    # bypass the constructor, only the transfer is tested
+    instr = Siglent_SDS_120NxE.__new__(Siglent_SDS_120NxE)
+    instr.ask = MagicMock(side_effect=RESPONSES.__getitem__)
+    instr.write = MagicMock()
+    instr.visa_handle = FakeVisaHandle(
+        {"C1": [0, 10, -10, 25], "C2": [25, 0, -25, 50]}
+    )
+    return instr
+
+
+def test_capture_scales_all_channels(sds):
+    axis, data = sds.capture((1, 2))
+    np.testing.assert_allclose(axis, np.arange(4) * 1e-9)
+    np.testing.assert_allclose(
+        data, [[0, 1, -1, 2.5], [1.5, 1, 0.5, 2]]
+    )
+    assert sds.visa_handle.written == ["C1:WF? DAT2", "C2:WF? DAT2"]
+    # header prefix, length digits and data of each channel
+    assert sds.visa_handle.reads == 2 * 3
+    # metadata is queried once for both channels
+    assert sorted(call[0][0] for call in sds.ask.call_args_list) == sorted(RESPONSES)
+
+
+def test_capture_reuses_setup_and_buffers(sds):
+    setup = sds.get_capture_setup((1, 2))
+    sds.ask.reset_mock()
+    out = np.empty((2, 4))
+    _, data = sds.capture(setup=setup, out=out)
+    assert data is out
+    raw = sds._raw_capture_buffer
+    sds.capture(setup=setup, out=out)
+    assert sds._raw_capture_buffer is raw
+    assert sds.ask.call_args_list == [(("SANU? C1",),)] * 2
+
+
+def test_capture_history(sds):
+    axis, data = sds.capture_history(frames=[3, 4, 5], channels=(1,))
+    assert data.shape == (3, 1, 4)
+    np.testing.assert_allclose(data[2, 0], [0, 1, -1, 2.5])
+    assert [call[0][0] for call in sds.write.call_args_list] == [
+        "FRAM 3",
+        "FRAM 4",
+        "FRAM 5",
+    ]
+
+
+def test_capture_buffer_too_small(sds):
+    sds.visa_handle.codes["C1"] = list(range(8))
+    with pytest.raises(ValueError):
+        sds.capture((1,))
+
+
+@pytest.mark.parametrize("header", [b"C1:WF DAT2,#3%(length)03d",
+                                    b"C1:WF DAT2,#1%(length)d"])
+def test_capture_other_block_headers(sds, header):
+    sds.visa_handle.header = header
+    _, data = sds.capture((1,))
+    np.testing.assert_allclose(data, [[0, 1, -1, 2.5]])
+
+
+@pytest.mark.parametrize("header", [b"C1:WF DAT2,%(length)d", b"C1:WF DAT2,#0",
+                                    b"C1:WF DAT2,#2x4", b"DAT2,#9%(length)09d"])
+def test_capture_invalid_block_header(sds, header):
+    sds.visa_handle.header = header
+    with pytest.raises(ValueError, match="block header"):
+        sds.capture((1,))
+
+
+def test_capture_axis_matches_received_points(sds):
+    setup = sds.get_capture_setup((1, 2))
+    setup.wfsu.num_points = 6
+    setup.wfsu.spacing = 2
+    axis, data = sds.capture(setup=setup)
+    assert data.shape == (2, 4)
+    np.testing.assert_allclose(axis, np.arange(4) * 2e-9)
+    axis, data = sds.capture_history([1], setup=setup)
+    assert data.shape == (1, 2, 4)
+    assert axis.shape == (4,)
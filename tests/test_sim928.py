@@ -0,0 +1,123 @@
+import re
+
+import numpy as np
+import pytest
+from qcodes.instrument import Instrument, VisaInstrument
+
+from qcodes_contrib_drivers.drivers.StanfordResearchSystems.SIM928 import \
+    SIM928
+
+
+class FakeMainframe:
+    """SIM900 with SIM928 modules that answer after a few NINP? polls."""
+
+    def __init__(self, slots, delay_polls=2):
+        self.volts = {i: 0.0 for i in slots}
+        self.queues = {i: b'' for i in range(1, 10)}
+        self.pending = {}
+        self.delay_polls = delay_polls
+        self.out = b''
+        self.writes = []
+
+    def write_raw(self, cmd):
+        self.writes.append(cmd)
+        for part in cmd.split(';'):
+            m = re.match(r'SNDT (\d),"(.*)"', part)
+            if m:
+                self.module(int(m[1]), m[2])
+            m = re.match(r'GETN\? (\d),(\d+)', part)
+            if m:
+                i, n = int(m[1]), int(m[2])
+                data, self.queues[i] = self.queues[i][:n], self.queues[i][n:]
+                self.out += b'#3%03d' % len(data) + data + b'\n'
+
+    def module(self, i, cmd):
+        reply = None
+        if cmd == '*IDN?':
+            reply = 'Stanford_Research_Systems,SIM928,s/n{},ver2.2'.format(i)
+        elif cmd == 'VOLT?':
+            reply = '{:.3f}'.format(self.volts[i])
+        elif cmd.startswith('VOLT '):
+            self.volts[i] = float(cmd[5:])
+        if reply is not None:
+            self.pending[i] = [self.delay_polls, reply.encode() + b'\n']
+
+    def ask_raw(self, cmd):
+        if cmd == '*IDN?':
+            return 'Stanford_Research_Systems,SIM900,s/n0,ver3.6'
+        if cmd == 'CTCR?':
+            return str(sum(2 ** i for i in self.volts))
+        m = re.match(r'NINP\? (\d)', cmd)
+        if m:
+            i = int(m[1])
+            if i in self.pending:
+                self.pending[i][0] -= 1
+                if self.pending[i][0] <= 0:
+                    self.queues[i] += self.pending.pop(i)[1]
+            return str(len(self.queues[i]))
+        raise ValueError(cmd)
+
+    def read_bytes(self, count):
+        data, self.out = self.out[:count], self.out[count:]
+        return data
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def sim(monkeypatch):
+    mainframe = FakeMainframe(slots=(1, 3))
+
+    def fake_init(self, name, address, **kwargs):
+        Instrument.__init__(self, name)
+        self._address = address
+        self.visa_handle = mainframe
+        self.add_parameter('timeout', get_cmd=None, set_cmd=None,
+                           initial_value=1)
+
+    monkeypatch.setattr(VisaInstrument, '__init__', fake_init)
+    monkeypatch.setattr(VisaInstrument, 'write_raw',
+                        lambda self, cmd: mainframe.write_raw(cmd))
+    monkeypatch.setattr(VisaInstrument, 'ask_raw',
+                        lambda self, cmd: mainframe.ask_raw(cmd))
+    monkeypatch.setattr('time.sleep', lambda t: None)
+    instr = SIM928('sim', 'GPIB::1', slot_names={3: 'gate'})
+    yield instr
+    instr.close()
+
+
+def test_find_modules_polls_queue(sim):
+    assert sim.modules == [1, 3]
+    assert sim.IDN_gate()['serial'] == 's/n3'
+
+
+def test_get_voltage(sim):
+    sim.visa_handle.volts[1] = 1.25
+    assert sim.volt_1() == 1.25
+
+
+def test_set_smooth_concatenates_writes(sim):
+    mainframe = sim.visa_handle
+    sim.volt_1_step(0.5)
+    sim.volt_gate_step(0.5)
+    del mainframe.writes[:]
+    sim.set_smooth({1: 1.0, 'gate': -0.6})
+    # the start voltages are read back first
+    assert mainframe.writes[-2:] == [
+        'SNDT 1,"VOLT 0.500";SNDT 3,"VOLT -0.500"',
+        'SNDT 1,"VOLT 1.000";SNDT 3,"VOLT -0.600"',
+    ]
+    assert sim.volt_gate.cache.get() == -0.6
+
+
+def test_plan_smooth():
+    voltages, active = SIM928.plan_smooth([0, 1], [1, 1.5], [0.3, 0.3])
+    np.testing.assert_allclose(voltages[:, 0], [0.3, 0.6, 0.9, 1.0])
+    np.testing.assert_allclose(voltages[:2, 1], [1.3, 1.5])
+    assert active[:, 1].tolist() == [True, True, False, False]
+
+    voltages, active = SIM928.plan_smooth([0, 1], [1, 1.5], [0.3, 0.3],
+                                          equitime=True)
+    np.testing.assert_allclose(voltages[:, 1], [1.125, 1.25, 1.375, 1.5])
+    assert active.all()
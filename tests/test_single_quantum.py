@@ -0,0 +1,135 @@
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+from qcodes_contrib_drivers.drivers.SingleQuantum.SingleQuantum import SQTalk
+
+
+class FakeControlServer(threading.Thread):
+    """Answers every ``labelProps`` request with the configured labels."""
+
+    def __init__(self, labels, split_at=None):
+        super().__init__(daemon=True)
+        self.labels = labels
+        self.split_at = split_at
+        self.requests = 0
+        self.conn = None
+        self.connected = threading.Event()
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.bind(("localhost", 0))
+        self.server.listen(1)
+        self.port = self.server.getsockname()[1]
+
+    def reply(self):
+        msgs = [json.dumps({"label": label, "value": value})
+                for label, value in self.labels.items()]
+        # two objects back to back in one frame, the rest one per frame
+        payload = (msgs[0] + "".join(m + "\x17" for m in msgs[1:])).encode()
+        if self.split_at is None:
+            return [payload]
+        return [payload[:self.split_at], payload[self.split_at:]]
+
+    def broadcast(self, payload):
+        """Push an unsolicited frame to the client."""
+        self.connected.wait(2)
+        self.conn.sendall(payload)
+
+    def run(self):
+        conn, _ = self.server.accept()
+        self.conn = conn
+        self.connected.set()
+        with conn:
+            buffer = b""
+            while True:
+                try:
+                    data = conn.recv(4096)
+                except OSError:
+                    return
+                if not data:
+                    return
+                buffer += data
+                while b"}" in buffer:
+                    request, buffer = buffer.split(b"}", 1)
+                    if b"labelProps" in request:
+                        self.requests += 1
+                        try:
+                            for part in self.reply():
+                                conn.sendall(part)
+                                time.sleep(0.01)
+                        except OSError:
+                            return
+
+    def close(self):
+        self.server.close()
+
+
+LABELS = {
+    "NumberOfDetectors": {"value": 4, "bounds": {"min": 0, "max": 8}},
+    "BiasCurrent": {"value": [1.0, 2.0, 3.0, 4.0], "unit": "uA"},
+    "TriggerLevel": {"value": [-100, -100, -100, -100], "unit": "mV"},
+}
+
+
+@pytest.fixture(params=[None, 7], ids=["single_chunk", "split_chunk"])
+def talk(request):
+    server = FakeControlServer(LABELS, split_at=request.param)
+    server.start()
+    sq = SQTalk(TCP_IP_PORT=server.port)
+    sq.server = server
+    sq.daemon = True
+    sq.start()
+    # wait for the answer to the initial request, so that the tests do not
+    # race with it
+    deadline = time.perf_counter() + 2
+    while len(sq.labelProps) < len(LABELS) and time.perf_counter() < deadline:
+        time.sleep(0.001)
+    yield sq
+    sq.close()
+    server.close()
+
+
+def test_get_label_nested(talk):
+    props = talk.get_label("NumberOfDetectors", timeout=2)
+    assert props == LABELS["NumberOfDetectors"]
+    assert talk.get_label("BiasCurrent")["value"] == [1.0, 2.0, 3.0, 4.0]
+
+
+def test_broadcast_updates_value(talk):
+    talk.get_label("TriggerLevel", timeout=2)
+    server = talk.server
+    server.broadcast(
+        b'{"label": "TriggerLevel", "value": [-50, -50, -50, -50]}\x17')
+    deadline = time.perf_counter() + 2
+    while time.perf_counter() < deadline:
+        if talk.get_label("TriggerLevel")["value"] == [-50, -50, -50, -50]:
+            break
+        time.sleep(0.005)
+    assert talk.get_label("TriggerLevel")["value"] == [-50, -50, -50, -50]
+
+
+def test_get_label_latency(talk):
+    # a single request is sent and the waiting thread is woken up by the
+    # answer, without re-sending or polling
+    with talk.lock:
+        talk.labelProps.clear()
+    start = time.perf_counter()
+    talk.get_label("BiasCurrent", timeout=2)
+    elapsed = time.perf_counter() - start
+    assert elapsed < 0.5
+    assert talk.server.requests == 2
+
+
+def test_unknown_label_times_out(talk):
+    with pytest.raises(IOError):
+        talk.get_label("DoesNotExist", timeout=0.2)
+
+
+def test_decode_frame_skips_malformed():
+    decoder = SQTalk.__new__(SQTalk)
+    decoder._decoder = json.JSONDecoder()
+    frame = b'{"a": {"b": 1}} {"c": 2}{"d": '
+    assert SQTalk.decode_frame(decoder, frame) == [{"a": {"b": 1}},
+                                                   {"c": 2}]
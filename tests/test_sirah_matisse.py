@@ -0,0 +1,96 @@
+import time
+
+import numpy as np
+import pytest
+from qcodes.instrument import Instrument, VisaInstrument
+from qcodes.logger import get_instrument_logger
+
+from qcodes_contrib_drivers.drivers.Sirah.Matisse import (
+    SirahMatisse, SirahMatisseError, SirahMatisseSampler)
+
+
+class FakeMatisse:
+    """Answers queries like the Matisse, every command gets a response."""
+
+    def __init__(self):
+        self.responses = {
+            "*IDN?": ':IDN: "Matisse TS, S/N:05-25-20, DSP Rev. 01.00"',
+            "DPOW:WAVTAB?": ":DPOW:WAVTAB: " + " ".join(
+                str(x) for x in np.linspace(-1, 1, 8)),
+            "DPOW:DC?": ":DPOW:DC: 0.25",
+            "FPZT:INP?": ":FPZT:INP: -0.5",
+            "PZETL:OVER?": ":PZETL:OVER: 8",
+            "ERR:CODE?": ":ERR:CODE: 12 13",
+            "BAD?": "!ERROR 12",
+        }
+        self.queries = []
+
+    def query(self, cmd):
+        self.queries.append(cmd)
+        return self.responses.get(cmd, "OK")
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def matisse(monkeypatch):
+    def fake_init(self, name, address, **kwargs):
+        Instrument.__init__(self, name)
+        self._address = address
+        self.visa_handle = FakeMatisse()
+        self.visa_log = get_instrument_logger(self, "qcodes.instrument.visa")
+        self.add_parameter('timeout', get_cmd=None, set_cmd=None)
+
+    monkeypatch.setattr(VisaInstrument, '__init__', fake_init)
+    instr = SirahMatisse("matisse", "TCPIP::1::INSTR")
+    yield instr
+    instr.close()
+
+
+def test_wave_table(matisse):
+    np.testing.assert_allclose(matisse.power_diode.wave_table(),
+                               np.linspace(-1, 1, 8))
+    np.testing.assert_allclose(matisse.power_diode.read_wave_table(),
+                               np.linspace(-1, 1, 8))
+
+
+def test_error_response(matisse):
+    with pytest.raises(SirahMatisseError) as exc_info:
+        matisse.ask_fast("BAD?")
+    assert exc_info.value._error_codes == [12, 13]
+    assert matisse.visa_handle.queries[-1] == "ERR:CL"
+
+
+def test_write_pops_answer(matisse):
+    matisse.write("DPOW:LOW 0.1")
+    assert matisse.visa_handle.queries[-1] == "DPOW:LOW 0.1"
+
+
+def test_sampler_default_queries(matisse):
+    sampler = SirahMatisseSampler(matisse, rate=1000)
+    assert sampler.queries == {"piezo_etalon_wave_table": "DPOW:WAVTAB?",
+                               "power": "DPOW:DC?",
+                               "reference": "FPZT:INP?"}
+
+
+def test_sampler_ring_buffer(matisse):
+    sampler = SirahMatisseSampler(matisse, rate=1000, length=5)
+    sampler._allocate()
+    for _ in range(7):
+        sampler.sample()
+    data = sampler.data()
+    assert data["piezo_etalon_wave_table"].shape == (5, 8)
+    np.testing.assert_allclose(data["power"], 0.25)
+    np.testing.assert_allclose(data["reference"], -0.5)
+    assert np.all(np.diff(data["timestamp"]) >= 0)
+
+
+def test_sampler_thread(matisse):
+    with SirahMatisseSampler(matisse, rate=200, length=100) as sampler:
+        time.sleep(0.1)
+    assert not sampler.running
+    assert sampler.error is None
+    assert sampler.count > 5
+    data = sampler.data()
+    assert len(data["power"]) == min(sampler.count, 100)
@@ -0,0 +1,101 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from qcodes_contrib_drivers.drivers.StanfordResearchSystems.SR844 import SR844
+
+
+def trcl_bytes(points):
+    return np.array(points, dtype=SR844.TRCL_DTYPE).tobytes()
+
+
+POINTS = [
+    (1, 124),            # 1.0
+    (-1, 125),           # -2.0
+    (0, 0),              # zero with any exponent
+    (32767, 124),        # largest mantissa
+    (-32768, 110),       # smallest mantissa, negative exponent offset
+    (16384, 0),          # smallest exponent, 2**14 * 2**-124
+    (3, 130),            # 3 * 2**6
+]
+VALUES = [1.0, -2.0, 0.0, 32767.0, -2.0, 2.0 ** -110, 192.0]
+
+
+def test_parse_trcl_known_payload():
+    payload = trcl_bytes(POINTS)
+    # little endian int16 mantissa followed by int16 exponent
+    assert payload[:8] == b'\x01\x00\x7c\x00\xff\xff\x7d\x00'
+    np.testing.assert_array_equal(SR844.parse_trcl(payload), VALUES)
+
+
+def test_parse_trcl_npts_and_partial_point():
+    payload = trcl_bytes(POINTS) + b'\x01\x00'
+    # a trailing incomplete point is ignored
+    np.testing.assert_array_equal(SR844.parse_trcl(payload), VALUES)
+    np.testing.assert_array_equal(SR844.parse_trcl(payload, 2), VALUES[:2])
+
+
+class FakeBuffers:
+    """Both channel buffers, filling by `step` points on every npts query."""
+
+    def __init__(self, data, step):
+        self.data = data
+        self.step = step
+        self.stored = 0
+        self.requests = []
+        self._pending = b''
+
+    def npts(self):
+        self.stored = min(self.stored + self.step, self.data.shape[1])
+        return self.stored
+
+    def write(self, cmd):
+        channel, start, npts = (int(x) for x in cmd[len('TRCL ?'):].split(','))
+        self.requests.append((channel, start, npts))
+        assert start + npts <= self.stored
+        points = [(int(v), 124) for v in self.data[channel - 1, start:start + npts]]
+        self._pending = trcl_bytes(points)
+
+    def read_bytes(self, n):
+        assert n == len(self._pending)
+        return self._pending
+
+
+@pytest.fixture
+def lockin():
+    data = np.vstack([np.arange(10), -np.arange(10)])
+    buffers = FakeBuffers(data, step=4)
+    # bypass the constructor, only the buffer readout is tested
+    instr = SR844.__new__(SR844)
+    instr.write = buffers.write
+    instr.visa_handle = MagicMock()
+    instr.visa_handle.read_bytes.side_effect = buffers.read_bytes
+    instr.buffer_npts = buffers.npts
+    instr.buffer_reset = MagicMock()
+    instr.buffer_start = MagicMock()
+    instr.buffer_pause = MagicMock()
+    instr.buffers = buffers
+    return instr
+
+
+def test_read_buffers(lockin):
+    ch1, ch2 = lockin.read_buffers(start=1)
+    np.testing.assert_array_equal(ch1, [1, 2, 3])
+    np.testing.assert_array_equal(ch2, [-1, -2, -3])
+
+
+def test_acquire_buffers_reads_incrementally(lockin):
+    ch1, ch2 = lockin.acquire_buffers(10, poll_interval=0)
+    np.testing.assert_array_equal(ch1, np.arange(10))
+    np.testing.assert_array_equal(ch2, -np.arange(10))
+    assert lockin.buffers.requests == [
+        (1, 0, 4), (2, 0, 4), (1, 4, 4), (2, 4, 4), (1, 8, 2), (2, 8, 2)]
+    lockin.buffer_reset.assert_called_once()
+    lockin.buffer_start.assert_called_once()
+    lockin.buffer_pause.assert_called_once()
+
+
+def test_acquire_buffers_invalid_npts(lockin):
+    with pytest.raises(ValueError):
+        lockin.acquire_buffers(0)
@@ -0,0 +1,122 @@
+import json
+import re
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from qcodes_contrib_drivers.drivers.Tektronix.AFG3000 import (
+    AFG3252, AFG3000WaveformLibrary)
+
+
+class FakeVisaHandle:
+    """Records the USER memories written by every upload message."""
+
+    write_termination = "\n"
+
+    def __init__(self):
+        self.uploads = []
+
+    def write_raw(self, message):
+        self.uploads.append(
+            [int(m) for m in re.findall(rb"DATA:COPY USER(\d)", message)])
+
+
+@pytest.fixture
+def driver():
+    # bypass the constructor, which takes a snapshot of all parameters;
+    # only the waveform upload and its bookkeeping are tested
+    afg = AFG3252.__new__(AFG3252)
+    afg.visa_handle = FakeVisaHandle()
+    afg.waveform_library = None
+    afg.IDN = lambda: {"vendor": "TEKTRONIX", "model": "AFG3252",
+                       "serial": "C012345", "firmware": "3.1.1"}
+    afg.log = MagicMock()
+    return afg
+
+
+@pytest.fixture
+def uploads(driver):
+    return driver.visa_handle.uploads
+
+
+def wave(level):
+    return np.full(16, level)
+
+
+def test_resident_waveform_is_not_uploaded(driver, uploads):
+    library = AFG3000WaveformLibrary(driver)
+    memory = library.load("a", wave(0.1))
+    assert library.load("a", wave(0.1)) == memory
+    # same content under another name
+    assert library.load("b", wave(0.1)) == memory
+    assert uploads == [[memory]]
+    assert library.names == {"b": memory}
+
+
+def test_load_many_single_message(driver, uploads):
+    library = AFG3000WaveformLibrary(driver)
+    result = library.load_many({"a": wave(0.1), "b": wave(0.2)})
+    assert uploads == [sorted(result.values())]
+    with pytest.raises(ValueError):
+        library.load_many({str(n): wave(n / 10) for n in range(5)})
+
+
+def test_least_recently_used_is_replaced(driver, uploads):
+    library = AFG3000WaveformLibrary(driver)
+    memories = {name: library.load(name, wave(n / 10))
+                for n, name in enumerate("abcd")}
+    assert sorted(memories.values()) == [1, 2, 3, 4]
+    library.load("a", wave(0.0))
+    memory = library.load("e", wave(0.5))
+    assert memory == memories["b"]
+    assert library.memory_of("b") is None
+    assert library.memory_of("a") == memories["a"]
+    assert uploads[-1] == [memory]
+    assert len(uploads) == 5
+
+
+def test_upload_outside_library_forgets_memory(driver, uploads):
+    library = AFG3000WaveformLibrary(driver)
+    memory = library.load("a", wave(0.1))
+    driver.upload_waveforms({memory: wave(0.1)})
+    assert library.memory_of("a") is None
+    library.load("a", wave(0.1))
+    assert len(uploads) == 3
+
+
+def test_persistence(driver, uploads, tmp_path):
+    path = str(tmp_path / "library.json")
+    library = AFG3000WaveformLibrary(driver, path)
+    memory = library.load("a", wave(0.1))
+    library.load("b", wave(0.2))
+
+    reopened = AFG3000WaveformLibrary(driver, path)
+    assert reopened.names == library.names
+    assert reopened.load("a", wave(0.1)) == memory
+    assert len(uploads) == 2
+    # the least recently used memory is restored too
+    assert reopened.load("c", wave(0.3)) == library._usage[0]
+
+    with open(path) as f:
+        state = json.load(f)
+    state["serial"] = "other"
+    with open(path, "w") as f:
+        json.dump(state, f)
+    assert AFG3000WaveformLibrary(driver, path).names == {}
+
+
+def test_file_written_only_on_change(driver, uploads, tmp_path, monkeypatch):
+    library = AFG3000WaveformLibrary(driver, str(tmp_path / "library.json"))
+    writes = []
+    write = library._write
+    monkeypatch.setattr(library, "_write", lambda: writes.append(write()))
+
+    library.load_many({"a": wave(0.1), "b": wave(0.2)})
+    assert len(writes) == 1
+    # most recently used already, nothing changes
+    library.load("b", wave(0.2))
+    assert len(writes) == 1
+    # only the usage order changes
+    library.load("a", wave(0.1))
+    assert len(writes) == 2
@@ -0,0 +1,68 @@
+import struct
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from qcodes_contrib_drivers.drivers.Tektronix.AWG520 import Tektronix_AWG520
+
+
+@pytest.fixture
+def awg(tmp_path):
+    # bypass the constructor, only the file encoding is tested
+    instr = Tektronix_AWG520.__new__(Tektronix_AWG520)
+    instr._values = {'files': {}}
+    instr._cache_dir = str(tmp_path)
+    instr._keep_waveforms = False
+    instr.visa_handle = MagicMock()
+    return instr
+
+
+def test_encode_points_matches_struct():
+    rng = np.random.default_rng(0)
+    w = rng.uniform(-1, 1, 1000)
+    m1 = rng.integers(0, 2, 1000)
+    m2 = rng.integers(0, 2, 1000)
+    expected = b''.join(struct.pack('<fB', w[i], int(m1[i] + 2 * m2[i]))
+                        for i in range(len(w)))
+    assert Tektronix_AWG520.encode_points(w, m1, m2) == expected
+
+
+def test_send_waveform_message(awg, tmp_path):
+    w = np.array([0.0, 0.5, -0.5])
+    m = np.array([0, 1, 0])
+    awg.send_waveform(w, m, m, 'test.wfm', 1e9)
+
+    mes = awg.visa_handle.write_raw.call_args[0][0]
+    points = Tektronix_AWG520.encode_points(w, m, m)
+    content = b'MAGIC 1000\n#215' + points + b'CLOCK 1.0000000000e+09\n'
+    assert mes == b'MMEM:DATA "test.wfm",#%d%d' % (
+        len(str(len(content))), len(content)) + content
+    assert awg._values['files']['test.wfm'] == {'clock': 1e9, 'numpoints': 3}
+
+    # the second upload of the same content is served from the cache
+    assert len(list(tmp_path.iterdir())) == 1
+    awg.send_waveform(w, m, m, 'other.wfm', 1e9)
+    assert len(list(tmp_path.iterdir())) == 1
+    assert awg.visa_handle.write_raw.call_args[0][0].endswith(content)
+
+
+def test_send_sequence(awg):
+    awg.send_sequence2(['a.pat', 'b.pat'], ['c.pat', 'd.pat'], [1, 2],
+                       [0, 1], [0, 0], [0, 0], 'test.seq')
+    content = (b'MAGIC 3002\nLINES 2\n'
+               b'"a.pat","c.pat",1,0,0,0\n"b.pat","d.pat",2,1,0,0\n')
+    assert awg.visa_handle.write_raw.call_args[0][0] == (
+        b'MMEM:DATA "test.seq",#2%d' % len(content) + content)
+
+
+def test_resend_waveform_not_kept(awg):
+    w = np.array([0.0, 0.5, -0.5])
+    m = np.array([0, 1, 0])
+    awg.send_waveform(w, m, m, 'test.wfm', 1e9)
+    awg._values['recent_channel_1'] = dict(awg._values['files']['test.wfm'],
+                                           filename='test.wfm')
+    with pytest.raises(RuntimeError, match='not kept in memory'):
+        awg.resend_waveform(1, w=w)
+    with pytest.raises(RuntimeError, match='No waveform'):
+        awg.resend_waveform(2)
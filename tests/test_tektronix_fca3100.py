@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+from qcodes.instrument import Instrument, VisaInstrument
+
+from qcodes_contrib_drivers.drivers.Tektronix.FCA3100 import FCA3100
+
+
+class FakeCounter:
+    """Returns consecutive results 1e-9 * (index + 1) on FETC:ARR?."""
+
+    def __init__(self):
+        self.format = 'ASC'
+        self.count = 100
+        self.fetched = 0
+        self.requests = []
+        self.writes = []
+
+    def next_results(self, count):
+        self.requests.append(count)
+        data = 1e-9 * np.arange(self.fetched + 1, self.fetched + count + 1)
+        self.fetched += count
+        return data
+
+    def ask(self, cmd):
+        if cmd == '*IDN?':
+            return 'Tektronix,FCA3100,1,1'
+        if cmd == 'FORMat:DATA?':
+            return 'REAL' if self.format == 'REAL' else 'ASCii'
+        if cmd == 'CALCulate:AVERage:COUNt?':
+            return str(self.count)
+        if cmd.startswith('FETCh:ARRay?'):
+            assert self.format == 'ASC'
+            data = self.next_results(int(cmd.split()[1]))
+            return ','.join(f'{x:.15e}' for x in data)
+        return '0'
+
+    def write(self, cmd):
+        self.writes.append(cmd)
+        if cmd.startswith('FORMat:DATA'):
+            self.format = cmd.split()[1]
+        if cmd.endswith(':INIT'):
+            self.fetched = 0
+
+    def query_binary_values(self, query, datatype, is_big_endian, container):
+        assert self.format == 'REAL' and datatype == 'd' and is_big_endian
+        return container(self.next_results(int(query.split()[1])))
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def counter(monkeypatch):
+    fake = FakeCounter()
+
+    def fake_init(self, name, address, **kwargs):
+        Instrument.__init__(self, name)
+        self._address = address
+        self.visa_handle = fake
+
+    monkeypatch.setattr(VisaInstrument, '__init__', fake_init)
+    monkeypatch.setattr(VisaInstrument, 'ask_raw',
+                        lambda self, cmd: fake.ask(cmd))
+    monkeypatch.setattr(VisaInstrument, 'write_raw',
+                        lambda self, cmd: fake.write(cmd))
+    instr = FCA3100('fca3100', 'GPIB::1')
+    instr.fake = fake
+    yield instr
+    instr.close()
+
+
+@pytest.mark.parametrize('data_format', ['ASC', 'REAL'])
+def test_chunked_time_array(counter, data_format):
+    counter.data_format(data_format)
+    counter.samples_number(100)
+    counter.chunk_size(30)
+    data = counter.time_array()
+    np.testing.assert_allclose(data, 1e-9 * np.arange(1, 101))
+    assert counter.fake.requests == [30, 30, 30, 10]
+    assert counter.fake.writes[-1] == \
+        'CALCulate:AVERage:STATe 0;:ARM:COUN 100;:INIT'
+
+
+def test_read_into_preallocated(counter):
+    counter.data_format('REAL')
+    out = np.zeros(25)
+    assert counter.read_time_array(out) is out
+    np.testing.assert_allclose(out, 1e-9 * np.arange(1, 26))
+
+
+def test_local_statistics(counter):
+    counter.data_format('REAL')
+    counter.samples_number(100)
+    counter.time_array()
+    counter.fake.requests.clear()
+    mean, stddev, minval, maxval = counter.timestats_local()
+    assert counter.fake.requests == []
+    data = 1e-9 * np.arange(1, 101)
+    assert mean == pytest.approx(data.mean())
+    assert stddev == pytest.approx(data.std(ddof=1))
+    assert (minval, maxval) == pytest.approx((1e-9, 1e-7))
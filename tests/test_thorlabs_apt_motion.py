@@ -0,0 +1,198 @@
+import ctypes
+import threading
+import time
+from concurrent.futures import wait
+
+import pytest
+
+from qcodes_contrib_drivers.drivers.Thorlabs.K10CR1 import Thorlabs_K10CR1
+from qcodes_contrib_drivers.drivers.Thorlabs.PRM1Z8 import Thorlabs_PRM1Z8
+from qcodes_contrib_drivers.drivers.Thorlabs.private.APT import (
+    Thorlabs_APT, ThorlabsAPTMotion, ThorlabsException)
+
+
+class FakeAPT:
+    """Motors that reach their target a fixed time after the move started."""
+
+    def __init__(self, duration=0.05):
+        self.lock = threading.RLock()
+        self.duration = duration
+        self.motors = {}
+
+    def _motor(self, serial_number):
+        return self.motors.setdefault(serial_number, {
+            'start': 0.0, 'from': 0.0, 'to': 0.0, 't0': -1.0, 'homed': False})
+
+    def mot_move_absolute_ex(self, serial_number, position, wait):
+        assert not wait
+        m = self._motor(serial_number)
+        m.update({'from': self.mot_get_position(serial_number), 'to': position,
+                  't0': time.monotonic()})
+
+    def mot_move_home(self, serial_number, wait):
+        self.mot_move_absolute_ex(serial_number, 0.0, wait)
+        self._motor(serial_number)['homed'] = True
+
+    def mot_stop_profiled(self, serial_number):
+        m = self._motor(serial_number)
+        m.update({'from': self.mot_get_position(serial_number), 't0': -1.0})
+        m['to'] = m['from']
+
+    def _fraction(self, m):
+        return min((time.monotonic() - m['t0']) / self.duration, 1.0)
+
+    def mot_get_position(self, serial_number):
+        m = self._motor(serial_number)
+        return m['from'] + (m['to'] - m['from']) * self._fraction(m)
+
+    def mot_get_status_bits(self, serial_number):
+        m = self._motor(serial_number)
+        status = 0x400 if m['homed'] else 0
+        if self._fraction(m) < 1.0:
+            status |= 0x10
+        return status
+
+
+class FakeDLL:
+    """APT.dll whose functions all succeed and record whether the server lock was held.
+
+    Motors reach their target `durations[serial number]` seconds after the move started, a move
+    with wait set blocks for that time.
+    """
+
+    def __init__(self, lock, durations=None):
+        self.lock = lock
+        self.durations = durations or {}
+        self.motors = {}
+        self.calls = []
+
+    def __getattr__(self, name):
+        handler = getattr(type(self), "_" + name, None)
+
+        def function(*args):
+            self.calls.append((name, self.lock._is_owned()))
+            if handler is not None:
+                handler(self, *args)
+            return 0
+        return function
+
+    def _fraction(self, serial_number):
+        motor = self.motors.get(serial_number)
+        if motor is None:
+            return 1.0
+        return min((time.monotonic() - motor[0]) / self.durations.get(serial_number, 0.01), 1.0)
+
+    def _MOT_MoveAbsoluteEx(self, serial_number, position, wait):
+        self.motors[serial_number.value] = (time.monotonic(), position.value)
+        if wait.value:
+            time.sleep(self.durations.get(serial_number.value, 0.01))
+
+    def _MOT_GetPosition(self, serial_number, position):
+        motor = self.motors.get(serial_number.value, (0.0, 0.0))
+        position._obj.value = motor[1] * self._fraction(serial_number.value)
+
+    def _MOT_GetStatusBits(self, serial_number, status_bits):
+        status_bits._obj.value = 0x10 if self._fraction(serial_number.value) < 1.0 else 0
+
+
+@pytest.fixture
+def motion():
+    manager = ThorlabsAPTMotion(FakeAPT(), min_interval=0.005, max_interval=0.02)
+    yield manager
+    manager.shutdown()
+
+
+def test_concurrent_moves(motion):
+    t0 = time.monotonic()
+    futures = motion.move_many({1: 10.0, 2: 20.0, 3: 30.0})
+    assert all(motion.is_moving(sn) for sn in futures)
+    done, not_done = wait(futures.values(), timeout=2)
+    assert not not_done
+    # the moves overlapped instead of running one after another
+    assert time.monotonic() - t0 < 3 * motion.apt.duration
+    assert futures[2].result() == pytest.approx(20.0)
+    assert not motion.is_moving(2)
+
+
+def test_position_cached_while_moving(motion):
+    future = motion.move_absolute(1, 5.0)
+    time.sleep(0.02)
+    calls = []
+    original = motion.apt.mot_get_position
+    motion.apt.mot_get_position = lambda sn: calls.append(sn) or original(sn)
+    assert 0 <= motion.position(1) <= 5.0
+    assert calls == [] or motion.is_moving(1) is False
+    future.result(timeout=2)
+    assert motion.position(1) == pytest.approx(5.0)
+
+
+def test_home_and_stop(motion):
+    motion.move_absolute(1, 10.0).result(timeout=2)
+    assert motion.move_home(1).result(timeout=2) == pytest.approx(0.0)
+
+    future = motion.move_absolute(1, 100.0)
+    motion.stop(1)
+    assert future.result(timeout=2) < 100.0
+
+
+def test_superseded_and_shutdown(motion):
+    first = motion.move_absolute(1, 10.0)
+    second = motion.move_absolute(1, 20.0)
+    with pytest.raises(ThorlabsException):
+        first.result(timeout=1)
+    motion.shutdown()
+    with pytest.raises(ThorlabsException):
+        second.result(timeout=1)
+    with pytest.raises(ThorlabsException):
+        motion.move_absolute(1, 0.0)
+
+
+def test_position_does_not_start_polling(motion):
+    assert motion.position(1) == 0.0
+    assert motion._thread is None
+    motion.move_absolute(1, 1.0).result(timeout=2)
+    assert motion._thread is not None
+
+
+@pytest.fixture
+def apt(monkeypatch):
+    monkeypatch.setattr(ctypes, "CDLL", lambda path: None)
+    apt = Thorlabs_APT()
+    apt.dll = FakeDLL(apt.lock)
+    yield apt
+    apt.apt_clean_up()
+
+
+def test_devices_share_server_and_lock(apt):
+    rotator = Thorlabs_K10CR1("rotator_apt_test", serial_number=1, apt=apt)
+    wheel = Thorlabs_PRM1Z8("wheel_apt_test", serial_number=2, apt=apt)
+    try:
+        assert rotator.apt is wheel.apt
+        wheel.position()
+        rotator.velocity_max()
+        assert apt._motion is None or apt._motion._thread is None
+        rotator.position(10.0)
+        assert rotator.position() == pytest.approx(10.0)
+        assert {"MOT_MoveAbsoluteEx", "MOT_GetPosition", "MOT_GetVelParams"} <= {
+            name for name, _ in apt.dll.calls}
+        assert all(locked for _, locked in apt.dll.calls)
+    finally:
+        rotator.close()
+        wheel.close()
+
+
+def test_blocking_move_does_not_stall_other_devices(apt):
+    apt.dll.durations = {1: 0.5, 2: 0.02}
+    rotator = Thorlabs_K10CR1("rotator_apt_test", serial_number=1, apt=apt)
+    wheel = Thorlabs_PRM1Z8("wheel_apt_test", serial_number=2, apt=apt)
+    try:
+        blocking = threading.Thread(target=rotator.position, args=(90.0,))
+        blocking.start()
+        time.sleep(0.02)
+        assert wheel.move_to(20.0).result(timeout=2) == pytest.approx(20.0)
+        assert blocking.is_alive()
+        blocking.join()
+        assert rotator.position() == pytest.approx(90.0)
+    finally:
+        rotator.close()
+        wheel.close()